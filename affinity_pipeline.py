@@ -1,6 +1,6 @@
 import dlt
 
-from dlt_source_affinity import ListReference, source
+from dlt_source_affinity import ListReference, Sampling, source
 
 DEV_MODE = True
 
@@ -18,15 +18,10 @@ def load_affinity_data() -> None:
             ListReference(126638, 1899475),
             ListReference(157541, 831583),
         ],
-        dev_mode=DEV_MODE,
+        # A deterministic sample of every entity and list, including all derived tables
+        # (fields, dropdowns, interactions, etc.)
+        sampling=Sampling(rate=0.05, max_items=100) if DEV_MODE else None,
     )
-    if DEV_MODE:
-        # ATTENTION: Caveat here for list_refs resources.
-        # Because these endpoints yield single records,
-        # and items with metadata can not be batched into lists, yet (as of dlt 1.5.0) this means
-        # that only resources from the main resource will make it to the destination when this is
-        # enabled. Any derived resources (fields, dropdowns, etc.) will be dropped.
-        data.add_limit(1)
     info = pipeline.run(data, refresh="drop_sources")
     print(info)
 
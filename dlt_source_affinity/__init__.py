@@ -1,11 +1,17 @@
 """A source loading entities and lists from Affinity CRM (affinity.co)"""
 
 import logging
+from collections import deque
+from concurrent.futures import Future
+from contextlib import nullcontext
 from copy import deepcopy
 from dataclasses import field as dataclass_field
 from enum import StrEnum
+from functools import partial
 from typing import (
     Any,
+    Callable,
+    Deque,
     Dict,
     Generator,
     Iterable,
@@ -14,54 +20,94 @@ from typing import (
     Optional,
     Sequence,
     Tuple,
+    Type,
 )
 
 import dlt
-from dlt.common.libs.pydantic import DltConfig
+from dlt.common.libs.pydantic import DltConfig, pydantic_to_table_schema_columns
 from dlt.common.logger import is_logging
-from dlt.common.schema.typing import TTableReferenceParam
+from dlt.common.schema.typing import TTableReferenceParam, TWriteDisposition
 from dlt.common.typing import TDataItem
+from dlt.extract.hints import TResourceHints
 from dlt.extract.items import DataItemWithMeta
 from dlt.sources import DltResource
+from dlt.sources.helpers.requests import HTTPError
+from dlt.sources.helpers.rest_client.client import PageData, Response, RESTClient
 from pydantic import BaseModel, TypeAdapter
 from pydantic.fields import FieldInfo
 from pydantic_flatten_rootmodel import flatten_root_model
 
-from .helpers import ListReference, generate_list_entries_path
+from .change_feed import ChangeFeed
+from .coalescing import coalesce_list_refs, membership_rows
+from .concurrency import AdaptiveConcurrency, initial_concurrency
+from .decoding import (
+    DECODER,
+    PageDecoding,
+    construct,
+    decode_json,
+    decode_list,
+    dump,
+    plain,
+    unwrap,
+    value_type,
+)
+from .entity_cache import (
+    LIST_ENTRY_ENTITIES,
+    CachedEntity,
+    EntityCache,
+    FieldGroup,
+)
+from .fingerprint import FingerprintIndex
+from .hedging import Hedger
+from .helpers import (
+    ListReference,
+    Sampling,
+    Shard,
+    chunked,
+    field_column,
+    filter_batches,
+    generate_list_entries_path,
+)
+from .metrics import http_metrics
 from .model.v1 import InteractionTypeToLiteral, Note
 from .model.v2 import (
     Attendee,
     ChatMessage,
-    CompaniesValue,
     Company,
     CompanyPaged,
-    CompanyValue,
-    DateValue,
     Dropdown,
-    DropdownsValue,
-    DropdownValue,
     FieldModel,
-    FloatsValue,
-    FloatValue,
-    FormulaValue,
     Interaction,
-    InteractionValue,
+    ListEntryWithEntity,
+    ListEntryWithEntityPaged,
     ListModel,
-    LocationsValue,
-    LocationValue,
     Opportunity,
     OpportunityPaged,
     OpportunityWithFields,
+    PaginationWithTotalCount,
     Person,
     PersonPaged,
-    PersonsValue,
-    PersonValue,
     RankedDropdown,
-    RankedDropdownValue,
-    TextsValue,
-    TextValue,
     Type3,
 )
+from .options import (
+    Concurrency,
+    Decoding,
+    Diagnostics,
+    ExplicitIds,
+    Filters,
+    Incremental,
+    ListLoading,
+)
+from .planner import MissingPermissions, plan
+from .progress import Progress
+from .projection import (
+    ENTITY_FIELD_TYPES,
+    LIST_ENTRY_FIELD_TYPES,
+    FieldProjection,
+    FieldSelection,
+)
+from .refresh import FieldColumns, FieldRefresh
 from .rest_client import (
     MAX_PAGE_LIMIT_V1,
     MAX_PAGE_LIMIT_V2,
@@ -69,7 +115,18 @@ from .rest_client import (
     get_v2_rest_client,
     hooks,
 )
-from .type_adapters import list_adapter, note_adapter
+from .run import Run, current_run
+from .scheduling import ListScheduler, discover_list_refs
+from .snapshots import (
+    DELETED_COLUMN_HINTS,
+    DeletedIds,
+    IdSnapshots,
+    deletable_columns,
+    deletion_markers,
+)
+from .splitting import FieldTypeSplit, benchmark_split
+from .type_adapters import note_adapter
+from .waiting import WorkerBudget
 
 
 def pydantic_model_dump(model: BaseModel, **kwargs):
@@ -80,6 +137,8 @@ def pydantic_model_dump(model: BaseModel, **kwargs):
     return model.model_dump(by_alias=True, **kwargs)
 
 
+logger = logging.getLogger("dlt")
+
 if is_logging():
     # ignore https://github.com/dlt-hub/dlt/blob/268768f78bd7ea7b2df8ca0722faa72d4d4614c5/dlt/extract/hints.py#L390-L393
     # This warning is thrown because of using Pydantic models as the column schema in a table variant
@@ -93,8 +152,6 @@ if is_logging():
                 return False  # Filter out this log
             return True  # Allow all other logs
 
-    logger = logging.getLogger("dlt")
-    logger.addFilter
     logger.addFilter(HideSpecificWarning())
 
 LISTS_LITERAL = Literal["lists"]
@@ -135,13 +192,29 @@ def get_entity_data_class_paged(entity: ENTITY):
             return OpportunityPaged
 
 
-def use_id(entity: Company | Person | Opportunity | ListModel):
+def use_id(entity: Company | Person | Opportunity | ListModel | Dict[str, Any]):
+    if isinstance(entity, dict):
+        # deletion markers are plain rows that already carry their _dlt_id
+        return entity
     return pydantic_model_dump(entity) | {"_dlt_id": entity.id}
 
 
 def __create_id_resource(
-    entity: ENTITY | LISTS_LITERAL, is_id_generator: bool = True, dev_mode=False
+    entity: ENTITY | LISTS_LITERAL,
+    run: Run,
+    is_id_generator: bool = True,
+    dev_mode=False,
+    snapshots: IdSnapshots | None = None,
+    sampling: Sampling | None = None,
+    shard: Shard | None = None,
+    predicate: Callable[[Any], bool] | None = None,
+    entity_cache: EntityCache | None = None,
 ) -> DltResource:
+    """
+    predicate - only keep the entities (without fields) it returns true for, e.g. to skip fetching
+        the details of global companies
+    entity_cache - wait for the lists to be paged, so the entities on them are cached first
+    """
     name = f"{entity}_ids" if is_id_generator else entity
     datacls = get_entity_data_class(entity)
 
@@ -154,22 +227,91 @@ def __create_id_resource(
         # field data in parallel, as we don't need to follow a pagination
         # cursor
         selected=not is_id_generator,
-        write_disposition="replace",
+        # Deleted entities are removed via hard delete markers, so we can merge
+        write_disposition="merge" if snapshots else "replace",
         primary_key="id",
-        columns=datacls,
+        # Deletion markers would not pass validation, so we only pass the column schema then
+        columns=(
+            deletable_columns(pydantic_to_table_schema_columns(datacls))
+            if snapshots
+            else datacls
+        ),
         name=name,
         parallelized=not dev_mode,
     )
+    @run.resource(name)
     def __ids() -> Iterable[TDataItem]:
+        if entity_cache is not None:
+            yield from entity_cache.wait()
         rest_client = get_v2_rest_client()
         list_adapter = TypeAdapter(list[datacls])
 
-        yield from (
-            list_adapter.validate_python(entities)
+        batches = (
+            run.timeline.call(
+                "validate", "transform", list_adapter.validate_python, entities
+            )
             for entities in rest_client.paginate(
                 entity, params={"limit": MAX_PAGE_LIMIT_V2}, hooks=hooks
             )
         )
+        enumerated_ids: List[int] = []
+        if snapshots is not None:
+
+            def enumerate_ids(batches: Iterable[List[Any]]) -> Iterable[List[Any]]:
+                for validated in batches:
+                    enumerated_ids.extend(e.id for e in validated)
+                    yield validated
+
+            # Every existing entity counts as enumerated, including the ones that are
+            # filtered, sampled or sharded out below, as these must not be deleted
+            batches = enumerate_ids(batches)
+        filtered = 0
+        if predicate is not None:
+
+            def keeps(e: Company | Person) -> bool:
+                nonlocal filtered
+                if predicate(e):
+                    return True
+                filtered += 1
+                return False
+
+            # Details are then only fetched for the remaining IDs, in full chunks
+            batches = filter_batches(batches, keeps, MAX_PAGE_LIMIT_V2)
+        if sampling is not None:
+            batches = sampling.sample(batches, lambda e: e.id, MAX_PAGE_LIMIT_V2)
+        if shard is not None:
+            # Every shard enumerates all IDs, but only fetches the details of its own
+            batches = shard.select(batches, lambda e: e.id, MAX_PAGE_LIMIT_V2)
+        if entity_cache is not None:
+            # Details are then only fetched for the uncached IDs, in full chunks
+            batches = entity_cache.partition(
+                entity, batches, lambda e: e.id, MAX_PAGE_LIMIT_V2
+            )
+
+        for validated in batches:
+            if is_id_generator:
+                # the IDs are the total of the entity transformer
+                run.progress.add_total(entity, len(validated))
+            else:
+                run.progress.update(name, len(validated))
+            yield validated
+        run.progress.complete_total(entity if is_id_generator else name)
+        if predicate is not None:
+            logger.info(f"{entity}: filtered out {filtered} entities")
+
+        if snapshots is not None:
+            deleted = snapshots.diff(entity, enumerated_ids)
+            if deleted:
+                logger.info(f"{entity}: detected {len(deleted)} deleted entities")
+                # The transformer of an ID generator emits the markers into its own table
+                yield (
+                    DeletedIds(deleted)
+                    if is_id_generator
+                    else deletion_markers(deleted)
+                )
+        run.http_metrics.publish(name)
+        if not is_id_generator:
+            run.progress.publish(name)
 
     if dev_mode:
         __ids.add_limit(1)
@@ -200,61 +342,147 @@ DltNote.__annotations__["type"] = str
 DltNote.model_fields["type"] = FieldInfo.from_annotation(str)
 
 
-@dlt.resource(
-    primary_key="id",
-    columns=DltNote,
-    max_table_nesting=1,
-    write_disposition="replace",
-    parallelized=True,
-    references=[
-        {
-            "columns": ["creator_id"],
-            "referenced_columns": ["id"],
-            "referenced_table": Table.PERSONS.value,
-        },
-        {
-            "columns": ["interaction_id", "interaction_type"],
-            "referenced_columns": ["id", "type"],
-            "referenced_table": Table.INTERACTIONS.value,
-        },
-        {
-            "columns": ["parent_id"],
-            "referenced_columns": ["id"],
-            "referenced_table": Table.NOTES.value,
-        },
-    ],
-)
-def notes():
-    rest_client = get_v1_rest_client()
+def set_total_count(resource: str, path: str, progress: Progress) -> None:
+    """
+    Sets the total of a resource from the `totalCount` of a v2 endpoint
+    """
+    try:
+        response = get_v2_rest_client().get(
+            path, params={"limit": 1, "totalCount": True}, hooks=hooks
+        )
+    except HTTPError as e:
+        logger.info(f"{resource}: no total count available ({e})")
+        return
+    total = PaginationWithTotalCount.model_validate(
+        response.json()["pagination"]
+    ).totalCount
+    if total is not None:
+        progress.set_total(resource, total)
+
+
+def __create_notes_resource(
+    run: Run, decoder: DECODER = "pydantic", validate_every: int | None = None
+) -> DltResource:
+    @dlt.resource(
+        name=Table.NOTES.value,
+        primary_key="id",
+        columns=DltNote,
+        max_table_nesting=1,
+        write_disposition="replace",
+        parallelized=True,
+        references=[
+            {
+                "columns": ["creator_id"],
+                "referenced_columns": ["id"],
+                "referenced_table": Table.PERSONS.value,
+            },
+            {
+                "columns": ["interaction_id", "interaction_type"],
+                "referenced_columns": ["id", "type"],
+                "referenced_table": Table.INTERACTIONS.value,
+            },
+            {
+                "columns": ["parent_id"],
+                "referenced_columns": ["id"],
+                "referenced_table": Table.NOTES.value,
+            },
+        ],
+    )
+    @run.resource(Table.NOTES.value)
+    def notes():
+        rest_client = get_v1_rest_client()
+        set_total_count(Table.NOTES.value, Table.NOTES.value, run.progress)
+        page_decoding = PageDecoding(decoder, validate_every)
 
-    yield from (
-        note_adapter.validate_python(notes)
         for notes in rest_client.paginate(
             Table.NOTES.value,
             params={
                 "page_size": MAX_PAGE_LIMIT_V1,
             },
-        )
-    )
+            hooks=hooks,
+        ):
+            run.progress.update(Table.NOTES.value, len(notes))
+            yield run.timeline.call(
+                "validate",
+                "transform",
+                page_decoding.decode,
+                Table.NOTES.value,
+                partial(decode_notes, notes),
+            )
+        run.http_metrics.publish(Table.NOTES.value)
+        page_decoding.publish(Table.NOTES.value)
+        run.progress.complete_total(Table.NOTES.value)
+        run.progress.publish(Table.NOTES.value)
+
+    return notes
+
+
+def decode_notes(notes: List[Any], decoder: DECODER) -> List[Note]:
+    if decoder == "pydantic":
+        return note_adapter.validate_python(notes)
+    # the resource validates its items against the model, which lets models pass
+    return [construct(note, Note) for note in decode_list(notes, Note, decoder)]
 
 
 def get_dropdown_options_table(field: FieldModel) -> str:
     return f"dropdown_options_{field.id}"
 
 
+def dropdown_options_hints(
+    table_name: str, columns: Type[Dropdown | RankedDropdown]
+) -> TResourceHints:
+    return dlt.mark.make_hints(
+        table_name=table_name,
+        write_disposition="merge",  # we only ever want a unique set of dropdown options
+        primary_key="dropdownOptionId",
+        merge_key="dropdownOptionId",
+        columns=columns,
+    )
+
+
+def fields_hints(origin_table: ENTITY | str) -> TResourceHints:
+    return dlt.mark.make_hints(
+        table_name=Table.FIELDS.value,
+        write_disposition="merge",  # we only ever want a unique set of fields
+        primary_key="id",
+        merge_key="id",
+        references=[
+            {
+                "columns": ["id"],
+                "referenced_columns": ["id"],
+                "referenced_table": origin_table,
+            }
+        ],
+    )
+
+
+def interactions_hints(write_disposition: TWriteDisposition) -> TResourceHints:
+    return dlt.mark.make_hints(
+        columns=FlattenedInteraction,
+        table_name=Table.INTERACTIONS.value,
+        # follow the origin, so partial loads don't drop other interactions
+        write_disposition=write_disposition,
+        primary_key=["id", "type"],
+        merge_key=["id", "type"],
+        references=[
+            {
+                "columns": ["manualCreator"],
+                "referenced_columns": ["id"],
+                "referenced_table": Table.PERSONS.value,
+            }
+        ],
+    )
+
+
 def mark_dropdown_item(
     dropdown_item: Dropdown | RankedDropdown, field: FieldModel
 ) -> Generator[DataItemWithMeta, None, str]:
     table_name = get_dropdown_options_table(field)
     yield dlt.mark.with_hints(
-        item=pydantic_model_dump(dropdown_item)
-        | {"_dlt_id": dropdown_item.dropdownOptionId},
-        hints=dlt.mark.make_hints(
-            table_name=table_name,
-            write_disposition="merge",  # we only ever want a unique set of dropdown options
-            primary_key="dropdownOptionId",
-            merge_key="dropdownOptionId",
-            columns=type(dropdown_item),
+        item=dump(dropdown_item) | {"_dlt_id": dropdown_item.dropdownOptionId},
+        # the columns are always the models, also for structs of the same name
+        hints=dropdown_options_hints(
+            table_name, SIDE_TABLE_COLUMNS[type(dropdown_item).__name__]
         ),
         # needs to be a variant due to https://github.com/dlt-hub/dlt/pull/2109
         create_table_variant=True,
@@ -266,148 +494,145 @@ def is_custom_field(field: FieldModel) -> bool:
     return field.id.startswith("field-")
 
 
+def process_and_yield_field(
+    field: FieldModel,
+    origin_table: ENTITY | str,
+    write_disposition: TWriteDisposition,
+    ret: Dict[str, Any],
+    references: TTableReferenceParam,
+) -> Generator[DataItemWithMeta, None, None]:
+    """
+    Flattens the value of a field into `ret` and `references`, yielding the field and any side items.
+    The field is either a model or a struct (see `decoding`), so values are matched by their type.
+    """
+    value = unwrap(field.value)
+    yield dlt.mark.with_hints(
+        item=dump(field, exclude={"value"})
+        | {"value_type": value_type(value), "_dlt_id": field.id},
+        hints=fields_hints(origin_table),
+        # needs to be a variant due to https://github.com/dlt-hub/dlt/pull/2109
+        create_table_variant=True,
+    )
+    new_column = field_column(field.id, field.name)
+    match value_type(value):
+        case "datetime":
+            ret[new_column] = value.data
+        case "dropdown" | "ranked-dropdown":
+            new_column = f"{new_column}_dropdown_option_id"
+            if value.data is not None:
+                ret[new_column] = value.data.dropdownOptionId
+                referenced_table = yield from mark_dropdown_item(value.data, field)
+                references.append(
+                    {
+                        "columns": [new_column],
+                        "referenced_columns": ["dropdownOptionId"],
+                        "referenced_table": referenced_table,
+                    }
+                )
+            else:
+                ret[new_column] = None
+        case "dropdown-multi":
+            new_column = f"{new_column}_dropdown_option_ids"
+            if value.data is None or len(value.data) == 0:
+                ret[new_column] = []
+                return
+            ret[new_column] = [x.dropdownOptionId for x in value.data]
+            for d in value.data:
+                referenced_table = yield from mark_dropdown_item(d, field)
+                # TODO: this reference is not strictly correct,
+                # each value in the array should be a reference to the dropdown options table
+                references.append(
+                    {
+                        "columns": [new_column],
+                        "referenced_columns": ["dropdownOptionId"],
+                        "referenced_table": referenced_table,
+                    }
+                )
+        case "formula-number":
+            ret[new_column] = value.data.calculatedValue
+            raise ValueError(f"Value type {value} not implemented")
+        case "interaction":
+            if value.data is None:
+                ret[new_column] = None
+                return
+            interaction = unwrap(value.data)
+            ret[new_column] = dump(interaction, include={"id", "type"})
+            references.append(
+                {
+                    # Improve this once: https://github.com/dlt-hub/dlt/issues/1647 lands
+                    "columns": [f"{new_column}__id", f"{new_column}__type"],
+                    "referenced_columns": ["id", "type"],
+                    "referenced_table": Table.INTERACTIONS.value,
+                }
+            )
+            yield dlt.mark.with_hints(
+                item=dump(interaction)
+                | {"_dlt_id": f"{value_type(interaction)}_{interaction.id}"},
+                hints=interactions_hints(write_disposition),
+                # needs to be a variant due to https://github.com/dlt-hub/dlt/pull/2109
+                create_table_variant=True,
+            )
+        case "person":
+            ret[new_column] = plain(value.data)
+            if value.data is not None:
+                references.append(
+                    {
+                        "columns": [new_column],
+                        "referenced_columns": ["id"],
+                        "referenced_table": Table.PERSONS.value,
+                    }
+                )
+        case "company":
+            ret[new_column] = plain(value.data)
+            if value.data is not None:
+                references.append(
+                    {
+                        # Improve this once: https://github.com/dlt-hub/dlt/issues/1647 lands
+                        "columns": [new_column],
+                        "referenced_columns": ["id"],
+                        "referenced_table": Table.COMPANIES.value,
+                    }
+                )
+        case "person-multi" | "company-multi":
+            ret[new_column] = plain(value.data) if value.data else []
+            # TODO: references once nested hints are supported
+            # https://github.com/dlt-hub/dlt/issues/1647
+        case (
+            "text"
+            | "filterable-text"
+            | "number"
+            | "filterable-text-multi"
+            | "number-multi"
+            | "location"
+            | "location-multi"
+        ):
+            ret[new_column] = plain(value.data)
+        case _:
+            raise ValueError(f"Value type {value} not implemented")
+
+
 def process_and_yield_fields(
     entity: Company | Person | OpportunityWithFields,
     origin_table: ENTITY | str,
+    write_disposition: TWriteDisposition = "replace",
 ) -> Generator[
     DataItemWithMeta, DataItemWithMeta, Tuple[Dict[str, Any], TTableReferenceParam]
 ]:
     ret: Dict[str, Any] = {}
     references: TTableReferenceParam = []
+    transform_profile = current_run().transform_profile
+    transform_profile.count_row(origin_table)
     if not entity.fields:
         return (ret, references)
     for field in entity.fields:
-        yield dlt.mark.with_hints(
-            item=pydantic_model_dump(field, exclude={"value"})
-            | {"value_type": field.value.root.type, "_dlt_id": field.id},
-            hints=dlt.mark.make_hints(
-                table_name=Table.FIELDS.value,
-                write_disposition="merge",  # we only ever want a unique set of fields
-                primary_key="id",
-                merge_key="id",
-                references=[
-                    {
-                        "columns": ["id"],
-                        "referenced_columns": ["id"],
-                        "referenced_table": origin_table,
-                    }
-                ],
-            ),
-            # needs to be a variant due to https://github.com/dlt-hub/dlt/pull/2109
-            create_table_variant=True,
+        gen = process_and_yield_field(
+            field, origin_table, write_disposition, ret, references
         )
-        new_column = f"{field.id}_{field.name}" if is_custom_field(field) else field.id
-        value = field.value.root
-        match value:
-            case DateValue():
-                ret[new_column] = value.data
-            case DropdownValue() | RankedDropdownValue():
-                new_column = f"{new_column}_dropdown_option_id"
-                if value.data is not None:
-                    ret[new_column] = value.data.dropdownOptionId
-                    referenced_table = yield from mark_dropdown_item(value.data, field)
-                    references.append(
-                        {
-                            "columns": [new_column],
-                            "referenced_columns": ["dropdownOptionId"],
-                            "referenced_table": referenced_table,
-                        }
-                    )
-                else:
-                    ret[new_column] = None
-            case DropdownsValue():
-                new_column = f"{new_column}_dropdown_option_ids"
-                if value.data is None or len(value.data) == 0:
-                    ret[new_column] = []
-                    continue
-                ret[new_column] = [x.dropdownOptionId for x in value.data]
-                for d in value.data:
-                    referenced_table = yield from mark_dropdown_item(d, field)
-                    # TODO: this reference is not strictly correct,
-                    # each value in the array should be a reference to the dropdown options table
-                    references.append(
-                        {
-                            "columns": [new_column],
-                            "referenced_columns": ["dropdownOptionId"],
-                            "referenced_table": referenced_table,
-                        }
-                    )
-            case FormulaValue():
-                ret[new_column] = value.data.calculatedValue
-                raise ValueError(f"Value type {value} not implemented")
-            case InteractionValue():
-                if value.data is None:
-                    ret[new_column] = None
-                    continue
-                interaction = value.data.root
-                ret[new_column] = pydantic_model_dump(
-                    interaction, include={"id", "type"}
-                )
-                references.append(
-                    {
-                        # Improve this once: https://github.com/dlt-hub/dlt/issues/1647 lands
-                        "columns": [f"{new_column}__id", f"{new_column}__type"],
-                        "referenced_columns": ["id", "type"],
-                        "referenced_table": Table.INTERACTIONS.value,
-                    }
-                )
-                yield dlt.mark.with_hints(
-                    item=pydantic_model_dump(interaction)
-                    | {"_dlt_id": f"{interaction.type}_{interaction.id}"},
-                    hints=dlt.mark.make_hints(
-                        columns=FlattenedInteraction,
-                        table_name=Table.INTERACTIONS.value,
-                        write_disposition="replace",
-                        primary_key=["id", "type"],
-                        merge_key=["id", "type"],
-                        references=[
-                            {
-                                "columns": ["manualCreator"],
-                                "referenced_columns": ["id"],
-                                "referenced_table": Table.PERSONS.value,
-                            }
-                        ],
-                    ),
-                    # needs to be a variant due to https://github.com/dlt-hub/dlt/pull/2109
-                    create_table_variant=True,
-                )
-            case PersonValue():
-                ret[new_column] = value.data
-                if value.data is not None:
-                    references.append(
-                        {
-                            "columns": [new_column],
-                            "referenced_columns": ["id"],
-                            "referenced_table": Table.PERSONS.value,
-                        }
-                    )
-            case CompanyValue():
-                ret[new_column] = value.data
-                if value.data is not None:
-                    references.append(
-                        {
-                            # Improve this once: https://github.com/dlt-hub/dlt/issues/1647 lands
-                            "columns": [new_column],
-                            "referenced_columns": ["id"],
-                            "referenced_table": Table.COMPANIES.value,
-                        }
-                    )
-            case PersonsValue() | CompaniesValue():
-                ret[new_column] = value.data if value.data else []
-                # TODO: references once nested hints are supported
-                # https://github.com/dlt-hub/dlt/issues/1647
-            case (
-                TextValue()
-                | FloatValue()
-                | TextValue()
-                | TextsValue()
-                | FloatsValue()
-                | LocationValue()
-                | LocationsValue()
-            ):
-                ret[new_column] = value.data
-            case _:
-                raise ValueError(f"Value type {value} not implemented")
+        if transform_profile.enabled:
+            gen = transform_profile.measure(
+                origin_table, value_type(unwrap(field.value)), gen
+            )
+        yield from gen
 
     return (ret, references)
 
@@ -420,58 +645,250 @@ def __get_id(obj):
     return getattr(obj, "id", None)
 
 
-def __create_entity_resource(entity_name: ENTITY, dev_mode=False) -> DltResource:
+def mark_deleted(
+    table_name: str, ids: List[int], fingerprints: FingerprintIndex | None
+) -> Generator[DataItemWithMeta, None, None]:
+    if fingerprints is not None:
+        # a restored entity might come back unchanged, so it needs to be emitted again
+        fingerprints.forget(table_name, ids)
+    yield dlt.mark.with_hints(
+        item=deletion_markers(ids),
+        hints=dlt.mark.make_hints(
+            table_name=table_name,
+            columns=DELETED_COLUMN_HINTS,
+        ),
+        # needs to be a variant due to https://github.com/dlt-hub/dlt/pull/2109
+        create_table_variant=True,
+    )
+
+
+def __create_id_chunks_resource(
+    name: str,
+    entity_name: ENTITY,
+    run: Run,
+    get_ids: Callable[[], Iterable[int]],
+    shard: Shard | None = None,
+) -> DltResource:
+    """
+    Creates a resource that yields known entity IDs in chunks, in place of enumerating them
+    """
+
+    @dlt.resource(selected=False, name=name)
+    @run.resource(name)
+    def __id_chunks() -> Iterable[TDataItem]:
+        ids = [
+            entity_id
+            for entity_id in sorted(set(get_ids()))
+            if shard is None or shard.owns(entity_id)
+        ]
+        run.progress.set_total(entity_name, len(ids))
+        yield from (
+            [{"id": entity_id} for entity_id in chunk]
+            for chunk in chunked(ids, MAX_PAGE_LIMIT_V2)
+        )
+
+    __id_chunks.__name__ = name
+    __id_chunks.__qualname__ = name
+    return __id_chunks
+
+
+def __create_entity_resource(
+    entity_name: ENTITY,
+    run: Run,
+    dev_mode=False,
+    fingerprints: FingerprintIndex | None = None,
+    snapshots: IdSnapshots | None = None,
+    write_disposition: TWriteDisposition = "replace",
+    data_from: DltResource | None = None,
+    sampling: Sampling | None = None,
+    shard: Shard | None = None,
+    concurrency: AdaptiveConcurrency | None = None,
+    hedger: Hedger | None = None,
+    decoder: DECODER = "pydantic",
+    validate_every: int | None = None,
+    predicate: Callable[[Company | Person], bool] | None = None,
+    fields: FieldSelection | None = None,
+    refresh: FieldRefresh | None = None,
+    split: FieldTypeSplit | None = None,
+    entity_cache: EntityCache | None = None,
+) -> DltResource:
+    """
+    entity_cache - only fetch the details of entities that were not cached from the list entries
+    """
     datacls = get_entity_data_class_paged(entity_name)
     name = entity_name
+    page_decoding = PageDecoding(decoder, validate_every)
+    projection = FieldProjection(fields, ENTITY_FIELD_TYPES, f"{entity_name}/fields")
+
+    def fetch(
+        rest_client: RESTClient, ids: List[int], params: Dict[str, List[str]]
+    ) -> List[FlattenedEntity]:
+        if entity_cache is None:
+            return fetch_details(rest_client, ids, params)
+        (cached, ids) = entity_cache.take(entity_name, ids, params)
+        return (fetch_details(rest_client, ids, params) if ids else []) + cached
+
+    def fetch_details(
+        rest_client: RESTClient, ids: List[int], params: Dict[str, List[str]]
+    ) -> List[FlattenedEntity]:
+        endpoint = f"v2/{entity_name}"
+
+        def get(params: Dict[str, List[str]]) -> Response:
+            send = partial(
+                rest_client.get,
+                entity_name,
+                params={
+                    "limit": len(ids),
+                    "ids": ids,
+                    **params,
+                },
+                hooks=hooks,
+            )
+            response = hedger.get(endpoint, send) if hedger is not None else send()
+            response.raise_for_status()
+            return response
+
+        # a split request takes a single slot, as the limiter needs the resource's thread
+        with concurrency.slot(endpoint) if concurrency is not None else nullcontext():
+            content = (
+                split.get(endpoint, get, params)
+                if split is not None
+                else get(params).content
+            )
+        if hedger is not None:
+            hedger.publish(endpoint)
+        if split is not None:
+            split.publish(endpoint)
+        return decode(content, len(ids))
+
+    def decode(content: bytes, rows: int) -> List[FlattenedEntity]:
+        if run.process_pool.enabled:
+            with run.timeline.span("offload", "transform", rows=rows):
+                return [
+                    (
+                        row,
+                        ret,
+                        references,
+                        restore_side_items(items, name, write_disposition),
+                    )
+                    for (row, ret, references, items) in page_decoding.decode(
+                        name,
+                        partial(
+                            run.process_pool.run,
+                            flatten_entities_page,
+                            entity_name,
+                            content,
+                            write_disposition,
+                        ),
+                    )
+                ]
+        else:
+            with run.timeline.span("validate", "transform", rows=rows):
+                entities = page_decoding.decode(
+                    name, partial(decode_json, content, datacls)
+                )
+            with run.timeline.span("flatten", "transform", rows=len(entities.data)):
+                return flatten_entities(entities.data, name, write_disposition)
 
     @dlt.transformer(
         # we fetch IDs for all entities first,
         # without any data, so we can parallelize the more expensive data fetching
         # whilst not hitting the API limits so fast and we can parallelize
         # because we don't need to page with cursors
-        data_from=__create_id_resource(entity_name, dev_mode=dev_mode),
-        write_disposition="replace",
+        data_from=data_from
+        or __create_id_resource(
+            entity_name,
+            run,
+            dev_mode=dev_mode,
+            snapshots=snapshots,
+            sampling=sampling,
+            shard=shard,
+            predicate=predicate,
+            entity_cache=entity_cache,
+        ),
+        write_disposition=write_disposition,
         parallelized=True,
         primary_key="id",
         merge_key="id",
         max_table_nesting=3,
         name=name,
     )
+    @run.resource(name)
     def __entities(
         entity_arr: List[Company | Person | Opportunity],
     ) -> Iterable[TDataItem]:
+        if isinstance(entity_arr, DeletedIds):
+            yield from mark_deleted(name, entity_arr, fingerprints)
+            return
+
         rest_client = get_v2_rest_client()
 
         ids = [__get_id(x) for x in entity_arr]
-        response = rest_client.get(
-            entity_name,
-            params={
-                "limit": len(ids),
-                "ids": ids,
-                "fieldTypes": [
-                    Type3.ENRICHED.value,
-                    Type3.GLOBAL_.value,
-                    Type3.RELATIONSHIP_INTELLIGENCE.value,
-                ],
-            },
-            hooks=hooks,
-        )
-        response.raise_for_status()
-        entities = datacls.model_validate_json(json_data=response.text)
-
-        for e in entities.data:
-            (ret, references) = yield from process_and_yield_fields(e, name)
-            yield dlt.mark.with_hints(
-                item=pydantic_model_dump(e, exclude={"fields"})
-                | ret
-                | {"_dlt_id": e.id},
-                hints=dlt.mark.make_hints(
-                    table_name=name,
-                    references=references,
+        params = projection.params(rest_client)
+        if refresh is not None:
+            carried = refresh.carried(name, params)
+            params = refresh.project(name, params)
+        flattened = fetch(rest_client, ids, params)
+        run.http_metrics.publish(name)
+        if entity_cache is not None:
+            entity_cache.publish(name)
+        if refresh is not None:
+            completions = complete_field_columns(
+                refresh,
+                name,
+                {row["id"]: (ret, items) for (row, ret, _, items) in flattened},
+                params.get("fieldTypes", []),
+                carried,
+                lambda missing_ids, field_types: (
+                    (row["id"], ret, references, items)
+                    for (row, ret, references, items) in fetch(
+                        rest_client, missing_ids, {"fieldTypes": field_types}
+                    )
                 ),
-                # needs to be a variant due to https://github.com/dlt-hub/dlt/pull/2109
-                create_table_variant=True,
             )
+            flattened = [
+                (
+                    row,
+                    completions[row["id"]][0] | ret,
+                    references + completions[row["id"]][1],
+                    items + completions[row["id"]][2],
+                )
+                for (row, ret, references, items) in flattened
+            ]
+        run.progress.update(name, len(flattened))
+        run.progress.publish(name)
+        page_decoding.publish(name)
+
+        changed = None
+        if fingerprints is not None:
+            changed = {
+                row["id"]
+                for row in fingerprints.filter_changed(
+                    name,
+                    [row | ret for (row, ret, _, _) in flattened],
+                )
+            }
+            dlt.current.resource_metrics()["skipped_unchanged_rows"] = (
+                fingerprints.skipped[name]
+            )
+        for row, ret, references, field_results in flattened:
+            if changed is None or row["id"] in changed:
+                yield from field_results
+                yield mark_entity(row, ret, references)
+        run.transform_profile.publish(name)
+
+    def mark_entity(
+        row: Dict[str, Any], ret: Dict[str, Any], references: TTableReferenceParam
+    ) -> DataItemWithMeta:
+        return dlt.mark.with_hints(
+            item=row | ret | {"_dlt_id": row["id"]},
+            hints=dlt.mark.make_hints(
+                table_name=name,
+                references=references,
+            ),
+            # needs to be a variant due to https://github.com/dlt-hub/dlt/pull/2109
+            create_table_variant=True,
+        )
 
     __entities.__name__ = name
     __entities.__qualname__ = name
@@ -489,111 +906,975 @@ class ReturningGenerator:
         return self.value
 
 
-def __create_list_entries_resource(list_ref: ListReference, dev_mode=False):
+FlattenedEntity = Tuple[
+    Dict[str, Any], Dict[str, Any], TTableReferenceParam, List[DataItemWithMeta]
+]
+"""
+The entity without its fields, the flattened fields, their references and side items
+"""
+FlattenedListEntry = Tuple[Dict[str, Any], TTableReferenceParam, List[DataItemWithMeta]]
+"""
+The list entry with its flattened fields, their references and side items
+"""
+CompactSideItem = Tuple[str, str | None, Dict[str, Any]]
+"""
+The table, the name of the columns model and the data of a side item
+"""
+SIDE_TABLE_COLUMNS = {cls.__name__: cls for cls in (Dropdown, RankedDropdown)}
+
+
+def flatten_entities(
+    entities: Iterable[Company | Person | OpportunityWithFields],
+    origin_table: ENTITY | str,
+    write_disposition: TWriteDisposition,
+) -> List[FlattenedEntity]:
+    flattened = []
+    for e in entities:
+        gen = ReturningGenerator(
+            process_and_yield_fields(e, origin_table, write_disposition)
+        )
+        field_results = list(gen)
+        (ret, references) = gen.value
+        flattened.append((dump(e, exclude={"fields"}), ret, references, field_results))
+    return flattened
+
+
+def flatten_list_entries(
+    list_entries: Iterable[ListEntryWithEntity],
+    origin_table: str,
+    write_disposition: TWriteDisposition,
+) -> List[FlattenedListEntry]:
+    flattened = []
+    for list_entry in list_entries:
+        e = unwrap(list_entry)
+        gen = ReturningGenerator(
+            process_and_yield_fields(e.entity, origin_table, write_disposition)
+        )
+        field_results = list(gen)
+        (ret, references) = gen.value
+        row = (
+            dump(e, exclude={"entity"})
+            | ret
+            | {"_dlt_id": e.id, "entity_id": e.entity.id}
+        )
+        flattened.append((row, references, field_results))
+    return flattened
+
+
+def flatten_list_entry_entities(
+    list_entries: Iterable[ListEntryWithEntity],
+    write_disposition: TWriteDisposition,
+    needs: Callable[[str, int], bool] = lambda entity_name, entity_id: True,
+) -> List[CachedEntity]:
+    """
+    Flattens the companies and persons of list entries (that are `needs`ed) as rows of their own
+    resource, like `flatten_entities`, with the columns, references and side items of their fields
+    grouped by field type, for the `EntityCache`. List fields are left out.
+    """
+    flattened = []
+    for list_entry in list_entries:
+        e = unwrap(list_entry)
+        entity_name = LIST_ENTRY_ENTITIES.get(value_type(e))
+        if entity_name is None or not needs(entity_name, e.entity.id):
+            continue
+        groups: Dict[str, FieldGroup] = {}
+        for field in e.entity.fields or []:
+            field_type = getattr(field.type, "value", field.type)
+            if field_type == Type3.LIST.value:
+                continue
+            (ret, references, items) = groups.setdefault(field_type, ({}, [], []))
+            items.extend(
+                process_and_yield_field(
+                    field, entity_name, write_disposition, ret, references
+                )
+            )
+        flattened.append(
+            (entity_name, e.entity.id, dump(e.entity, exclude={"fields"}), groups)
+        )
+    return flattened
+
+
+def compact_side_items(items: List[DataItemWithMeta]) -> List[CompactSideItem]:
+    """
+    Reduces side items to a picklable form, as their hints hold validators that can't be pickled
+    """
+    return [
+        (
+            item.meta.hints["table_name"],
+            getattr(item.meta.hints.get("original_columns"), "__name__", None),
+            item.data,
+        )
+        for item in items
+    ]
+
+
+def restore_side_items(
+    items: List[CompactSideItem],
+    origin_table: str,
+    write_disposition: TWriteDisposition,
+) -> List[DataItemWithMeta]:
+    restored = []
+    for table_name, columns, data in items:
+        if table_name == Table.FIELDS.value:
+            hints = fields_hints(origin_table)
+        elif table_name == Table.INTERACTIONS.value:
+            hints = interactions_hints(write_disposition)
+        else:
+            hints = dropdown_options_hints(table_name, SIDE_TABLE_COLUMNS[columns])
+        restored.append(
+            dlt.mark.with_hints(
+                item=data,
+                hints=hints,
+                # needs to be a variant due to https://github.com/dlt-hub/dlt/pull/2109
+                create_table_variant=True,
+            )
+        )
+    return restored
+
+
+def group_field_columns(
+    columns: Dict[str, Any], items: List[DataItemWithMeta], field_types: Iterable[str]
+) -> FieldColumns:
+    """
+    Groups the field columns of a flattened row by the types of their fields (as per the fields
+    side items of the row), with an empty group for each fetched field type without fields
+    """
+    groups: FieldColumns = {field_type: {} for field_type in field_types}
+    for item in items:
+        if item.meta.hints["table_name"] != Table.FIELDS.value:
+            continue
+        field_type = item.data["type"]
+        group = groups.setdefault(getattr(field_type, "value", field_type), {})
+        column = field_column(item.data["id"], item.data["name"])
+        for key in (
+            column,
+            f"{column}_dropdown_option_id",
+            f"{column}_dropdown_option_ids",
+        ):
+            if key in columns:
+                group[key] = columns[key]
+    return groups
+
+
+FieldCompletion = Tuple[Dict[str, Any], TTableReferenceParam, List[DataItemWithMeta]]
+"""
+The carried columns of a row, with the references and side items of its fetched missing fields
+"""
+
+
+def complete_field_columns(
+    refresh: FieldRefresh,
+    table: str,
+    rows: Dict[int, Tuple[Dict[str, Any], List[DataItemWithMeta]]],
+    fetched: List[str],
+    carried: List[str],
+    fetch_missing: Callable[
+        [List[int], List[str]],
+        Iterable[
+            Tuple[int, Dict[str, Any], TTableReferenceParam, List[DataItemWithMeta]]
+        ],
+    ],
+) -> Dict[int, FieldCompletion]:
+    """
+    Completes rows fetched with the due field types only with the cached columns of the `carried`
+    field types, fetching the carried field types of the rows that are not cached yet
+    """
+    (columns, missing) = refresh.complete(
+        table,
+        {
+            row_id: group_field_columns(row_columns, items, fetched)
+            for row_id, (row_columns, items) in rows.items()
+        },
+        carried,
+    )
+    completions: Dict[int, FieldCompletion] = {
+        row_id: (columns[row_id], [], []) for row_id in rows
+    }
+    missing_ids: Dict[Tuple[str, ...], List[int]] = {}
+    for row_id, field_types in missing.items():
+        missing_ids.setdefault(tuple(field_types), []).append(row_id)
+    for field_types, ids in missing_ids.items():
+        logger.info(f"{table}: fetching {list(field_types)} of {len(ids)} new rows")
+        groups: Dict[int, FieldColumns] = {}
+        for row_id, row_columns, references, items in fetch_missing(
+            ids, list(field_types)
+        ):
+            groups[row_id] = group_field_columns(row_columns, items, field_types)
+            (carried_columns, carried_references, carried_items) = completions[row_id]
+            for group in groups[row_id].values():
+                carried_columns |= group
+            carried_references.extend(references)
+            carried_items.extend(items)
+        refresh.store(table, groups)
+    return completions
+
+
+def flatten_entities_page(
+    entity_name: ENTITY,
+    raw: bytes,
+    write_disposition: TWriteDisposition,
+    decoder: DECODER = "pydantic",
+) -> List[
+    Tuple[Dict[str, Any], Dict[str, Any], TTableReferenceParam, List[CompactSideItem]]
+]:
+    """
+    Validates and flattens a page of entities in a worker process of the process pool
+    """
+    entities = decode_json(raw, get_entity_data_class_paged(entity_name), decoder)
+    return [
+        (row, ret, references, compact_side_items(field_results))
+        for (row, ret, references, field_results) in flatten_entities(
+            entities.data, entity_name, write_disposition
+        )
+    ]
+
+
+def flatten_list_entries_page(
+    name: str,
+    raw: bytes,
+    write_disposition: TWriteDisposition,
+    decoder: DECODER = "pydantic",
+    with_entities=False,
+) -> Tuple[
+    List[Tuple[Dict[str, Any], TTableReferenceParam, List[CompactSideItem]]],
+    List[CachedEntity],
+]:
+    """
+    Validates and flattens a page of list entries in a worker process of the process pool, and
+    (`with_entities`) their companies and persons for the `EntityCache`
+    """
+    list_entries = decode_json(raw, ListEntryWithEntityPaged, decoder).data or []
+    entities = (
+        flatten_list_entry_entities(list_entries, write_disposition)
+        if with_entities
+        else []
+    )
+    return (
+        [
+            (row, references, compact_side_items(field_results))
+            for (row, references, field_results) in flatten_list_entries(
+                list_entries, name, write_disposition
+            )
+        ],
+        [
+            (
+                entity_name,
+                entity_id,
+                row,
+                {
+                    field_type: (ret, references, compact_side_items(items))
+                    for field_type, (ret, references, items) in groups.items()
+                },
+            )
+            for (entity_name, entity_id, row, groups) in entities
+        ],
+    )
+
+
+def __create_list_entries_resource(
+    list_ref: ListReference,
+    run: Run,
+    dev_mode=False,
+    fingerprints: FingerprintIndex | None = None,
+    snapshots: IdSnapshots | None = None,
+    write_disposition: TWriteDisposition = "replace",
+    entry_ids: Callable[[], Iterable[int]] | None = None,
+    sampling: Sampling | None = None,
+    decoder: DECODER = "pydantic",
+    validate_every: int | None = None,
+    fields: FieldSelection | None = None,
+    refresh: FieldRefresh | None = None,
+    scheduler: ListScheduler | None = None,
+    entity_cache: EntityCache | None = None,
+):
+    """
+    entry_ids - only (re-)fetch these list entries instead of paging over the whole list
+    sampling - only keep a sample of the list entries when paging over the whole list
+    fields - only fetch these fields of the list entries, saved views return the fields of their columns
+    refresh - only fetch the due field types, saved views return the fields of their columns
+    scheduler - wait for the scheduler to admit the list before paging over it
+    entity_cache - cache the companies and persons of the list entries when paging over the whole list
+    """
     name = f"lists-{list_ref}-entries"
     endpoint = generate_list_entries_path(list_ref)
-
-    @dlt.resource(
-        write_disposition="replace",
-        parallelized=True,
-        primary_key="id",
-        merge_key="id",
-        max_table_nesting=3,
-        name=name,
-        table_name=name,
+    projection = FieldProjection(
+        fields, LIST_ENTRY_FIELD_TYPES, f"lists/{list_ref.list_id}/fields"
     )
-    def __list_entries() -> Iterable[TDataItem]:
+    page_decoding = PageDecoding(decoder, validate_every)
+
+    def field_params(rest_client: RESTClient) -> Dict[str, List[str]]:
+        params = projection.params(rest_client)
+        return refresh.project(name, params) if refresh is not None else params
+
+    def fetch_entries(
+        rest_client: RESTClient, ids: List[int], params: Dict[str, List[str]]
+    ) -> Iterable[List[ListEntryWithEntity]]:
+        for chunk in chunked(ids, MAX_PAGE_LIMIT_V2):
+            list_entries = []
+            for entry_id in chunk:
+                try:
+                    response = rest_client.get(
+                        f"lists/{list_ref.list_id}/list-entries/{entry_id}",
+                        params=params,
+                        hooks=hooks,
+                    )
+                except HTTPError as e:
+                    if e.response is not None and e.response.status_code == 404:
+                        logger.info(f"{name}: list entry {entry_id} no longer exists")
+                        continue
+                    raise
+                list_entries.append(
+                    run.timeline.call(
+                        "validate",
+                        "transform",
+                        page_decoding.decode,
+                        name,
+                        partial(decode_json, response.content, ListEntryWithEntity),
+                    )
+                )
+            yield list_entries
+
+    def paginate(
+        rest_client: RESTClient, params: Dict[str, List[str]]
+    ) -> Iterable[PageData]:
+        # The list_entries endpoint does not support passing a list of IDs
+        # Thus we need to page as per usual, which is not as efficient as
+        # the Companies and Persons endpoints
+        # TODO: performance: change this when/if the API changes
+        yield from rest_client.paginate(
+            endpoint,
+            params={
+                "limit": MAX_PAGE_LIMIT_V2,
+                **params,
+            },
+            hooks=hooks,
+        )
+
+    def cache_entities(
+        list_entries: List[ListEntryWithEntity], field_types: List[str]
+    ) -> List[ListEntryWithEntity]:
+        """
+        Caches the companies and persons of the list entries, flattened as rows of their own
+        """
+        with run.timeline.span("flatten", "transform", rows=len(list_entries)):
+            entity_cache.add(
+                flatten_list_entry_entities(
+                    list_entries,
+                    write_disposition,
+                    lambda entity_name, entity_id: entity_cache.needs(
+                        entity_name, entity_id, field_types
+                    ),
+                ),
+                field_types,
+            )
+        return list_entries
+
+    def flatten(list_entries: List[ListEntryWithEntity]) -> List[FlattenedListEntry]:
+        with run.timeline.span("flatten", "transform", rows=len(list_entries)):
+            return flatten_list_entries(list_entries, name, write_disposition)
+
+    def complete(
+        rest_client: RESTClient, flattened: List[FlattenedListEntry]
+    ) -> List[FlattenedListEntry]:
+        """
+        Completes the list entries with the cached columns of the field types that are not due
+        """
+        params = projection.params(rest_client)
+        completions = complete_field_columns(
+            refresh,
+            name,
+            {row["id"]: (row, items) for (row, _, items) in flattened},
+            refresh.project(name, params).get("fieldTypes", []),
+            refresh.carried(name, params),
+            lambda missing_ids, field_types: (
+                (row["id"], row, references, items)
+                for list_entries in fetch_entries(
+                    rest_client, missing_ids, {"fieldTypes": field_types}
+                )
+                for (row, references, items) in flatten(list_entries)
+            ),
+        )
+        return [
+            (
+                completions[row["id"]][0] | row,
+                references + completions[row["id"]][1],
+                items + completions[row["id"]][2],
+            )
+            for (row, references, items) in flattened
+        ]
+
+    def offload(
+        rest_client: RESTClient, params: Dict[str, List[str]]
+    ) -> Iterable[List[FlattenedListEntry]]:
+        """
+        Validates and flattens the pages in the process pool, while paging ahead
+        """
+        pending: Deque[Tuple[Future, bytes, DECODER]] = deque()
+        field_types = params.get("fieldTypes", [])
+        with_entities = entity_cache is not None and bool(field_types)
+
+        def restore(
+            future: Future, raw: bytes, decoder: DECODER
+        ) -> List[FlattenedListEntry]:
+            def result(result_decoder: DECODER):
+                if result_decoder == decoder:
+                    return future.result()
+                # the page failed to decode, so it's validated again
+                return run.process_pool.run(
+                    flatten_list_entries_page,
+                    name,
+                    raw,
+                    write_disposition,
+                    result_decoder,
+                    with_entities,
+                )
+
+            with run.timeline.span("offload", "transform"):
+                (list_entries, entities) = page_decoding.decode(name, result, decoder)
+                if entities:
+                    entity_cache.add(
+                        (
+                            (
+                                entity_name,
+                                entity_id,
+                                row,
+                                {
+                                    field_type: (
+                                        ret,
+                                        references,
+                                        restore_side_items(
+                                            items, entity_name, write_disposition
+                                        ),
+                                    )
+                                    for field_type, (
+                                        ret,
+                                        references,
+                                        items,
+                                    ) in groups.items()
+                                },
+                            )
+                            for (entity_name, entity_id, row, groups) in entities
+                        ),
+                        field_types,
+                    )
+                return [
+                    (
+                        row,
+                        references,
+                        restore_side_items(items, name, write_disposition),
+                    )
+                    for (row, references, items) in list_entries
+                ]
+
+        for page in paginate(rest_client, params):
+            decoder = page_decoding.next_decoder()
+            pending.append(
+                (
+                    run.process_pool.submit(
+                        flatten_list_entries_page,
+                        name,
+                        page.response.content,
+                        write_disposition,
+                        decoder,
+                        with_entities,
+                    ),
+                    page.response.content,
+                    decoder,
+                )
+            )
+            if len(pending) > run.process_pool.workers:
+                yield restore(*pending.popleft())
+        while pending:
+            yield restore(*pending.popleft())
+
+    def list_entries() -> Generator[TDataItem, None, int]:
+        """
+        Yields the list entries with their side items, returning the number of list entries
+        """
         rest_client = get_v2_rest_client()
-        for list_entries in (
-            list_adapter.validate_python(entities)
-            # The list_entries endpoint does not support passing a list of IDs
-            # Thus we need to page as per usual, which is not as efficient as
-            # the Companies and Persons endpoints
-            # TODO: performance: change this when/if the API changes
-            for entities in rest_client.paginate(
-                endpoint,
-                params={
-                    "limit": MAX_PAGE_LIMIT_V2,
-                    "fieldTypes": [
-                        Type3.ENRICHED.value,
-                        Type3.GLOBAL_.value,
-                        Type3.RELATIONSHIP_INTELLIGENCE.value,
-                        Type3.LIST.value,
-                    ],
-                },
-                hooks=hooks,
+        if entry_ids is not None:
+            ids = sorted(entry_ids())
+            run.progress.set_total(name, len(ids))
+            pages = map(
+                flatten, fetch_entries(rest_client, ids, field_params(rest_client))
             )
-        ):
+        elif run.process_pool.enabled and sampling is None:
+            pages = offload(rest_client, field_params(rest_client))
+        else:
+            params = field_params(rest_client)
+            batches = (
+                run.timeline.call(
+                    "validate",
+                    "transform",
+                    page_decoding.decode,
+                    name,
+                    partial(decode_list, entities, ListEntryWithEntity),
+                )
+                for entities in paginate(rest_client, params)
+            )
+            if sampling is not None:
+                batches = sampling.sample(
+                    batches, lambda entry: unwrap(entry).id, MAX_PAGE_LIMIT_V2
+                )
+            if entity_cache is not None:
+                batches = (
+                    cache_entities(batch, params.get("fieldTypes", []))
+                    for batch in batches
+                )
+            pages = map(flatten, batches)
+
+        if refresh is not None:
+            pages = (complete(rest_client, flattened) for flattened in pages)
+
+        enumerated_ids: List[int] = []
+        entries = 0
+        for flattened in pages:
+            entries += len(flattened)
+            run.progress.update(name, len(flattened))
             field_results: List[DataItemWithMeta] = []
             list_entry_results = []
             references: TTableReferenceParam = None
-            for list_entry in list_entries:
-                e = list_entry.root
-                gen_fields = process_and_yield_fields(e.entity, name)
-                gen = ReturningGenerator(gen_fields)
-                field_results.extend(gen)
-                (ret, one_references) = gen.value
+            entry_field_results: Dict[int, List[DataItemWithMeta]] = {}
+            for row, one_references, results in flattened:
+                entry_field_results[row["id"]] = results
                 if references is None and len(one_references) > 0:
                     # each row should be the same, so only set it once
                     references = one_references
+                list_entry_results.append(row)
+            if snapshots is not None:
+                enumerated_ids.extend(row["id"] for row in list_entry_results)
 
-                combined_list_entry = (
-                    pydantic_model_dump(e, exclude={"entity"})
-                    | ret
-                    | {"_dlt_id": e.id, "entity_id": e.entity.id}
+            if fingerprints is not None:
+                list_entry_results = fingerprints.filter_changed(
+                    name, list_entry_results
+                )
+                changed = {row["id"] for row in list_entry_results}
+                for entry_id, results in entry_field_results.items():
+                    if entry_id in changed:
+                        field_results.extend(results)
+                dlt.current.resource_metrics()["skipped_unchanged_rows"] = (
+                    fingerprints.skipped[name]
                 )
-                list_entry_results.append(combined_list_entry)
+            else:
+                for results in entry_field_results.values():
+                    field_results.extend(results)
 
-            yield dlt.mark.with_hints(
-                item=list_entry_results,
-                hints=dlt.mark.make_hints(
-                    table_name=name,
-                    references=references,
-                ),
-                # needs to be a variant due to https://github.com/dlt-hub/dlt/pull/2109
-                create_table_variant=True,
-            )
+            if list_entry_results:
+                yield dlt.mark.with_hints(
+                    item=list_entry_results,
+                    hints=dlt.mark.make_hints(
+                        table_name=name,
+                        references=references,
+                    ),
+                    # needs to be a variant due to https://github.com/dlt-hub/dlt/pull/2109
+                    create_table_variant=True,
+                )
             yield from field_results
 
+        if snapshots is not None:
+            deleted = snapshots.diff(name, enumerated_ids)
+            if deleted:
+                logger.info(f"{name}: detected {len(deleted)} deleted list entries")
+                yield from mark_deleted(name, deleted, fingerprints)
+
+        if fingerprints is not None:
+            logger.info(f"{name}: skipped {fingerprints.skipped[name]} unchanged rows")
+        run.http_metrics.publish(name)
+        run.transform_profile.publish(name)
+        page_decoding.publish(name)
+        run.progress.complete_total(name)
+        run.progress.publish(name)
+        return entries
+
+    @dlt.resource(
+        write_disposition=write_disposition,
+        parallelized=True,
+        primary_key="id",
+        merge_key="id",
+        max_table_nesting=3,
+        name=name,
+        table_name=name,
+    )
+    @run.resource(name)
+    def __list_entries() -> Iterable[TDataItem]:
+        if entity_cache is not None:
+            entity_cache.start(name)
+        try:
+            yield from scheduled()
+        finally:
+            if entity_cache is not None:
+                entity_cache.done(name)
+
+    def scheduled() -> Iterable[TDataItem]:
+        if scheduler is None:
+            yield from list_entries()
+            return
+        yield from scheduler.admit(name)
+        entries = None
+        try:
+            entries = yield from list_entries()
+        finally:
+            # only a complete pass over the list tells its size
+            scheduler.done(
+                name, entries if entry_ids is None and sampling is None else None
+            )
+
     __list_entries.__name__ = name
     __list_entries.__qualname__ = name
     return __list_entries
 
 
-@dlt.source(name="affinity")
+def __create_view_membership_resource(
+    view_ref: ListReference,
+    run: Run,
+    dev_mode=False,
+    sampling: Sampling | None = None,
+):
+    """
+    Pages over the entries of a saved view, only keeping which list entries are in it, as the
+    list entries (with all their fields) are loaded from their list, see `coalesce_list_refs`
+
+    sampling - only keep the memberships of the sampled list entries of the list
+    """
+    name = f"lists-{view_ref}-membership"
+    endpoint = generate_list_entries_path(view_ref)
+
+    @dlt.resource(
+        # every run pages over the whole saved view, so entries that left it are dropped
+        write_disposition="replace",
+        parallelized=not dev_mode,
+        primary_key=["list_entry_id", "view_id"],
+        name=name,
+        table_name=name,
+        references=[
+            {
+                "columns": ["list_entry_id"],
+                "referenced_columns": ["id"],
+                "referenced_table": f"lists-{ListReference(view_ref.list_id)}-entries",
+            }
+        ],
+    )
+    @run.resource(name)
+    def __membership() -> Iterable[TDataItem]:
+        rest_client = get_v2_rest_client()
+        batches = (
+            membership_rows(view_ref, page)
+            for page in rest_client.paginate(
+                endpoint, params={"limit": MAX_PAGE_LIMIT_V2}, hooks=hooks
+            )
+        )
+        if sampling is not None:
+            batches = sampling.sample(
+                batches, lambda row: row["list_entry_id"], MAX_PAGE_LIMIT_V2
+            )
+        for batch in batches:
+            run.progress.update(name, len(batch))
+            yield batch
+        run.http_metrics.publish(name)
+        run.progress.publish(name)
+
+    __membership.__name__ = name
+    __membership.__qualname__ = name
+    return __membership
+
+
+# Nested tables carry the root key in replace loads too, so they can switch to merge later
+@dlt.source(name="affinity", section="affinity", root_key=True)
 def source(
     list_refs: List[ListReference] = dataclass_field(default_factory=list),
     dev_mode=False,
+    sampling: Sampling | None = None,
+    shard: Shard | None = None,
+    fields: Dict[ENTITY | ListReference, FieldSelection] | None = None,
+    filters: Filters = Filters(),
+    ids: ExplicitIds | None = None,
+    incremental: Incremental = Incremental(),
+    list_loading: ListLoading = ListLoading(),
+    concurrency: Concurrency = Concurrency(),
+    decoding: Decoding = Decoding(),
+    diagnostics: Diagnostics = Diagnostics(),
 ) -> Sequence[DltResource]:
     """
     list_refs - one or more references to lists and/or saved list views
+    sampling - only load a deterministic sample of the companies, persons, opportunities and
+        list entries, including all their fields, e.g. `Sampling(rate=0.01, max_items=100)`
+    shard - only load this one of several shards, each loaded by its own pipeline into the same
+        dataset: companies and persons are split by a hash of their ID, lists (entries),
+        opportunities and notes by resource
+    fields - only fetch the selected fields of `companies`, `persons` or the entries of a list
+        (keyed by its `ListReference`), e.g. `{"companies": FieldSelection(field_names=["Stage"])}`
+    filters - only load the companies and persons a filter returns true for
+    ids - only refresh the given companies, persons and list entries
+    incremental - only load what changed since the last run, see `Incremental`
+    list_loading - discover, coalesce and schedule the lists, see `ListLoading`
+    concurrency - adapt, hedge, rate limit and split the detail requests, see `Concurrency`
+    decoding - decode, validate and flatten pages faster, see `Decoding`
+    diagnostics - profile, trace and log the progress of the run, see `Diagnostics`
     """
-    list_resources = [
-        __create_list_entries_resource(ref, dev_mode=dev_mode) for ref in list_refs
+    targeted = ids is not None
+    decoding.validate()
+    list_loading.validate()
+    concurrency.validate()
+    incremental.validate()
+    if shard is not None and not 0 <= shard.index < shard.count:
+        raise ValueError(
+            f"The shard index must be between 0 and {shard.count - 1}, got {shard.index}"
+        )
+    if incremental.detect_deletions and (
+        dev_mode
+        or incremental.change_feed
+        or targeted
+        or sampling is not None
+        or shard is not None
+    ):
+        raise ValueError(
+            "Deletion detection needs a complete enumeration of IDs, which dev_mode, change_feed, explicit IDs, sampling and sharding do not do"
+        )
+    if incremental.change_feed and targeted:
+        raise ValueError("The change feed can't be combined with explicit IDs")
+    predicates: Dict[ENTITY, Callable[[Any], bool] | None] = {
+        "companies": filters.companies,
+        "persons": filters.persons,
+    }
+    if (incremental.change_feed or targeted) and any(predicates.values()):
+        raise ValueError(
+            "Filters are evaluated when enumerating IDs, which the change feed and explicit IDs do not do"
+        )
+    fields = fields or {}
+    for key, selection in fields.items():
+        if isinstance(key, ListReference) and key.view_id is not None:
+            raise ValueError(
+                f"Saved views return the fields of their columns, can't select the fields of {key!r}"
+            )
+        if not isinstance(key, ListReference) and key not in predicates:
+            raise ValueError(f"Can't select the fields of {key}")
+        selection.validate()
+    decoder = decoding.decoder
+    validate_every = decoding.validate_every
+    # Metrics, profiles, the trace and the progress are collected per run of the source
+    run = Run(
+        profile_transforms=diagnostics.profile_transforms,
+        profile_dir=diagnostics.profile_dir,
+        trace_file=diagnostics.trace_file,
+        progress_interval=diagnostics.progress_interval,
+        rate_limit_dir=concurrency.rate_limit_dir,
+        process_workers=decoding.process_workers,
+    )
+    fingerprints = (
+        FingerprintIndex(incremental.fingerprint_index_path)
+        if incremental.skip_unchanged
+        else None
+    )
+    snapshots = IdSnapshots() if incremental.detect_deletions else None
+    feed = ChangeFeed() if incremental.change_feed else None
+    limiter = AdaptiveConcurrency(run.http_metrics) if concurrency.adaptive else None
+    workers = initial_concurrency()
+    hedger = (
+        Hedger(workers, rate_limiter=run.rate_limiter)
+        if concurrency.hedge_requests
+        else None
+    )
+    refresh = (
+        FieldRefresh(incremental.field_refresh_intervals)
+        if incremental.field_refresh_intervals
+        else None
+    )
+    split = (
+        FieldTypeSplit(concurrency.split_field_types, workers)
+        if concurrency.split_field_types
+        else None
+    )
+    # Unchanged rows are not emitted when fingerprinting, deleted rows are removed via hard delete
+    # markers and the change feed and explicit IDs only emit some rows, so we can't (and don't need to) replace then.
+    # Shards write into the same tables, including the shared fields, dropdown options and interactions.
+    # Interactions of relationship intelligence fields that are not due must not be dropped either.
+    write_disposition: TWriteDisposition = (
+        "merge" if incremental.merges or targeted or shard is not None else "replace"
+    )
+
+    get_entity_ids: Callable[[ENTITY], Iterable[int]] | None = None
+    get_list_entry_ids: Callable[[int], Iterable[int]] | None = None
+    if feed is not None:
+        get_entity_ids = feed.changed_entity_ids
+        get_list_entry_ids = feed.changed_list_entry_ids
+    elif ids is not None:
+        requested_ids = {
+            "companies": ids.company_ids or [],
+            "persons": ids.person_ids or [],
+        }
+        get_entity_ids = requested_ids.__getitem__
+        get_list_entry_ids = (ids.list_entry_ids or {}).__getitem__
+        # List entries are refreshed from their list, regardless of the views they were referenced by
+        list_refs = [ListReference(list_id) for list_id in ids.list_entry_ids or {}]
+
+    if list_loading.discover and not targeted:
+        with run.active():
+            discovered = discover_list_refs(
+                get_v2_rest_client(),
+                # Saved views can't be refreshed by the change feed
+                saved_views=feed is None,
+            )
+        list_refs = list(dict.fromkeys([*list_refs, *discovered]))
+
+    def owned(name: str) -> bool:
+        return shard is None or shard.owns(name)
+
+    view_refs: List[ListReference] = []
+    if list_loading.coalesce_views and get_list_entry_ids is None:
+        list_refs, view_refs = coalesce_list_refs(list_refs)
+    list_refs = [ref for ref in list_refs if owned(f"lists-{ref}-entries")]
+    # Resources waiting for the lists must leave an extract worker to them
+    budget = WorkerBudget(workers)
+    # Saved views return the fields of their columns, and explicit IDs don't page over the lists
+    entity_cache = (
+        EntityCache(
+            [f"lists-{ref}-entries" for ref in list_refs if ref.view_id is None],
+            budget,
+            list_loading.gather_seconds,
+        )
+        if list_loading.reuse_entities and get_list_entry_ids is None
+        else None
+    )
+    membership_resources = [
+        __create_view_membership_resource(
+            ref, run, dev_mode=dev_mode, sampling=sampling
+        )
+        for ref in view_refs
+        if owned(f"lists-{ref}-membership")
     ]
+    scheduler = (
+        ListScheduler(
+            list_refs,
+            list_loading.max_in_flight,
+            budget,
+            list_loading.gather_seconds,
+        )
+        if list_loading.max_in_flight is not None
+        else None
+    )
+    list_resources = []
+    for ref in list_refs:
+        entry_ids = None
+        if get_list_entry_ids is not None:
+            if ref.view_id is not None:
+                logger.warning(
+                    f"Saved views can't be refreshed by list entry, skipping {ref!r}"
+                )
+                continue
+            entry_ids = partial(get_list_entry_ids, ref.list_id)
+        list_resources.append(
+            __create_list_entries_resource(
+                ref,
+                run,
+                dev_mode=dev_mode,
+                fingerprints=fingerprints,
+                snapshots=snapshots,
+                write_disposition=write_disposition,
+                entry_ids=entry_ids,
+                sampling=sampling,
+                decoder=decoder,
+                validate_every=validate_every,
+                fields=fields.get(ref) if ref.view_id is None else None,
+                refresh=refresh if ref.view_id is None else None,
+                scheduler=scheduler,
+                entity_cache=entity_cache if ref.view_id is None else None,
+            )
+        )
 
-    companies = __create_entity_resource("companies", dev_mode=dev_mode)
+    def create_entity_resource(entity_name: ENTITY) -> DltResource:
+        return __create_entity_resource(
+            entity_name,
+            run,
+            dev_mode=dev_mode,
+            fingerprints=fingerprints,
+            snapshots=snapshots,
+            write_disposition=write_disposition,
+            data_from=(
+                __create_id_chunks_resource(
+                    f"{entity_name}_{'changed' if feed is not None else 'requested'}_ids",
+                    entity_name,
+                    run,
+                    partial(get_entity_ids, entity_name),
+                    shard=shard,
+                )
+                if get_entity_ids is not None
+                else None
+            ),
+            sampling=sampling,
+            shard=shard,
+            concurrency=limiter,
+            hedger=hedger,
+            decoder=decoder,
+            validate_every=validate_every,
+            predicate=predicates[entity_name],
+            fields=fields.get(entity_name),
+            refresh=refresh,
+            split=split,
+            entity_cache=entity_cache,
+        )
+
+    companies = create_entity_resource("companies")
     """ The companies resource. Contains all company entities. """
 
-    persons = __create_entity_resource("persons", dev_mode=dev_mode)
+    persons = create_entity_resource("persons")
     """ The persons resource. Contains all person entities. """
 
+    if feed is not None:
+        # Field value changes only affect entities and list entries
+        return (companies, persons, *list_resources)
+
+    if ids is not None:
+        return (
+            *([companies] if ids.company_ids is not None else []),
+            *([persons] if ids.person_ids is not None else []),
+            *list_resources,
+        )
+
     opportunities = __create_id_resource(
-        "opportunities", dev_mode=dev_mode, is_id_generator=False
+        "opportunities",
+        run,
+        dev_mode=dev_mode,
+        is_id_generator=False,
+        snapshots=snapshots,
+        sampling=sampling,
     )
     """ The opportunities resource. Contains all opportunity entities. """
 
-    lists = __create_id_resource("lists", dev_mode=dev_mode, is_id_generator=False)
+    lists = __create_id_resource(
+        "lists", run, dev_mode=dev_mode, is_id_generator=False, snapshots=snapshots
+    )
     """ The lists resource. This contains information about lists themselves, not about their entries """
 
     return (
         companies,
-        notes,
+        *(
+            [__create_notes_resource(run, decoder, validate_every)]
+            if owned(Table.NOTES.value)
+            else []
+        ),
         persons,
-        opportunities,
-        lists,
+        *([opportunities] if owned(Table.OPPORTUNITIES.value) else []),
+        *([lists] if owned(Table.LISTS.value) else []),
         *list_resources,
+        *membership_resources,
     )
 
 
-__all__ = ["source", "ListReference"]
+__all__ = [
+    "source",
+    "ListReference",
+    "Sampling",
+    "Shard",
+    "FieldSelection",
+    "Filters",
+    "ExplicitIds",
+    "Incremental",
+    "ListLoading",
+    "Concurrency",
+    "Decoding",
+    "Diagnostics",
+    "http_metrics",
+    "plan",
+    "benchmark_split",
+    "MissingPermissions",
+]
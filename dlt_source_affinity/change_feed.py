@@ -0,0 +1,171 @@
+"""Change feed over the v1 field value changes, used to refresh only what was edited since the last run"""
+
+import contextvars
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Set
+
+import dlt
+from dlt.sources.helpers.rest_client.client import RESTClient
+
+from .model.v1 import EntityType, FieldValueChange
+from .rest_client import (
+    MAX_PAGE_LIMIT_V1,
+    MAX_PAGE_LIMIT_V2,
+    get_v1_rest_client,
+    get_v2_rest_client,
+    hooks,
+)
+from .type_adapters import field_adapter, field_value_change_adapter
+
+CHANGE_FEED_STATE_KEY = "change_feed"
+RESOLVE_WORKERS = 8
+"""
+Number of entities whose list entries are resolved at once
+"""
+
+ENTITY_TYPES: Dict[EntityType, str] = {
+    EntityType.PERSON: "persons",
+    EntityType.ORGANIZATION: "companies",
+    EntityType.OPPORTUNITY: "opportunities",
+}
+
+logger = logging.getLogger("dlt")
+
+
+class ChangeFeed:
+    """
+    Collects the IDs of entities and list entries whose field values changed since the cursor in the source state.
+
+    The v1 API can't filter changes by time, so the changes of every tracked field are paged and
+    filtered client side, and paging stops at the first page (served newest first) that is behind
+    the cursor. The first run without a cursor only establishes it.
+    """
+
+    def __init__(self):
+        self.entity_ids: Dict[str, Set[int]] = defaultdict(set)
+        self.list_entry_ids: Dict[int, Set[int]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._resolve_lock = threading.Lock()
+        self._loaded = False
+        self._list_entries_resolved = False
+
+    @staticmethod
+    def changes(
+        rest_client: RESTClient, field_id: int, cursor: datetime | None
+    ) -> Iterator[FieldValueChange]:
+        """
+        Yields the changes of a field after the cursor
+        """
+        for page in rest_client.paginate(
+            "field-value-changes",
+            params={"field_id": field_id, "page_size": MAX_PAGE_LIMIT_V1},
+            hooks=hooks,
+        ):
+            changes = field_value_change_adapter.validate_python(page)
+            yield from (
+                change
+                for change in changes
+                if cursor is None or change.changed_at > cursor
+            )
+            if (
+                cursor is not None
+                and changes
+                and changes[0].changed_at >= changes[-1].changed_at
+                and changes[-1].changed_at <= cursor
+            ):
+                # newest first, so all further pages are behind the cursor
+                break
+
+    def load(self, state: Dict[str, Any], rest_client: RESTClient) -> None:
+        cursor = datetime.fromisoformat(state["cursor"]) if "cursor" in state else None
+        latest = cursor
+        for entity_type, entity in ENTITY_TYPES.items():
+            fields = field_adapter.validate_json(
+                rest_client.get(
+                    "fields",
+                    params={
+                        "entity_type": entity_type.value,
+                        "exclude_dropdown_options": True,
+                    },
+                    hooks=hooks,
+                ).text
+            )
+            for field in fields:
+                if not field.track_changes:
+                    continue
+                for change in self.changes(rest_client, field.id, cursor):
+                    if latest is None or change.changed_at > latest:
+                        latest = change.changed_at
+                    if cursor is None:
+                        continue
+                    if change.list_entry_id is not None:
+                        self.list_entry_ids[field.list_id].add(change.list_entry_id)
+                    else:
+                        self.entity_ids[entity].add(change.entity_id)
+        if cursor is None:
+            logger.info(
+                "Change feed: no cursor yet, only recording the latest change. Run a full load first."
+            )
+        if latest is not None:
+            state["cursor"] = latest.isoformat()
+
+    def _ensure_loaded(self) -> None:
+        with self._lock:
+            if not self._loaded:
+                self.load(
+                    dlt.current.source_state().setdefault(CHANGE_FEED_STATE_KEY, {}),
+                    get_v1_rest_client(),
+                )
+                self._loaded = True
+
+    def changed_entity_ids(self, entity: str) -> Set[int]:
+        self._ensure_loaded()
+        return self.entity_ids[entity]
+
+    def changed_list_entry_ids(self, list_id: int) -> Set[int]:
+        """
+        Returns the changed entries of a list. Changes of global fields are not bound to a list entry,
+        but still show up in the list entries of the entity, so these are resolved as well.
+        """
+        self._ensure_loaded()
+        with self._resolve_lock:
+            if not self._list_entries_resolved:
+                self.resolve_list_entries(get_v2_rest_client())
+                self._list_entries_resolved = True
+        return self.list_entry_ids[list_id]
+
+    def resolve_list_entries(self, rest_client: RESTClient) -> None:
+        """
+        Adds the list entries of the changed companies and persons, fetching those of
+        `RESOLVE_WORKERS` entities at once
+        """
+
+        def list_entries(path: str) -> List[Dict[str, Any]]:
+            return [
+                list_entry
+                for list_entries in rest_client.paginate(
+                    path, params={"limit": MAX_PAGE_LIMIT_V2}, hooks=hooks
+                )
+                for list_entry in list_entries
+            ]
+
+        paths = [
+            f"{entity}/{entity_id}/list-entries"
+            for entity in ("companies", "persons")
+            for entity_id in sorted(self.entity_ids[entity])
+        ]
+        with ThreadPoolExecutor(
+            max_workers=RESOLVE_WORKERS, thread_name_prefix="affinity-change-feed"
+        ) as executor:
+            # each request runs in a copy of the context, to attribute it to the current resource
+            futures = [
+                executor.submit(contextvars.copy_context().run, list_entries, path)
+                for path in paths
+            ]
+            for future in futures:
+                for list_entry in future.result():
+                    self.list_entry_ids[list_entry["listId"]].add(list_entry["id"])
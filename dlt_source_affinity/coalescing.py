@@ -0,0 +1,52 @@
+"""Coalescing of saved views with their list, so the entries of a list are paged only once"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from .helpers import ListReference
+
+
+def coalesce_list_refs(
+    list_refs: Sequence[ListReference],
+) -> Tuple[List[ListReference], List[ListReference]]:
+    """
+    Replaces the saved views of lists referenced more than once (by the list itself or another
+    saved view) with their list, returning the lists and saved views to load the entries of, and
+    the saved views to load the membership of instead.
+
+    The saved views are still paged for their membership, and their list is paged in full, so this
+    only saves requests and transfer if the list is referenced itself or its saved views cover
+    most of it. Saved views that only show a small part of a large list are cheaper to load as is.
+    """
+    references = Counter(ref.list_id for ref in dict.fromkeys(list_refs))
+    entry_refs = list(
+        dict.fromkeys(
+            ListReference(ref.list_id) if references[ref.list_id] > 1 else ref
+            for ref in list_refs
+        )
+    )
+    view_refs = list(
+        dict.fromkeys(
+            ref
+            for ref in list_refs
+            if ref.view_id is not None and references[ref.list_id] > 1
+        )
+    )
+    return (entry_refs, view_refs)
+
+
+def membership_rows(
+    view_ref: ListReference, list_entries: Iterable[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Returns the membership rows of a page of (unvalidated) saved view list entries, which only
+    keep their IDs, as the list entries themselves are loaded from their list
+    """
+    return [
+        {
+            "list_entry_id": list_entry["id"],
+            "list_id": view_ref.list_id,
+            "view_id": view_ref.view_id,
+        }
+        for list_entry in list_entries
+    ]
@@ -0,0 +1,186 @@
+"""Adaptive (AIMD) concurrency limits for the parallelized detail requests"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, TypeVar
+
+import dlt
+from dlt.sources.helpers.requests import HTTPError
+
+from .metrics import RATE_LIMITED, HttpMetrics
+
+CONCURRENCY_STATE_KEY = "concurrency"
+
+INITIAL_CONCURRENCY = 5
+"""
+The default number of dlt extract workers, which is the upper bound of the concurrency anyway
+unless `extract.workers` is configured
+"""
+EXTRACT_WORKERS_KEY = "extract.workers"
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 32
+DECREASE_FACTOR = 0.5
+LATENCY_SPIKE_FACTOR = 2.0
+"""
+Requests slower than this multiple of the baseline latency count as a spike
+"""
+BASELINE_ALPHA = 0.05
+"""
+Smoothing factor of the moving average of the latency
+"""
+MIN_SAMPLES = 10
+"""
+Number of requests to establish a baseline latency before spikes are detected
+"""
+
+R = TypeVar("R")
+
+
+class AdaptiveLimiter:
+    """
+    Limits the number of requests in flight. The limit increases additively (by one per window of
+    `limit` requests) while the latency stays flat and decreases multiplicatively on throttling
+    or latency spikes, at most once per window.
+
+    The limit only increases with requests that had to wait for a slot, as otherwise something
+    else (e.g. the number of dlt extract workers) limits the concurrency, and the limit would
+    drift up without ever being tested.
+    """
+
+    def __init__(self, limit: float = INITIAL_CONCURRENCY):
+        self.limit = min(max(limit, MIN_CONCURRENCY), MAX_CONCURRENCY)
+        self.baseline: float | None = None
+        self.samples = 0
+        self._in_flight = 0
+        self._since_decrease = int(self.limit)
+        self._condition = threading.Condition()
+
+    def acquire(self) -> bool:
+        """
+        Waits for a free slot, returning whether the limit was reached
+        """
+        with self._condition:
+            limited = self._in_flight >= int(self.limit)
+            self._condition.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+            return limited
+
+    def release(self, latency: float, throttled: bool, limited: bool = True) -> None:
+        """
+        Frees the slot of a request, with `limited` as returned by `acquire`
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self._since_decrease += 1
+            spike = (
+                self.samples >= MIN_SAMPLES
+                and latency > self.baseline * LATENCY_SPIKE_FACTOR
+            )
+            if throttled or spike:
+                if self._since_decrease >= self.limit:
+                    self.limit = max(MIN_CONCURRENCY, self.limit * DECREASE_FACTOR)
+                    self._since_decrease = 0
+            else:
+                if limited:
+                    self.limit = min(MAX_CONCURRENCY, self.limit + 1 / self.limit)
+                self.baseline = (
+                    latency
+                    if self.baseline is None
+                    else (1 - BASELINE_ALPHA) * self.baseline + BASELINE_ALPHA * latency
+                )
+                self.samples += 1
+            self._condition.notify_all()
+
+
+def initial_concurrency() -> int:
+    """
+    Returns the configured number of dlt extract workers, e.g. the concurrency recommended by
+    `plan`, or their default
+    """
+    return dlt.config.get(EXTRACT_WORKERS_KEY, int) or INITIAL_CONCURRENCY
+
+
+class RequestThreads:
+    """
+    Threads that send the requests of the extract workers concurrently, at most `workers` at once.
+    The threads are only kept while requests are in flight, so none are left behind once the
+    resources are done.
+    """
+
+    def __init__(self, workers: int, name: str):
+        self.workers = workers
+        self.name = name
+        self._in_flight = 0
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, f: Callable[[], R]) -> "Future[R]":
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix=self.name
+                )
+            self._in_flight += 1
+            future = self._executor.submit(f)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                # the idle threads exit, the next request starts new ones
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+
+class AdaptiveConcurrency:
+    """
+    Keeps an adaptive limiter per endpoint, starting at the level learned in the last run
+    (as stored in the source state), or at the number of extract workers. Throttling is detected
+    with the `http_metrics` of the run.
+    """
+
+    def __init__(self, http_metrics: HttpMetrics):
+        self.http_metrics = http_metrics
+        self._lock = threading.Lock()
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+        self._state: Dict[str, Any] | None = None
+
+    def limiter(self, endpoint: str) -> AdaptiveLimiter:
+        with self._lock:
+            if self._state is None:
+                self._state = dlt.current.source_state().setdefault(
+                    CONCURRENCY_STATE_KEY, {}
+                )
+            if endpoint not in self._limiters:
+                self._limiters[endpoint] = AdaptiveLimiter(
+                    self._state.get(endpoint, initial_concurrency())
+                )
+            return self._limiters[endpoint]
+
+    @contextmanager
+    def slot(self, endpoint: str) -> Iterator[None]:
+        """
+        Waits for a free slot of the endpoint and feeds the latency and throttling of the wrapped
+        request back into its limit
+        """
+        limiter = self.limiter(endpoint)
+        limited = limiter.acquire()
+        started = time.perf_counter()
+        throttled = False
+        try:
+            yield
+        except HTTPError as e:
+            throttled = (
+                e.response is not None and e.response.status_code == RATE_LIMITED
+            )
+            raise
+        finally:
+            throttled = throttled or RATE_LIMITED in self.http_metrics.last_statuses()
+            limiter.release(time.perf_counter() - started, throttled, limited)
+            with self._lock:
+                self._state[endpoint] = round(limiter.limit, 2)
+            dlt.current.resource_metrics()["concurrency"] = round(limiter.limit, 2)
@@ -0,0 +1,229 @@
+"""Switchable decoding of the hot payloads, into pydantic models or (faster) msgspec structs"""
+
+import logging
+import threading
+from functools import cache
+from typing import Any, Callable, Dict, List, Literal, Set, Type, TypeVar
+
+import dlt
+from dlt.common.exceptions import MissingDependencyException
+from pydantic import BaseModel, RootModel, TypeAdapter
+
+from .model.v1 import Note
+from .model.v2 import FieldModel
+
+try:
+    import msgspec
+except ModuleNotFoundError:
+    msgspec = None
+
+R = TypeVar("R")
+
+logger = logging.getLogger("dlt")
+
+DECODER = Literal["pydantic", "msgspec"]
+"""
+`pydantic` validates into the generated models, `msgspec` decodes into structs generated from the
+same spec, which is several times faster but only supports the hot payloads: companies, persons,
+list entries (with their fields) and notes
+"""
+
+
+def check_decoder(decoder: DECODER) -> None:
+    if decoder == "msgspec":
+        if msgspec is None:
+            raise MissingDependencyException(
+                "The msgspec decoder", ["dlt-source-affinity[msgspec]"]
+            )
+    elif decoder != "pydantic":
+        raise ValueError(f"Unknown decoder {decoder}")
+
+
+@cache
+def _struct(model: Type[BaseModel]) -> Any:
+    """
+    Returns the struct with the same name as the given model
+    """
+    from .model import v1_msgspec, v2_msgspec
+
+    if model is Note:
+        return v1_msgspec.Note
+    if model is FieldModel:
+        return v2_msgspec.Field
+    return getattr(v2_msgspec, model.__name__)
+
+
+@cache
+def _json_decoder(model: Type[BaseModel]) -> Any:
+    return msgspec.json.Decoder(_struct(model))
+
+
+@cache
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+
+def decode_json(raw: bytes | str, model: Type[BaseModel], decoder: DECODER) -> Any:
+    """
+    Decodes and validates a JSON document into a `model`, or its struct
+    """
+    if decoder == "msgspec":
+        return _json_decoder(model).decode(raw)
+    return model.model_validate_json(raw)
+
+
+def decode_list(
+    items: List[Any], model: Type[BaseModel], decoder: DECODER
+) -> List[Any]:
+    """
+    Validates a list of already parsed JSON objects (e.g. a page) into `model`s, or their structs
+    """
+    if decoder == "msgspec":
+        return msgspec.convert(items, list[_struct(model)])
+    return _list_adapter(model).validate_python(items)
+
+
+def construct(struct: Any, model: Type[BaseModel]) -> BaseModel:
+    """
+    Wraps a flat struct into its model without validating it again, e.g. to pass it to the
+    validator of a resource with the model as columns
+    """
+    return model.model_construct(**msgspec.structs.asdict(struct))
+
+
+class PageDecoding:
+    """
+    Picks the decoder of every page of a resource. With `validate_every`, only the first and then
+    one in every `validate_every` pages are fully validated with pydantic, the others are decoded
+    with the msgspec structs, trusting the payloads to still match the models. A page that fails to
+    decode is validated instead and the resource validates all of its pages for the rest of the run.
+    """
+
+    def __init__(
+        self, decoder: DECODER = "pydantic", validate_every: int | None = None
+    ):
+        self.decoder = decoder
+        self.validate_every = validate_every
+        self.validated = 0
+        self.trusted = 0
+        self.failed = False
+        self._pages = 0
+        self._lock = threading.Lock()
+
+    def next_decoder(self) -> DECODER:
+        if self.validate_every is None:
+            return self.decoder
+        with self._lock:
+            validate = self.failed or self._pages % self.validate_every == 0
+            self._pages += 1
+            if validate:
+                self.validated += 1
+                return "pydantic"
+            self.trusted += 1
+            return "msgspec"
+
+    def fail(self, resource: str, e: Exception) -> None:
+        with self._lock:
+            if not self.failed:
+                logger.warning(
+                    f"{resource}: a page failed to decode, validating all pages from now on: {e}"
+                )
+            self.failed = True
+
+    def decode(
+        self, resource: str, f: Callable[[DECODER], R], decoder: DECODER | None = None
+    ) -> R:
+        """
+        Decodes a page with `f(decoder)`, by default with the decoder of the next page, and
+        validates it if the trusted decoding fails
+        """
+        if decoder is None:
+            decoder = self.next_decoder()
+        if self.validate_every is None or decoder == "pydantic":
+            return f(decoder)
+        try:
+            return f(decoder)
+        except msgspec.ValidationError as e:
+            self.fail(resource, e)
+            return f("pydantic")
+
+    def publish(self, resource: str) -> None:
+        """
+        Attaches the number of validated and trusted pages to the custom metrics of a resource.
+        Must be called from within the resource.
+        """
+        if self.validate_every is not None:
+            dlt.current.resource_metrics()["validation"] = {
+                "validated_pages": self.validated,
+                "trusted_pages": self.trusted,
+                "failed": self.failed,
+            }
+
+
+def unwrap(value: Any) -> Any:
+    """
+    Returns the value of a root model, e.g. the concrete value of a field; structs have no roots
+    """
+    return value.root if isinstance(value, RootModel) else value
+
+
+def value_type(value: Any) -> str:
+    """
+    Returns the type (discriminator) of a field value or list entry, e.g. `dropdown`
+    """
+    if isinstance(value, BaseModel):
+        return value.type
+    # the type is the tag of the struct
+    return value.__struct_config__.tag
+
+
+def dump(
+    model: Any, include: Set[str] | None = None, exclude: Set[str] | None = None
+) -> Dict[str, Any]:
+    """
+    Dumps a model or struct into a row, observing the field aliases (see `pydantic_model_dump`)
+    and the custom serializers of the models, so both decoders produce the same rows
+    """
+    if isinstance(model, BaseModel):
+        return model.model_dump(by_alias=True, include=include, exclude=exclude)
+    return _dump_struct(model, include, exclude)
+
+
+def _dump_struct(
+    struct: Any, include: Set[str] | None = None, exclude: Set[str] | None = None
+) -> Dict[str, Any]:
+    def selected(name: str) -> bool:
+        return (include is None or name in include) and (
+            exclude is None or name not in exclude
+        )
+
+    config = struct.__struct_config__
+    ret: Dict[str, Any] = {}
+    if config.tag_field is not None and selected(config.tag_field):
+        ret[config.tag_field] = config.tag
+    for name, key in zip(struct.__struct_fields__, struct.__struct_encode_fields__):
+        if selected(name):
+            ret[key] = _dump_value(getattr(struct, name))
+    return ret
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_dump_value(v) for v in value]
+    if isinstance(value, msgspec.Struct):
+        if type(value).__name__ in ("PersonData", "CompanyData"):
+            # as per `MyBaseModel.ser_model`
+            return value.id
+        return _dump_struct(value)
+    if value is msgspec.UNSET:
+        return None
+    return value
+
+
+def plain(value: Any) -> Any:
+    """
+    Converts the structs of a field value into plain objects, models are left to dlt
+    """
+    if msgspec is None:
+        return value
+    return _dump_value(value)
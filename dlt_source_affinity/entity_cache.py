@@ -0,0 +1,203 @@
+"""In-run cache of the companies and persons of list entries, so their details aren't fetched twice"""
+
+import threading
+import time
+from collections import defaultdict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+import dlt
+
+from .waiting import GATHER_SECONDS, WorkerBudget, gather_timeout, selected, wait_until
+
+LIST_ENTRY_ENTITIES = {"company": "companies", "person": "persons"}
+
+FieldGroup = Tuple[Dict[str, Any], List[Any], List[Any]]
+"""
+The field columns, references and side items of the fields of one type of a flattened entity
+"""
+CachedEntity = Tuple[str, int, Dict[str, Any], Dict[str, FieldGroup]]
+"""
+The resource and ID of an entity, with its row (without fields) and its fields grouped by type
+"""
+
+T = TypeVar("T")
+
+
+class EntityCache:
+    """
+    Keeps the companies and persons of the list entries paged in this run, flattened as rows of
+    their own resource with their fields grouped by type, and the field types they were fetched
+    with, so the `companies` and `persons` resources only fetch the details of the entities that
+    are on none of the lists, or were fetched with fewer field types.
+
+    The ID resources of companies and persons wait until all lists were paged, so every entity on
+    a list is cached before its details are due. Only the selected lists are waited for, and the
+    ones that did not start within `gather_seconds` are not, in case they failed before starting.
+    """
+
+    def __init__(
+        self,
+        list_names: Sequence[str],
+        budget: WorkerBudget,
+        gather_seconds: float = GATHER_SECONDS,
+    ):
+        self.list_names = set(list_names)
+        self.budget = budget
+        self.gather_seconds = gather_seconds
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.fetched: Dict[str, int] = defaultdict(int)
+        self._entities: Dict[
+            str,
+            Dict[int, Tuple[FrozenSet[str], Dict[str, Any], Dict[str, FieldGroup]]],
+        ] = defaultdict(dict)
+        self._started: set[str] = set()
+        self._done: set[str] = set()
+        self._first_wait: float | None = None
+        self._condition = threading.Condition()
+
+    def start(self, name: str) -> None:
+        with self._condition:
+            self._started.add(name)
+            self._condition.notify_all()
+
+    def done(self, name: str) -> None:
+        """
+        Marks a list as paged (or failed), releasing the entity resources once all lists are
+        """
+        with self._condition:
+            self._done.add(name)
+            self._condition.notify_all()
+
+    def needs(self, entity_name: str, entity_id: int, field_types: List[str]) -> bool:
+        """
+        Returns whether an entity fetched with the given field types would be cached, so it is
+        only flattened then
+        """
+        if not field_types:
+            # fields selected by ID only are not complete for any field type
+            return False
+        with self._condition:
+            cached = self._entities[entity_name].get(entity_id)
+        # an entity can be on several lists, fetched with different field types
+        return cached is None or not cached[0] >= set(field_types)
+
+    def add(self, entities: Iterable[CachedEntity], field_types: List[str]) -> None:
+        """
+        Caches the flattened entities of a page of list entries, fetched with the given field types
+        """
+        if not field_types:
+            return
+        types = frozenset(field_types)
+        with self._condition:
+            for entity_name, entity_id, row, groups in entities:
+                cached = self._entities[entity_name].get(entity_id)
+                if cached is None or types >= cached[0]:
+                    self._entities[entity_name][entity_id] = (types, row, groups)
+
+    def _gather_timeout(self) -> float | None:
+        return gather_timeout(
+            self._first_wait, self.list_names <= self._started, self.gather_seconds
+        )
+
+    def _ready(self) -> bool:
+        pending = self.list_names - self._done
+        if not pending:
+            return True
+        if pending & self._started:
+            return False
+        return self._gather_timeout() is None
+
+    def wait(self) -> Iterator[None]:
+        """
+        Waits until all lists were paged. Must be iterated from within the resource.
+        """
+        expected = selected(self.list_names)
+        with self._condition:
+            if self._first_wait is None:
+                self._first_wait = time.monotonic()
+                self.list_names = expected
+        yield from wait_until(
+            self._condition, self._ready, self._gather_timeout, self.budget
+        )
+
+    def partition(
+        self,
+        entity_name: str,
+        batches: Iterable[Iterable[T]],
+        key: Callable[[T], int],
+        size: int,
+    ) -> Iterator[List[T]]:
+        """
+        Rebatches entities to the given size, with the cached and the other entities in separate
+        batches, so the details of the others are fetched in full chunks
+        """
+        cached: List[T] = []
+        uncached: List[T] = []
+        for batch in batches:
+            for item in batch:
+                with self._condition:
+                    hit = key(item) in self._entities[entity_name]
+                target = cached if hit else uncached
+                target.append(item)
+                if len(target) == size:
+                    yield target.copy()
+                    target.clear()
+        yield from (batch for batch in (cached, uncached) if batch)
+
+    def take(
+        self, entity_name: str, ids: List[int], params: Dict[str, List[str]]
+    ) -> Tuple[
+        List[Tuple[Dict[str, Any], Dict[str, Any], List[Any], List[Any]]], List[int]
+    ]:
+        """
+        Returns the cached entities that were fetched with all field types of the query parameters
+        (see `FieldSelection.params`), flattened like fetched ones with only their fields of those
+        types, and the IDs of the entities to fetch
+        """
+        field_types = params.get("fieldTypes", [])
+        cached = []
+        remaining = []
+        with self._condition:
+            # fields selected by ID are not known to be included
+            entities = self._entities[entity_name] if "fieldIds" not in params else {}
+            for entity_id in ids:
+                hit = entities.get(entity_id)
+                if hit is None or not hit[0] >= set(field_types):
+                    remaining.append(entity_id)
+                    continue
+                (_, row, groups) = hit
+                ret: Dict[str, Any] = {}
+                references: List[Any] = []
+                items: List[Any] = []
+                for field_type in field_types:
+                    if field_type in groups:
+                        (columns, field_references, field_items) = groups[field_type]
+                        ret |= columns
+                        references += field_references
+                        items += field_items
+                cached.append((row, ret, references, items))
+            self.hits[entity_name] += len(cached)
+            self.fetched[entity_name] += len(remaining)
+        return (cached, remaining)
+
+    def publish(self, entity_name: str) -> None:
+        """
+        Attaches the number of cached and fetched entities to the custom metrics of the current
+        resource
+        """
+        with self._condition:
+            dlt.current.resource_metrics()["entity_cache"] = {
+                "hits": self.hits[entity_name],
+                "fetched": self.fetched[entity_name],
+            }
@@ -0,0 +1,115 @@
+"""Local content-fingerprint index, used to skip rows that did not change since the last run"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List
+
+import dlt
+from dlt.common.json import json
+
+from .helpers import begin_generation
+
+FINGERPRINT_INDEX_FILE = "affinity_fingerprints.sqlite"
+FINGERPRINT_STATE_KEY = "fingerprints"
+
+
+def fingerprint(row: Dict[str, Any]) -> bytes:
+    """
+    Returns a stable hash of a flattened row
+    """
+    return hashlib.blake2b(json.dumpb(row, sort_keys=True), digest_size=16).digest()
+
+
+class FingerprintIndex:
+    """
+    Keeps a `(table, id) -> hash(row)` index in a SQLite database under the pipeline working dir.
+
+    Every run gets a new generation, which is stored in the source state. As the source state is only
+    committed together with a successful load, hashes written by a run that never made it to the
+    destination carry a generation that is newer than the committed one and are thus not trusted.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self.skipped: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._committed_generation = 0
+        self._generation = 1
+
+    def open(self, state: Dict[str, Any], working_dir: str) -> None:
+        (self._committed_generation, self._generation) = begin_generation(state)
+        connection = sqlite3.connect(
+            self.path or os.path.join(working_dir, FINGERPRINT_INDEX_FILE),
+            check_same_thread=False,
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            "tbl TEXT NOT NULL, id INTEGER NOT NULL, hash BLOB NOT NULL, generation INTEGER NOT NULL,"
+            " PRIMARY KEY (tbl, id)) WITHOUT ROWID"
+        )
+        self._connection = connection
+
+    def _ensure_open(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.open(
+                dlt.current.source_state().setdefault(FINGERPRINT_STATE_KEY, {}),
+                dlt.current.pipeline().working_dir,
+            )
+        return self._connection
+
+    def filter_changed(
+        self, table: str, rows: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the rows whose content differs from the last committed run and records their new hashes
+        """
+        if not rows:
+            return rows
+        hashes = [fingerprint(row) for row in rows]
+        with self._lock:
+            connection = self._ensure_open()
+            ids = [row["id"] for row in rows]
+            known = {
+                row_id: (row_hash, generation)
+                for row_id, row_hash, generation in connection.execute(
+                    "SELECT id, hash, generation FROM fingerprints WHERE tbl = ? AND id IN ("
+                    + ",".join("?" * len(ids))
+                    + ")",
+                    [table, *ids],
+                )
+            }
+            changed = []
+            updates = []
+            for row, row_hash in zip(rows, hashes):
+                previous = known.get(row["id"])
+                if (
+                    previous is not None
+                    and previous[0] == row_hash
+                    and previous[1] <= self._committed_generation
+                ):
+                    continue
+                changed.append(row)
+                updates.append((table, row["id"], row_hash, self._generation))
+            connection.executemany(
+                "INSERT OR REPLACE INTO fingerprints (tbl, id, hash, generation) VALUES (?, ?, ?, ?)",
+                updates,
+            )
+            connection.commit()
+            self.skipped[table] += len(rows) - len(changed)
+        return changed
+
+    def forget(self, table: str, ids: Iterable[int]) -> None:
+        """
+        Removes rows from the index, e.g. because they were deleted and might be restored unchanged
+        """
+        with self._lock:
+            connection = self._ensure_open()
+            connection.executemany(
+                "DELETE FROM fingerprints WHERE tbl = ? AND id = ?",
+                [(table, entity_id) for entity_id in ids],
+            )
+            connection.commit()
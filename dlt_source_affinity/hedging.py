@@ -0,0 +1,143 @@
+"""Hedged requests, to cut the tail latency of idempotent detail requests"""
+
+import contextvars
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Deque, Dict
+
+import dlt
+from dlt.sources.helpers.rest_client.client import Response
+
+from .concurrency import INITIAL_CONCURRENCY, RequestThreads
+from .ratelimit import REMAINING_HEADER, RateLimitCoordinator
+
+HEDGE_PERCENTILE = 0.95
+"""
+Requests slower than this percentile of the observed latency of the endpoint are hedged
+"""
+LATENCY_WINDOW = 200
+"""
+Number of recent latencies the percentile is computed over
+"""
+MIN_SAMPLES = 20
+MAX_HEDGES_PER_MINUTE = 30
+MIN_RATE_LIMIT_REMAINING = 100
+"""
+No hedges are sent when fewer requests than this are left in the per user rate limit
+"""
+
+
+class Hedger:
+    """
+    Sends a duplicate of a request that takes longer than the p95 latency of its endpoint, the
+    first response wins. Hedges are capped per minute and skipped when the rate limit is running low,
+    or when the rate limit shared with other processes (if coordinated) has no request to spare, so
+    they never wait for (or hold up) the requests of the extract workers.
+    """
+
+    def __init__(
+        self,
+        workers: int = INITIAL_CONCURRENCY,
+        max_hedges_per_minute: int = MAX_HEDGES_PER_MINUTE,
+        rate_limiter: RateLimitCoordinator | None = None,
+    ):
+        self.max_hedges_per_minute = max_hedges_per_minute
+        self.rate_limiter = rate_limiter
+        self.requests: Dict[str, int] = defaultdict(int)
+        self.hedges: Dict[str, int] = defaultdict(int)
+        self.hedge_wins: Dict[str, int] = defaultdict(int)
+        self._latencies: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=LATENCY_WINDOW)
+        )
+        self._hedged_at: Deque[float] = deque()
+        self._rate_limit_remaining: int | None = None
+        self._lock = threading.Lock()
+        # a request and its hedge per extract worker
+        self._threads = RequestThreads(2 * workers, "affinity-hedge")
+
+    def threshold(self, endpoint: str) -> float | None:
+        with self._lock:
+            latencies = sorted(self._latencies[endpoint])
+        if len(latencies) < MIN_SAMPLES:
+            return None
+        return latencies[int(len(latencies) * HEDGE_PERCENTILE)]
+
+    def _take_hedge(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            while self._hedged_at and now - self._hedged_at[0] > 60:
+                self._hedged_at.popleft()
+            if len(self._hedged_at) >= self.max_hedges_per_minute or (
+                self._rate_limit_remaining is not None
+                and self._rate_limit_remaining < MIN_RATE_LIMIT_REMAINING
+            ):
+                return False
+            if (
+                self.rate_limiter is not None
+                and self.rate_limiter.enabled
+                and self.rate_limiter.headroom() < 1
+            ):
+                return False
+            self._hedged_at.append(now)
+            return True
+
+    def _submit(self, endpoint: str, send: Callable[[], Response]) -> Future:
+        # keep the context, so requests are attributed to the current resource
+        context = contextvars.copy_context()
+        started = time.perf_counter()
+
+        def timed_send() -> Response:
+            response = context.run(send)
+            with self._lock:
+                self._latencies[endpoint].append(time.perf_counter() - started)
+                remaining = response.headers.get(REMAINING_HEADER)
+                if remaining is not None:
+                    self._rate_limit_remaining = int(remaining)
+            return response
+
+        return self._threads.submit(timed_send)
+
+    def get(self, endpoint: str, send: Callable[[], Response]) -> Response:
+        """
+        Sends an idempotent request, hedging it if it's slow
+        """
+        with self._lock:
+            self.requests[endpoint] += 1
+        threshold = self.threshold(endpoint)
+        primary = self._submit(endpoint, send)
+        if threshold is None:
+            return primary.result()
+        done, _ = wait([primary], timeout=threshold)
+        if done or not self._take_hedge():
+            return primary.result()
+
+        hedge = self._submit(endpoint, send)
+        with self._lock:
+            self.hedges[endpoint] += 1
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        with self._lock:
+                            self.hedge_wins[endpoint] += 1
+                    return future.result()
+        # both failed
+        return primary.result()
+
+    def publish(self, endpoint: str) -> None:
+        """
+        Attaches the hedge rate of an endpoint to the custom metrics of the current resource
+        """
+        with self._lock:
+            requests = self.requests[endpoint]
+            hedges = self.hedges[endpoint]
+            dlt.current.resource_metrics()["hedging"] = {
+                "requests": requests,
+                "hedges": hedges,
+                "hedge_wins": self.hedge_wins[endpoint],
+                "hedge_rate": round(hedges / requests, 4) if requests else 0.0,
+            }
@@ -1,6 +1,20 @@
 """Affinity CRM source helpers"""
 
-from typing import NamedTuple
+import hashlib
+from itertools import chain, islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
 
 
 class ListReference(NamedTuple):
@@ -22,9 +36,103 @@ class ListReference(NamedTuple):
         return f"<List: {self.list_id}, View: {self.view_id}>"
 
 
+class Sampling(NamedTuple):
+    """
+    Selects a deterministic subset of the IDs of every entity and list,
+    to get small but structurally complete loads during development
+    """
+
+    rate: float = 0.01
+    """
+    The fraction of IDs to keep, selected by a hash of the ID
+    """
+    max_items: int | None = None
+    """
+    Stops enumerating an entity or list after this many sampled IDs
+    """
+    seed: int = 0
+    """
+    Changing the seed selects a different subset
+    """
+
+    def keeps(self, entity_id: int) -> bool:
+        digest = hashlib.blake2b(
+            b"%d:%d" % (self.seed, entity_id), digest_size=8
+        ).digest()
+        return int.from_bytes(digest, "little") < self.rate * 2**64
+
+    def sample(
+        self, batches: Iterable[Iterable[T]], key: Callable[[T], int], size: int
+    ) -> Iterator[List[T]]:
+        """
+        Filters batches of items down to the sampled ones and rebatches them to the given size
+        """
+        sampled = (
+            item for item in chain.from_iterable(batches) if self.keeps(key(item))
+        )
+        return chunked(islice(sampled, self.max_items), size)
+
+
+class Shard(NamedTuple):
+    """
+    One of `count` deterministic partitions of the work, selected by a hash of the
+    entity ID or the resource name
+    """
+
+    index: int
+    count: int
+
+    def owns(self, key: int | str) -> bool:
+        digest = hashlib.blake2b(str(key).encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "little") % self.count == self.index
+
+    def select(
+        self, batches: Iterable[Iterable[T]], key: Callable[[T], int], size: int
+    ) -> Iterator[List[T]]:
+        """
+        Filters batches of items down to the ones of this shard and rebatches them to the given size
+        """
+        return filter_batches(batches, lambda item: self.owns(key(item)), size)
+
+
 def generate_list_entries_path(list_ref: ListReference):
     is_view = list_ref.view_id is not None
     if is_view:
         return f"lists/{list_ref.list_id}/saved-views/{list_ref.view_id}/list-entries"
     else:
         return f"lists/{list_ref.list_id}/list-entries"
+
+
+def field_column(field_id: str, field_name: str) -> str:
+    """
+    Returns the column of a field in the rows of its entity or list entry, custom fields are
+    suffixed with their name. Dropdown columns get a further suffix, see `process_and_yield_field`.
+    """
+    return f"{field_id}_{field_name}" if field_id.startswith("field-") else field_id
+
+
+def begin_generation(state: Dict[str, Any]) -> Tuple[int, int]:
+    """
+    Returns the last committed generation and the one of the current run, recording the latter in the state.
+    The state must be dlt (source or resource) state, which is only committed with a successful load.
+    """
+    committed = state.get("generation", 0)
+    state["generation"] = committed + 1
+    return (committed, committed + 1)
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def filter_batches(
+    batches: Iterable[Iterable[T]], predicate: Callable[[T], bool], size: int
+) -> Iterator[List[T]]:
+    """
+    Filters batches of items with a predicate and rebatches the remaining ones to the given size
+    """
+    return chunked(
+        (item for item in chain.from_iterable(batches) if predicate(item)), size
+    )
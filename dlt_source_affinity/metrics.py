@@ -0,0 +1,259 @@
+"""Per endpoint HTTP metrics of the REST clients, attached to the pipeline trace and optionally written as a Prometheus textfile"""
+
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+import dlt
+from dlt.common.exceptions import ResourceNameNotAvailable
+from dlt.sources.helpers.requests.retry import DEFAULT_RETRY_STATUS
+from dlt.sources.helpers.rest_client.client import Response
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+"""
+Upper bounds (in seconds) of the latency histogram buckets
+"""
+RATE_LIMITED = 429
+
+
+def endpoint_template(url: str) -> str:
+    """
+    Returns the path of a URL with all IDs replaced, e.g. `v2/lists/{id}/list-entries`
+    """
+    path = urlsplit(url).path.strip("/")
+    return "/".join(
+        "{id}" if segment.isdigit() else segment for segment in path.split("/")
+    )
+
+
+def current_resource_name() -> str | None:
+    try:
+        return dlt.current.resource_name()
+    except ResourceNameNotAvailable:
+        return None
+
+
+@dataclass
+class EndpointMetrics:
+    requests: int = 0
+    status_codes: Counter = field(default_factory=Counter)
+    latency_buckets: List[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+    latency_seconds: float = 0.0
+    bytes_received: int = 0
+    retries: int = 0
+    retry_wait_seconds: float = 0.0
+    rate_limit_wait_seconds: float = 0.0
+
+    def merge(self, other: "EndpointMetrics") -> None:
+        self.requests += other.requests
+        self.status_codes.update(other.status_codes)
+        self.latency_buckets = [
+            a + b for a, b in zip(self.latency_buckets, other.latency_buckets)
+        ]
+        self.latency_seconds += other.latency_seconds
+        self.bytes_received += other.bytes_received
+        self.retries += other.retries
+        self.retry_wait_seconds += other.retry_wait_seconds
+        self.rate_limit_wait_seconds += other.rate_limit_wait_seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "status_codes": {
+                str(code): n for code, n in sorted(self.status_codes.items())
+            },
+            "latency_seconds": round(self.latency_seconds, 3),
+            "latency_histogram": {
+                str(bound): n
+                for bound, n in zip((*LATENCY_BUCKETS, "+Inf"), self.latency_buckets)
+            },
+            "bytes_received": self.bytes_received,
+            "retries": self.retries,
+            "retry_wait_seconds": round(self.retry_wait_seconds, 3),
+            "rate_limit_wait_seconds": round(self.rate_limit_wait_seconds, 3),
+        }
+
+
+class HttpMetrics:
+    """
+    Collects metrics of every HTTP request (including retries), per resource and endpoint template,
+    and adds them to the `totals` (if any) as well
+    """
+
+    def __init__(self, totals: "HttpMetrics | None" = None):
+        self.totals = totals
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._metrics: Dict[Tuple[str | None, str], EndpointMetrics] = defaultdict(
+            EndpointMetrics
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+    def send(
+        self, send: Callable[..., Response], request: Any, **kwargs: Any
+    ) -> Response:
+        """
+        Sends a request of a session, recording the time spent waiting between its retries.
+        The responses themselves are recorded by the `record_response` hook.
+        """
+        self._local.attempts = []
+        started = time.perf_counter()
+        try:
+            return send(request, **kwargs)
+        finally:
+            attempts: List[Tuple[float, int]] = self._local.attempts
+            if len(attempts) > 1:
+                waited = (
+                    time.perf_counter()
+                    - started
+                    - sum(elapsed for elapsed, _ in attempts)
+                )
+                self.record_wait(
+                    request.url,
+                    max(waited, 0.0),
+                    rate_limited=any(status == RATE_LIMITED for _, status in attempts),
+                )
+
+    def last_statuses(self) -> List[int]:
+        """
+        Returns the status codes of all attempts of the last request sent by the current thread
+        """
+        return [status for _, status in getattr(self._local, "attempts", [])]
+
+    def record_response(self, response: Response, *args: Any, **kwargs: Any) -> None:
+        elapsed = response.elapsed.total_seconds()
+        attempts = getattr(self._local, "attempts", None)
+        if attempts is not None:
+            attempts.append((elapsed, response.status_code))
+        bucket = next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS) if elapsed <= bound),
+            len(LATENCY_BUCKETS),
+        )
+        key = (current_resource_name(), endpoint_template(response.url))
+        with self._lock:
+            metrics = self._metrics[key]
+            metrics.requests += 1
+            metrics.status_codes[response.status_code] += 1
+            metrics.latency_buckets[bucket] += 1
+            metrics.latency_seconds += elapsed
+            metrics.bytes_received += len(response.content)
+            if response.status_code in DEFAULT_RETRY_STATUS:
+                metrics.retries += 1
+        if self.totals is not None:
+            self.totals.record_response(response)
+
+    def record_wait(self, url: str, seconds: float, rate_limited: bool) -> None:
+        key = (current_resource_name(), endpoint_template(url))
+        with self._lock:
+            if rate_limited:
+                self._metrics[key].rate_limit_wait_seconds += seconds
+            else:
+                self._metrics[key].retry_wait_seconds += seconds
+        if self.totals is not None:
+            self.totals.record_wait(url, seconds, rate_limited)
+
+    def by_endpoint(
+        self, resource_name: str | None = None
+    ) -> Dict[str, EndpointMetrics]:
+        """
+        Aggregates the metrics per endpoint, optionally only of a resource and its helper resources
+        (e.g. `companies` and `companies_ids`)
+        """
+        aggregated: Dict[str, EndpointMetrics] = defaultdict(EndpointMetrics)
+        with self._lock:
+            for (resource, endpoint), metrics in self._metrics.items():
+                if resource_name is None or (
+                    resource is not None
+                    and (
+                        resource == resource_name
+                        or resource.startswith(f"{resource_name}_")
+                    )
+                ):
+                    aggregated[endpoint].merge(metrics)
+        return dict(sorted(aggregated.items()))
+
+    def publish(self, resource_name: str) -> None:
+        """
+        Attaches the metrics of a resource to its custom metrics in the pipeline trace.
+        Must be called from within the resource.
+        """
+        dlt.current.resource_metrics()["http"] = {
+            endpoint: metrics.as_dict()
+            for endpoint, metrics in self.by_endpoint(resource_name).items()
+        }
+
+    def to_prometheus(self) -> str:
+        lines = [
+            "# HELP affinity_http_requests_total HTTP requests (including retries) per endpoint and status code",
+            "# TYPE affinity_http_requests_total counter",
+        ]
+        endpoints = self.by_endpoint()
+        for endpoint, metrics in endpoints.items():
+            for code, n in sorted(metrics.status_codes.items()):
+                lines.append(
+                    f'affinity_http_requests_total{{endpoint="{endpoint}",code="{code}"}} {n}'
+                )
+        lines += [
+            "# HELP affinity_http_request_duration_seconds HTTP request latency per endpoint",
+            "# TYPE affinity_http_request_duration_seconds histogram",
+        ]
+        for endpoint, metrics in endpoints.items():
+            cumulative = 0
+            for bound, n in zip((*LATENCY_BUCKETS, "+Inf"), metrics.latency_buckets):
+                cumulative += n
+                lines.append(
+                    f'affinity_http_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                f'affinity_http_request_duration_seconds_sum{{endpoint="{endpoint}"}} {metrics.latency_seconds}'
+            )
+            lines.append(
+                f'affinity_http_request_duration_seconds_count{{endpoint="{endpoint}"}} {metrics.requests}'
+            )
+        for name, help, attribute in (
+            ("response_bytes_total", "Bytes received per endpoint", "bytes_received"),
+            ("retries_total", "Retried HTTP requests per endpoint", "retries"),
+            (
+                "retry_wait_seconds_total",
+                "Time spent backing off between retries per endpoint",
+                "retry_wait_seconds",
+            ),
+            (
+                "rate_limit_wait_seconds_total",
+                "Time spent waiting on rate limits per endpoint",
+                "rate_limit_wait_seconds",
+            ),
+        ):
+            lines += [
+                f"# HELP affinity_http_{name} {help}",
+                f"# TYPE affinity_http_{name} counter",
+            ]
+            for endpoint, metrics in endpoints.items():
+                lines.append(
+                    f'affinity_http_{name}{{endpoint="{endpoint}"}} {getattr(metrics, attribute)}'
+                )
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus_textfile(self, path: str) -> None:
+        """
+        Writes the metrics for the node exporter textfile collector, atomically
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+
+http_metrics = HttpMetrics()
+"""
+The metrics of all runs in this process, e.g. for the Prometheus textfile
+"""
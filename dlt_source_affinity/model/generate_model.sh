@@ -4,6 +4,11 @@ set -euo pipefail
 
 SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
 
+# The pydantic models are generated with the version they were first generated with, as newer
+# versions make nullable fields required and rename models (e.g. `ListModel` to `List`).
+# The msgspec structs need the msgspec flags of the generator in the dev dependencies.
+PYDANTIC_GENERATOR="${PYDANTIC_GENERATOR:-uvx --from datamodel-code-generator==0.35.0 datamodel-codegen}"
+
 log() {
     >&2 echo "$@"
 }
@@ -26,7 +31,7 @@ main() {
     rm -rf ./v2
     mkdir -p ./v2
     # we need to ignore extra fields because DLT adds extra fields to models like _dlt_id, etc.
-    datamodel-codegen \
+    ${PYDANTIC_GENERATOR} \
         --input v2_spec.json \
         --output ./v2 \
         --output-model-type pydantic_v2.BaseModel \
@@ -42,7 +47,26 @@ main() {
         --target-python-version "${python_version}" \
         --extra-fields "ignore"
     log "Generated code"
-    
+
+    log "Generating msgspec structs from OpenAPI spec"
+    rm -rf ./v2_msgspec
+    mkdir -p ./v2_msgspec
+    datamodel-codegen \
+        --input v2_spec.json \
+        --output ./v2_msgspec \
+        --output-model-type msgspec.Struct \
+        --use-annotated \
+        --use-union-operator \
+        --capitalise-enum-members \
+        --input-file-type openapi \
+        --use-double-quotes \
+        --disable-timestamp \
+        --target-python-version "${python_version}" \
+        --output-datetime-class datetime \
+        --use-msgspec-tagged-unions \
+        --use-msgspec-nullable-enum-alias
+    log "Generated msgspec structs"
+
     log "Reverting OpenAPI spec patch"
     git checkout \
         ./v2_spec.json
@@ -54,6 +78,13 @@ main() {
         ./v2_model_patches.diff
     log "Applied model patch"
 
+    # msgspec can only decode unions of structs that are all tagged
+    log "Applying msgspec model patch"
+    git apply \
+        --allow-empty \
+        ./v2_msgspec_model_patches.diff
+    log "Applied msgspec model patch"
+
     popd >/dev/null
 }
 
@@ -125,3 +125,47 @@ class Note(
 
     updated_at: datetime | None
     """The string representing the last time the note was updated."""
+
+
+class EntityType(IntEnum):
+    PERSON = 0
+    ORGANIZATION = 1
+    OPPORTUNITY = 8
+
+
+class Field(BaseModel):
+    """Represents a field (a column) of a person, organization, opportunity or list."""
+
+    id: int
+    """The unique identifier of the field object."""
+
+    name: str
+    """The name of the field."""
+
+    list_id: int | None = None
+    """The unique identifier of the list the field belongs to, null for global fields."""
+
+    track_changes: bool = False
+    """Whether field value changes of this field are tracked."""
+
+
+class FieldValueChange(BaseModel):
+    """Represents a change of a field value of an entity or list entry."""
+
+    id: int
+    """The unique identifier of the field value change object."""
+
+    field_id: int
+    """The unique identifier of the field whose value was changed."""
+
+    entity_id: int
+    """The unique identifier of the person, organization or opportunity whose value was changed."""
+
+    list_entry_id: int | None = None
+    """The unique identifier of the list entry whose value was changed, null for global fields."""
+
+    action_type: int
+    """The type of change: 0 (create), 1 (delete) or 2 (update)."""
+
+    changed_at: datetime
+    """The string representing the time when the change occurred."""
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Annotated, List
+
+from msgspec import Meta, Struct
+
+from .v1 import InteractionType, NoteType
+
+Id = Annotated[int, Meta(ge=1, le=9007199254740991)]
+
+
+class Note(Struct):
+    """The msgspec counterpart of `v1.Note`, see there for the documentation of the fields."""
+
+    id: Id
+    creator_id: Id
+    person_ids: List[int]
+    associated_person_ids: List[int]
+    interaction_person_ids: List[int]
+    interaction_id: Id | None
+    interaction_type: InteractionType | None
+    is_meeting: bool
+    mentioned_person_ids: List[Id | None]
+    organization_ids: List[Id | None]
+    opportunity_ids: List[Id | None]
+    parent_id: Id | None
+    content: str
+    type: NoteType
+    created_at: datetime
+    updated_at: datetime | None
@@ -0,0 +1,1784 @@
+# generated by datamodel-codegen:
+#   filename:  v2_spec.json
+
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum, StrEnum
+from typing import Annotated, Literal, TypeAlias
+
+from msgspec import UNSET, Meta, Struct, UnsetType, field
+
+
+class AuthenticationError(Struct, tag_field="code", tag="authentication"):
+    message: Annotated[str, Meta(description="Error message")]
+
+
+class AuthorizationError(Struct, tag_field="code", tag="authorization"):
+    message: Annotated[str, Meta(description="Error message")]
+
+
+class BadRequestError(Struct, tag_field="code", tag="bad-request"):
+    message: Annotated[str, Meta(description="Error message")]
+
+
+class ConflictError(Struct, tag_field="code", tag="conflict"):
+    message: Annotated[str, Meta(description="Error message")]
+
+
+class MethodNotAllowedError(Struct, tag_field="code", tag="method-not-allowed"):
+    message: Annotated[str, Meta(description="Error message")]
+
+
+class NotAcceptableError(Struct, tag_field="code", tag="not-acceptable"):
+    message: Annotated[str, Meta(description="Error message")]
+
+
+class NotFoundError(Struct, tag_field="code", tag="not-found"):
+    message: Annotated[str, Meta(description="Error message")]
+
+
+class NotImplementedError(Struct, tag_field="code", tag="not-implemented"):
+    message: Annotated[str, Meta(description="Error message")]
+
+
+class RateLimitError(Struct, tag_field="code", tag="rate-limit"):
+    message: Annotated[str, Meta(description="Error message")]
+
+
+class ServerError(Struct, tag_field="code", tag="server"):
+    message: Annotated[str, Meta(description="Error message")]
+
+
+class UnprocessableEntityError(Struct, tag_field="code", tag="unprocessable-entity"):
+    message: Annotated[str, Meta(description="Error message")]
+
+
+class UnsupportedMediaTypeError(Struct, tag_field="code", tag="unsupported-media-type"):
+    message: Annotated[str, Meta(description="Error message")]
+
+
+class ValidationError(Struct, tag_field="code", tag="validation"):
+    message: Annotated[str, Meta(description="Error message")]
+    param: Annotated[str, Meta(description="Param the error refers to")]
+
+
+Error: TypeAlias = Annotated[
+    AuthenticationError
+    | AuthorizationError
+    | BadRequestError
+    | ConflictError
+    | MethodNotAllowedError
+    | NotAcceptableError
+    | NotFoundError
+    | NotImplementedError
+    | RateLimitError
+    | ServerError
+    | UnprocessableEntityError
+    | UnsupportedMediaTypeError
+    | ValidationError,
+    Meta(title="Error"),
+]
+
+
+class Errors(Struct):
+    errors: Annotated[list[Error], Meta(description="Errors")]
+
+
+class Tenant(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The tenant's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    name: Annotated[
+        str, Meta(description="The name of the tenant", examples=["Contoso Ltd."])
+    ]
+    subdomain: Annotated[
+        str,
+        Meta(
+            description="The tenant's subdomain under affinity.co", examples=["contoso"]
+        ),
+    ]
+
+
+class User(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The user's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    firstName: Annotated[
+        str, Meta(description="The user's first name", examples=["John"])
+    ]
+    lastName: (
+        Annotated[str, Meta(description="The user's last name", examples=["Smith"])]
+        | None
+    )
+    emailAddress: Annotated[
+        str,
+        Meta(
+            description="The user's email address", examples=["john.smith@contoso.com"]
+        ),
+    ]
+
+
+class Type(StrEnum):
+    API_KEY = "api-key"
+    ACCESS_TOKEN = "access-token"
+
+
+class Grant(Struct):
+    type: Annotated[
+        Type,
+        Meta(
+            description="The type of grant used to authenticate", examples=["api-key"]
+        ),
+    ]
+    scopes: Annotated[
+        list[str],
+        Meta(
+            description="The scopes available to the current grant", examples=[["api"]]
+        ),
+    ]
+    createdAt: Annotated[
+        datetime,
+        Meta(
+            description="When the grant was created", examples=["2023-01-01T00:00:00Z"]
+        ),
+    ]
+
+
+class WhoAmI(Struct):
+    tenant: Tenant
+    user: User
+    grant: Grant
+
+
+class NotFoundErrors(Struct):
+    errors: Annotated[list[NotFoundError], Meta(description="NotFoundError errors")]
+
+
+class Type1(StrEnum):
+    INTERNAL = "internal"
+    EXTERNAL = "external"
+    COLLABORATOR = "collaborator"
+
+
+class PersonData(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The persons's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    firstName: (
+        Annotated[str, Meta(description="The person's first name", examples=["Jane"])]
+        | None
+    )
+    lastName: (
+        Annotated[str, Meta(description="The person's last name", examples=["Doe"])]
+        | None
+    )
+    primaryEmailAddress: (
+        Annotated[
+            str,
+            Meta(
+                description="The person's primary email address",
+                examples=["jane.doe@acme.co"],
+            ),
+        ]
+        | None
+    )
+    type: Annotated[Type1, Meta(description="The person's type", examples=["internal"])]
+
+
+class Attendee(Struct):
+    emailAddress: (
+        Annotated[
+            str,
+            Meta(
+                description="The email addresses of the attendee",
+                examples=["john.smith@contoso.com"],
+            ),
+        ]
+        | None
+    )
+    person: PersonData | None
+
+
+class AttendeesPreview(Struct):
+    data: Annotated[
+        list[Attendee], Meta(description="A preview of Attendees", max_length=100)
+    ]
+    totalCount: Annotated[
+        int,
+        Meta(
+            description="The total count of Attendees",
+            examples=[200],
+            ge=0,
+            le=9007199254740991,
+        ),
+    ]
+
+
+class Pagination(Struct):
+    prevUrl: (
+        Annotated[
+            str,
+            Meta(
+                description="URL for the previous page",
+                examples=[
+                    "https://api.affinity.co/v2/foo?cursor=ICAgICAgYmVmb3JlOjo6Nw"
+                ],
+            ),
+        ]
+        | None
+        | UnsetType
+    ) = UNSET
+    nextUrl: (
+        Annotated[
+            str,
+            Meta(
+                description="URL for the next page",
+                examples=[
+                    "https://api.affinity.co/v2/foo?cursor=ICAgICAgIGFmdGVyOjo6NA"
+                ],
+            ),
+        ]
+        | None
+        | UnsetType
+    ) = UNSET
+
+
+class PaginationWithTotalCount(Pagination):
+    totalCount: (
+        Annotated[
+            int,
+            Meta(
+                description="The total count of the collection. Only included if requested via the totalCount query string parameter.",
+                ge=0,
+                le=9007199254740991,
+            ),
+        ]
+        | UnsetType
+    ) = UNSET
+
+
+class PersonDataPreview(Struct):
+    data: Annotated[
+        list[PersonData], Meta(description="A preview of persons", max_length=100)
+    ]
+    totalCount: Annotated[
+        int,
+        Meta(
+            description="The total count of persons",
+            examples=[200],
+            ge=0,
+            le=9007199254740991,
+        ),
+    ]
+
+
+class CompanyData(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The company's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    name: Annotated[str, Meta(description="The company's name", examples=["Acme"])]
+    domain: (
+        Annotated[
+            str, Meta(description="The company's primary domain", examples=["acme.co"])
+        ]
+        | None
+    )
+
+
+class CompanyValue(Struct, tag_field="type", tag="company"):
+    data: CompanyData | None
+
+
+class CompaniesValue(Struct, tag_field="type", tag="company-multi"):
+    data: (
+        Annotated[
+            list[CompanyData],
+            Meta(description="The values for many companies", max_length=100),
+        ]
+        | None
+    )
+
+
+class DateValue(Struct, tag_field="type", tag="datetime"):
+    data: Annotated[datetime, Meta(description="The value for a date")] | None
+
+
+class Dropdown(Struct):
+    dropdownOptionId: Annotated[
+        int,
+        Meta(
+            description="Dropdown item's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    text: Annotated[str, Meta(description="Dropdown item text", examples=["first"])]
+
+
+class DropdownValue(Struct, tag_field="type", tag="dropdown"):
+    data: Dropdown | None
+
+
+class DropdownsValue(Struct, tag_field="type", tag="dropdown-multi"):
+    data: (
+        Annotated[list[Dropdown], Meta(description="The value for many dropdown items")]
+        | None
+    )
+
+
+class FloatValue(Struct, tag_field="type", tag="number"):
+    data: Annotated[float, Meta(description="The value for a number")] | None
+
+
+class FloatsValue(Struct, tag_field="type", tag="number-multi"):
+    data: Annotated[list[float], Meta(description="The value for many numbers")] | None
+
+
+class Type2(StrEnum):
+    FILTERABLE_TEXT = "filterable-text"
+    TEXT = "text"
+
+
+class TextValue(Struct, tag_field="type", tag="text"):
+    data: Annotated[str, Meta(description="The value for a string")] | None
+
+
+class FilterableTextValue(Struct, tag_field="type", tag="filterable-text"):
+    data: Annotated[str, Meta(description="The value for a string")] | None
+
+
+class LinkedInEntry(Struct):
+    link: (
+        Annotated[str, Meta(description="The link to the LinkedIn entry")] | UnsetType
+    ) = UNSET
+    text: str | UnsetType = UNSET
+
+
+class TextsValue(Struct, tag_field="type", tag="filterable-text-multi"):
+    data: (
+        Annotated[
+            list[LinkedInEntry | str],
+            Meta(description="The value for many strings"),
+        ]
+        | None
+    )
+
+
+class FormulaNumber(Struct):
+    calculatedValue: (
+        Annotated[float, Meta(description="Calculated value")] | None | UnsetType
+    ) = UNSET
+
+
+class FormulaValue(Struct, tag_field="type", tag="formula-number"):
+    data: FormulaNumber | None
+
+
+class Direction(StrEnum):
+    RECEIVED = "received"
+    SENT = "sent"
+
+
+class ChatMessage(Struct, tag_field="type", tag="chat-message"):
+    id: Annotated[
+        int,
+        Meta(
+            description="The chat message's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    direction: Annotated[
+        Direction,
+        Meta(description="The direction of the chat message", examples=["sent"]),
+    ]
+    sentAt: Annotated[
+        datetime,
+        Meta(
+            description="The time the chat message was sent",
+            examples=["2023-01-01T00:00:00Z"],
+        ),
+    ]
+    manualCreator: PersonData
+    participants: Annotated[
+        list[PersonData], Meta(description="The participants of the chat")
+    ]
+
+
+class Email(Struct, tag_field="type", tag="email"):
+    id: Annotated[
+        int,
+        Meta(
+            description="The email's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    subject: (
+        Annotated[
+            str,
+            Meta(description="The subject of the email", examples=["Acme Upsell $10k"]),
+        ]
+        | None
+    )
+    sentAt: Annotated[
+        datetime,
+        Meta(
+            description="The time the email was sent", examples=["2023-01-01T00:00:00Z"]
+        ),
+    ]
+    from_: Attendee = field(name="from")
+    to: Annotated[list[Attendee], Meta(description="The recipients of the email")]
+    cc: Annotated[list[Attendee], Meta(description="The cc recipients of the email")]
+
+
+class Meeting(Struct, tag_field="type", tag="meeting"):
+    id: Annotated[
+        int,
+        Meta(
+            description="The meeting's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    title: (
+        Annotated[
+            str, Meta(description="The meeting's title", examples=["Acme Upsell $10k"])
+        ]
+        | None
+    )
+    allDay: Annotated[
+        bool,
+        Meta(description="Whether the meeting is an all-day event", examples=[False]),
+    ]
+    startTime: Annotated[
+        datetime,
+        Meta(description="The meeting start time", examples=["2023-02-03T04:00:00Z"]),
+    ]
+    endTime: (
+        Annotated[
+            datetime,
+            Meta(description="The meeting end time", examples=["2023-02-03T05:00:00Z"]),
+        ]
+        | None
+    )
+    attendees: Annotated[
+        list[Attendee], Meta(description="People attending the meeting")
+    ]
+
+
+class PhoneCall(Struct, tag_field="type", tag="call"):
+    id: Annotated[
+        int,
+        Meta(
+            description="The phone call's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    startTime: Annotated[
+        datetime,
+        Meta(description="The call start time", examples=["2023-02-03T04:00:00Z"]),
+    ]
+    attendees: Annotated[list[Attendee], Meta(description="People attending the call")]
+
+
+Interaction: TypeAlias = Annotated[
+    ChatMessage | Email | Meeting | PhoneCall, Meta(title="Interaction")
+]
+
+
+class InteractionValue(Struct, tag_field="type", tag="interaction"):
+    data: Interaction | None
+
+
+class Location(Struct):
+    streetAddress: (
+        Annotated[str, Meta(description="Street address", examples=["1 Main Street"])]
+        | None
+    )
+    city: Annotated[str, Meta(description="City", examples=["San Francisco"])] | None
+    state: Annotated[str, Meta(description="State", examples=["California"])] | None
+    country: (
+        Annotated[str, Meta(description="Country", examples=["United States"])] | None
+    )
+    continent: (
+        Annotated[str, Meta(description="Continent", examples=["North America"])] | None
+    )
+
+
+class LocationValue(Struct, tag_field="type", tag="location"):
+    data: Location | None
+
+
+class LocationsValue(Struct, tag_field="type", tag="location-multi"):
+    data: (
+        Annotated[list[Location], Meta(description="The values for many locations")]
+        | None
+    )
+
+
+class PersonValue(Struct, tag_field="type", tag="person"):
+    data: PersonData | None
+
+
+class PersonsValue(Struct, tag_field="type", tag="person-multi"):
+    data: (
+        Annotated[
+            list[PersonData],
+            Meta(description="The values for many persons", max_length=100),
+        ]
+        | None
+    )
+
+
+class RankedDropdown(Struct):
+    dropdownOptionId: Annotated[
+        int,
+        Meta(
+            description="Dropdown item's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    text: Annotated[str, Meta(description="Dropdown item text", examples=["first"])]
+    rank: Annotated[
+        int,
+        Meta(description="Dropdown item rank", examples=[0], ge=0, le=9007199254740991),
+    ]
+    color: (
+        Annotated[str, Meta(description="Dropdown item color", examples=["white"])]
+        | None
+    )
+
+
+class RankedDropdownValue(Struct, tag_field="type", tag="ranked-dropdown"):
+    data: RankedDropdown | None
+
+
+FieldValue: TypeAlias = Annotated[
+    CompaniesValue
+    | CompanyValue
+    | DateValue
+    | DropdownsValue
+    | DropdownValue
+    | FloatsValue
+    | FloatValue
+    | FormulaValue
+    | InteractionValue
+    | LocationsValue
+    | LocationValue
+    | PersonsValue
+    | PersonValue
+    | RankedDropdownValue
+    | TextsValue
+    | TextValue
+    | FilterableTextValue,
+    Meta(
+        examples=[
+            {
+                "data": {
+                    "continent": "North America",
+                    "country": "United States",
+                    "streetAddress": "1 Main Street",
+                    "city": "San Francisco",
+                    "state": "California",
+                },
+                "type": "location",
+            }
+        ],
+        title="FieldValue",
+    ),
+]
+
+
+class Type3(StrEnum):
+    ENRICHED = "enriched"
+    GLOBAL = "global"
+    LIST = "list"
+    RELATIONSHIP_INTELLIGENCE = "relationship-intelligence"
+
+
+class EnrichmentSourceEnum(Enum):
+    AFFINITY_DATA = "affinity-data"
+    DEALROOM = "dealroom"
+    EVENTBRITE = "eventbrite"
+    MAILCHIMP = "mailchimp"
+
+
+EnrichmentSource: TypeAlias = (
+    Annotated[
+        EnrichmentSourceEnum,
+        Meta(
+            description="The source of the data in this Field (if it is enriched)",
+            examples=["affinity-data"],
+        ),
+    ]
+    | None
+)
+
+
+class Field(Struct):
+    id: Annotated[
+        str,
+        Meta(
+            description="The field's unique identifier",
+            examples=["affinity-data-location", "field-1234"],
+        ),
+    ]
+    name: Annotated[str, Meta(description="The field's name", examples=["Location"])]
+    type: Annotated[Type3, Meta(description="The field's type", examples=["enriched"])]
+    enrichmentSource: (
+        Annotated[
+            EnrichmentSource,
+            Meta(
+                description="The source of the data in this Field (if it is enriched)",
+                examples=["affinity-data"],
+            ),
+        ]
+        | None
+    )
+    value: FieldValue
+
+
+class Company(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The company's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    name: Annotated[str, Meta(description="The company's name", examples=["Acme"])]
+    domain: (
+        Annotated[
+            str, Meta(description="The company's primary domain", examples=["acme.co"])
+        ]
+        | None
+    )
+    domains: Annotated[
+        list[str],
+        Meta(description="All of the company's domains", examples=[["acme.co"]]),
+    ]
+    isGlobal: Annotated[
+        bool,
+        Meta(
+            description="Whether or not the company is tenant specific", examples=[True]
+        ),
+    ]
+    fields: (
+        Annotated[
+            list[Field], Meta(description="The fields associated with the company")
+        ]
+        | UnsetType
+    ) = UNSET
+
+
+class CompanyPaged(Struct):
+    data: Annotated[
+        list[Company], Meta(description="A page of Company results", max_length=100)
+    ]
+    pagination: Pagination
+
+
+class AuthorizationErrors(Struct):
+    errors: Annotated[
+        list[AuthorizationError], Meta(description="AuthorizationError errors")
+    ]
+
+
+class EnrichmentSource1Enum(Enum):
+    AFFINITY_DATA = "affinity-data"
+    DEALROOM = "dealroom"
+    EVENTBRITE = "eventbrite"
+    MAILCHIMP = "mailchimp"
+
+
+EnrichmentSource1: TypeAlias = (
+    Annotated[
+        EnrichmentSource1Enum,
+        Meta(
+            description="The source of the data in this Field (if it is enriched)",
+            examples=["affinity-data"],
+        ),
+    ]
+    | None
+)
+
+
+class ValueType(StrEnum):
+    PERSON = "person"
+    PERSON_MULTI = "person-multi"
+    COMPANY = "company"
+    COMPANY_MULTI = "company-multi"
+    FILTERABLE_TEXT = "filterable-text"
+    FILTERABLE_TEXT_MULTI = "filterable-text-multi"
+    NUMBER = "number"
+    NUMBER_MULTI = "number-multi"
+    DATETIME = "datetime"
+    LOCATION = "location"
+    LOCATION_MULTI = "location-multi"
+    TEXT = "text"
+    RANKED_DROPDOWN = "ranked-dropdown"
+    DROPDOWN = "dropdown"
+    DROPDOWN_MULTI = "dropdown-multi"
+    FORMULA_NUMBER = "formula-number"
+    INTERACTION = "interaction"
+
+
+class FieldMetadata(Struct):
+    id: Annotated[
+        str,
+        Meta(
+            description="The field's unique identifier",
+            examples=["affinity-data-location", "field-1234"],
+        ),
+    ]
+    name: Annotated[str, Meta(description="The field's name", examples=["Location"])]
+    type: Annotated[Type3, Meta(description="The field's type", examples=["enriched"])]
+    enrichmentSource: (
+        Annotated[
+            EnrichmentSource1,
+            Meta(
+                description="The source of the data in this Field (if it is enriched)",
+                examples=["affinity-data"],
+            ),
+        ]
+        | None
+    )
+    valueType: Annotated[
+        ValueType,
+        Meta(description="The type of the data in this Field", examples=["location"]),
+    ]
+
+
+class FieldMetadataPaged(Struct):
+    data: Annotated[
+        list[FieldMetadata],
+        Meta(description="A page of FieldMetadata results", max_length=100),
+    ]
+    pagination: Pagination
+
+
+class ListEntry(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The list entry's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    listId: Annotated[
+        int,
+        Meta(
+            description="The ID of the list that this list entry belongs to",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    createdAt: Annotated[
+        datetime,
+        Meta(
+            description="The date that the list entry was created",
+            examples=["2023-01-01T00:00:00Z"],
+        ),
+    ]
+    creatorId: (
+        Annotated[
+            int,
+            Meta(
+                description="The ID of the user that created this list entry",
+                examples=[1],
+                ge=1,
+                le=9007199254740991,
+            ),
+        ]
+        | None
+    )
+    fields: Annotated[
+        list[Field], Meta(description="The fields associated with the list entry")
+    ]
+
+
+class ListEntryPaged(Struct):
+    data: Annotated[
+        list[ListEntry], Meta(description="A page of ListEntry results", max_length=100)
+    ]
+    pagination: Pagination
+
+
+class List(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The unique identifier for the list",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    name: Annotated[
+        str, Meta(description="The name of the list", examples=["All companies"])
+    ]
+    creatorId: Annotated[
+        int,
+        Meta(
+            description="The ID of the user that created this list",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    ownerId: Annotated[
+        int,
+        Meta(
+            description="The ID of the user that owns this list",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    isPublic: Annotated[
+        bool, Meta(description="Whether or not the list is public", examples=[False])
+    ]
+
+
+class ListPaged(Struct):
+    data: Annotated[
+        list[List], Meta(description="A page of List results", max_length=100)
+    ]
+    pagination: Pagination
+
+
+class Opportunity(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The unique identifier for the opportunity",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    name: Annotated[
+        str,
+        Meta(description="The name of the opportunity", examples=["Acme Upsell $10k"]),
+    ]
+    listId: Annotated[
+        int,
+        Meta(
+            description="The ID of the list that the opportunity belongs to",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+
+
+class Status(StrEnum):
+    IN_PROGRESS = "in-progress"
+    SUCCESS = "success"
+    FAILED = "failed"
+
+
+class CompanyMergeState(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The unique identifier for the merge",
+            examples=[12345],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    status: Annotated[
+        Status, Meta(description="Current status of the merge", examples=["success"])
+    ]
+    taskId: Annotated[
+        str,
+        Meta(
+            description="Identifier for the task this merge belongs to",
+            examples=["789e0123-e45b-67c8-d901-234567890123"],
+        ),
+    ]
+    startedAt: Annotated[
+        datetime,
+        Meta(
+            description="Timestamp when the merge started",
+            examples=["2025-06-03T10:30:00Z"],
+        ),
+    ]
+    primaryCompanyId: Annotated[
+        int,
+        Meta(
+            description="ID of the primary company that other profiles were merged into",
+            examples=[12345],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    duplicateCompanyId: Annotated[
+        int,
+        Meta(
+            description="ID of the duplicate company that was merged into the primary company",
+            examples=[67890],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    completedAt: (
+        Annotated[
+            datetime,
+            Meta(
+                description="Timestamp when the merge completed (success or failure)",
+                examples=["2025-06-03T10:32:15Z", None],
+            ),
+        ]
+        | None
+    )
+    errorMessage: (
+        Annotated[
+            str,
+            Meta(
+                description="Error message if the merge failed",
+                examples=["Primary company not found", None],
+            ),
+        ]
+        | None
+    )
+
+
+class CompanyMergeStatePaged(Struct):
+    data: Annotated[
+        list[CompanyMergeState],
+        Meta(description="Array of company merge states", max_length=100),
+    ]
+    pagination: Pagination
+
+
+class CompanyMergeRequest(Struct):
+    primaryCompanyId: Annotated[
+        int,
+        Meta(
+            description="The ID of the company profile that will be kept after the merge. All data from the duplicate company will be merged into this company.",
+            examples=[12345],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    duplicateCompanyId: Annotated[
+        int,
+        Meta(
+            description="The ID of the company profile that will be merged and then deleted. All data from this company will be transferred to the primary company.",
+            examples=[67890],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+
+
+class CompanyMergeResponse(Struct):
+    taskUrl: Annotated[
+        str,
+        Meta(
+            description="URL to check the status of the merge task",
+            examples=[
+                "https://api.affinit.com/tasks/company-merges/123e4567-e89b-12d3-a456-426614174000"
+            ],
+        ),
+    ]
+
+
+class Type5(StrEnum):
+    COMPANY = "company"
+    OPPORTUNITY = "opportunity"
+    PERSON = "person"
+
+
+class ListWithType(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The unique identifier for the list",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    name: Annotated[
+        str, Meta(description="The name of the list", examples=["All companies"])
+    ]
+    creatorId: Annotated[
+        int,
+        Meta(
+            description="The ID of the user that created this list",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    ownerId: Annotated[
+        int,
+        Meta(
+            description="The ID of the user that owns this list",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    isPublic: Annotated[
+        bool, Meta(description="Whether or not the list is public", examples=[False])
+    ]
+    type: Annotated[
+        Type5, Meta(description="The entity type for this list", examples=["company"])
+    ]
+
+
+class ListWithTypePaged(Struct):
+    data: Annotated[
+        list[ListWithType],
+        Meta(description="A page of ListWithType results", max_length=100),
+    ]
+    pagination: Pagination
+
+
+class CompanyListEntry(Struct, tag_field="type", tag="company"):
+    id: Annotated[
+        int,
+        Meta(
+            description="The list entry's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    listId: Annotated[
+        int,
+        Meta(
+            description="The ID of the list that this list entry belongs to",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    createdAt: Annotated[
+        datetime,
+        Meta(
+            description="The date that the list entry was created",
+            examples=["2023-01-01T00:00:00Z"],
+        ),
+    ]
+    creatorId: (
+        Annotated[
+            int,
+            Meta(
+                description="The ID of the user that created this list entry",
+                examples=[1],
+                ge=1,
+                le=9007199254740991,
+            ),
+        ]
+        | None
+    )
+    entity: Company
+
+
+class OpportunityWithFields(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The unique identifier for the opportunity",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    name: Annotated[
+        str,
+        Meta(description="The name of the opportunity", examples=["Acme Upsell $10k"]),
+    ]
+    listId: Annotated[
+        int,
+        Meta(
+            description="The ID of the list that the opportunity belongs to",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    fields: (
+        Annotated[
+            list[Field], Meta(description="The fields associated with the opportunity")
+        ]
+        | UnsetType
+    ) = UNSET
+
+
+class OpportunityListEntry(Struct, tag_field="type", tag="opportunity"):
+    id: Annotated[
+        int,
+        Meta(
+            description="The list entry's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    listId: Annotated[
+        int,
+        Meta(
+            description="The ID of the list that this list entry belongs to",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    createdAt: Annotated[
+        datetime,
+        Meta(
+            description="The date that the list entry was created",
+            examples=["2023-01-01T00:00:00Z"],
+        ),
+    ]
+    creatorId: (
+        Annotated[
+            int,
+            Meta(
+                description="The ID of the user that created this list entry",
+                examples=[1],
+                ge=1,
+                le=9007199254740991,
+            ),
+        ]
+        | None
+    )
+    entity: OpportunityWithFields
+
+
+class Type6(StrEnum):
+    INTERNAL = "internal"
+    EXTERNAL = "external"
+
+
+class Person(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The persons's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    firstName: Annotated[
+        str, Meta(description="The person's first name", examples=["Jane"])
+    ]
+    lastName: (
+        Annotated[str, Meta(description="The person's last name", examples=["Doe"])]
+        | None
+    )
+    primaryEmailAddress: (
+        Annotated[
+            str,
+            Meta(
+                description="The person's primary email address",
+                examples=["jane.doe@acme.co"],
+            ),
+        ]
+        | None
+    )
+    emailAddresses: Annotated[
+        list[str],
+        Meta(
+            description="All of the person's email addresses",
+            examples=[["jane.doe@acme.co", "janedoe@gmail.com"]],
+        ),
+    ]
+    type: Annotated[Type6, Meta(description="The person's type", examples=["internal"])]
+    fields: (
+        Annotated[
+            list[Field], Meta(description="The fields associated with the person")
+        ]
+        | UnsetType
+    ) = UNSET
+
+
+class PersonListEntry(Struct, tag_field="type", tag="person"):
+    id: Annotated[
+        int,
+        Meta(
+            description="The list entry's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    listId: Annotated[
+        int,
+        Meta(
+            description="The ID of the list that this list entry belongs to",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    createdAt: Annotated[
+        datetime,
+        Meta(
+            description="The date that the list entry was created",
+            examples=["2023-01-01T00:00:00Z"],
+        ),
+    ]
+    creatorId: (
+        Annotated[
+            int,
+            Meta(
+                description="The ID of the user that created this list entry",
+                examples=[1],
+                ge=1,
+                le=9007199254740991,
+            ),
+        ]
+        | None
+    )
+    entity: Person
+
+
+ListEntryWithEntity: TypeAlias = Annotated[
+    CompanyListEntry | OpportunityListEntry | PersonListEntry,
+    Meta(title="ListEntryWithEntity"),
+]
+
+
+class ListEntryWithEntityPaged(Struct):
+    data: (
+        Annotated[
+            list[ListEntryWithEntity],
+            Meta(description="A page of ListEntryWithEntity results", max_length=100),
+        ]
+        | None
+    )
+    pagination: Pagination
+
+
+class FieldPaged(Struct):
+    data: Annotated[
+        list[Field], Meta(description="A page of Field results", max_length=100)
+    ]
+    pagination: Pagination
+
+
+class CompanyReference(Struct):
+    id: Annotated[
+        int,
+        Meta(description="The company's unique identifier", ge=1, le=9007199254740991),
+    ]
+
+
+class CompaniesValueUpdate(Struct):
+    type: Annotated[Literal["company-multi"], Meta(description="The type of value")]
+    data: (
+        Annotated[
+            list[CompanyReference],
+            Meta(description="The values for many companies", max_length=100),
+        ]
+        | None
+    )
+
+
+class CompanyValueUpdate(Struct):
+    type: Annotated[Literal["company"], Meta(description="The type of value")]
+    data: CompanyReference | None
+
+
+class DropdownReference(Struct):
+    dropdownOptionId: Annotated[
+        int,
+        Meta(
+            description="Dropdown item's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+
+
+class DropdownValueUpdate(Struct):
+    type: Annotated[Literal["dropdown"], Meta(description="The type of value")]
+    data: DropdownReference | None
+
+
+class DropdownsValueUpdate(Struct):
+    type: Annotated[Literal["dropdown-multi"], Meta(description="The type of value")]
+    data: (
+        Annotated[
+            list[DropdownReference],
+            Meta(description="The value for many dropdown items"),
+        ]
+        | None
+    )
+
+
+class PersonReference(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The persons's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+
+
+class PersonValueUpdate(Struct):
+    type: Annotated[Literal["person"], Meta(description="The type of value")]
+    data: PersonReference | None
+
+
+class PersonsValueUpdate(Struct):
+    type: Annotated[Literal["person-multi"], Meta(description="The type of value")]
+    data: (
+        Annotated[
+            list[PersonReference],
+            Meta(description="The values for many persons", max_length=100),
+        ]
+        | None
+    )
+
+
+class RankedDropdownReference(Struct):
+    dropdownOptionId: Annotated[
+        int,
+        Meta(
+            description="Ranked Dropdown item's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+
+
+class RankedDropdownValueUpdate(Struct):
+    type: Annotated[Literal["ranked-dropdown"], Meta(description="The type of value")]
+    data: RankedDropdownReference | None
+
+
+FieldValueUpdate: TypeAlias = Annotated[
+    CompaniesValueUpdate
+    | CompanyValueUpdate
+    | DateValue
+    | DropdownValueUpdate
+    | DropdownsValueUpdate
+    | FloatValue
+    | FloatsValue
+    | LocationValue
+    | LocationsValue
+    | PersonValueUpdate
+    | PersonsValueUpdate
+    | RankedDropdownValueUpdate
+    | TextValue
+    | TextsValue,
+    Meta(
+        examples=[
+            {
+                "type": "location",
+                "data": {
+                    "continent": "North America",
+                    "country": "United States",
+                    "streetAddress": "1 Main Street",
+                    "city": "San Francisco",
+                    "state": "California",
+                },
+            }
+        ],
+        title="FieldValueUpdate",
+    ),
+]
+
+
+class Update(Struct):
+    id: Annotated[
+        str, Meta(description="The field's unique identifier.", examples=["field-105"])
+    ]
+    value: FieldValueUpdate | UnsetType = UNSET
+
+
+class ListEntryBatchOperationUpdateFields(Struct):
+    operation: Literal["update-fields"]
+    updates: Annotated[list[Update], Meta(max_length=100)]
+
+
+ListEntryBatchOperationRequest: TypeAlias = Annotated[
+    ListEntryBatchOperationUpdateFields, Meta(title="ListEntryBatchOperationRequest")
+]
+
+
+class ListEntryBatchOperations(StrEnum):
+    UPDATE_FIELDS = "update-fields"
+
+
+class ListEntryBatchOperationResponse(Struct):
+    operation: ListEntryBatchOperations | UnsetType = UNSET
+
+
+class FieldUpdate(Struct):
+    value: FieldValueUpdate | UnsetType = UNSET
+
+
+class Type7(StrEnum):
+    SHEET = "sheet"
+    BOARD = "board"
+    DASHBOARD = "dashboard"
+
+
+class SavedView(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The saved view's unique identifier",
+            examples=[28],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    name: Annotated[
+        str,
+        Meta(
+            description="The saved view's name", examples=["my interesting companies"]
+        ),
+    ]
+    type: Annotated[
+        Type7, Meta(description="The type for this saved view", examples=["sheet"])
+    ]
+    createdAt: Annotated[
+        datetime,
+        Meta(
+            description="The date that the saved view was created",
+            examples=["2023-01-01T00:00:00Z"],
+        ),
+    ]
+
+
+class SavedViewPaged(Struct):
+    data: Annotated[
+        list[SavedView], Meta(description="A page of SavedView results", max_length=100)
+    ]
+    pagination: Pagination
+
+
+class CompanyDataPaged(Struct):
+    data: Annotated[
+        list[CompanyData], Meta(description="A page of Company results", max_length=100)
+    ]
+    pagination: Pagination
+
+
+class OpportunityPaged(Struct):
+    data: Annotated[
+        list[Opportunity],
+        Meta(description="A page of Opportunity results", max_length=100),
+    ]
+    pagination: Pagination
+
+
+class PersonDataPaged(Struct):
+    data: Annotated[
+        list[PersonData], Meta(description="A page of Person results", max_length=100)
+    ]
+    pagination: Pagination
+
+
+class PersonMergeState(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The unique identifier for the merge",
+            examples=[12345],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    status: Annotated[
+        Status, Meta(description="Current status of the merge", examples=["success"])
+    ]
+    taskId: Annotated[
+        str,
+        Meta(
+            description="Identifier for the task this merge belongs to",
+            examples=["789e0123-e45b-67c8-d901-234567890123"],
+        ),
+    ]
+    startedAt: Annotated[
+        datetime,
+        Meta(
+            description="Timestamp when the merge started",
+            examples=["2025-06-03T10:30:00Z"],
+        ),
+    ]
+    primaryPersonId: Annotated[
+        int,
+        Meta(
+            description="ID of the primary person that other profiles were merged into",
+            examples=[12345],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    duplicatePersonId: Annotated[
+        int,
+        Meta(
+            description="ID of the duplicate person that was merged into the primary person",
+            examples=[67890],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    completedAt: (
+        Annotated[
+            datetime,
+            Meta(
+                description="Timestamp when the merge completed (success or failure)",
+                examples=["2025-06-03T10:32:15Z", None],
+            ),
+        ]
+        | None
+    )
+    errorMessage: (
+        Annotated[
+            str,
+            Meta(
+                description="Error message if the merge failed",
+                examples=["Primary person not found", None],
+            ),
+        ]
+        | None
+    )
+
+
+class PersonMergeStatePaged(Struct):
+    data: Annotated[
+        list[PersonMergeState],
+        Meta(description="Array of person merge states", max_length=100),
+    ]
+    pagination: Pagination
+
+
+class PersonMergeRequest(Struct):
+    primaryPersonId: Annotated[
+        int,
+        Meta(
+            description="The ID of the person profile that will be kept after the merge. All data from the duplicate person will be merged into this person.",
+            examples=[12345],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    duplicatePersonId: Annotated[
+        int,
+        Meta(
+            description="The ID of the person profile that will be merged and then deleted. All data from this person will be transferred to the primary person.",
+            examples=[67890],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+
+
+class PersonMergeResponse(Struct):
+    taskUrl: Annotated[
+        str,
+        Meta(
+            description="URL to check the status of the merge task",
+            examples=[
+                "https://api.affinit.com/tasks/person-merges/123e4567-e89b-12d3-a456-426614174000"
+            ],
+        ),
+    ]
+
+
+class PersonPaged(Struct):
+    data: Annotated[
+        list[Person], Meta(description="A page of Person results", max_length=100)
+    ]
+    pagination: Pagination
+
+
+class ResultsSummary(Struct):
+    total: Annotated[
+        int,
+        Meta(
+            description="Total number of merges in the batch",
+            examples=[5],
+            ge=0,
+            le=2147483647,
+        ),
+    ]
+    inProgress: Annotated[
+        int,
+        Meta(
+            description="Number of merges currently in progress",
+            examples=[2],
+            ge=0,
+            le=2147483647,
+        ),
+    ]
+    success: Annotated[
+        int,
+        Meta(
+            description="Number of successfully completed merges",
+            examples=[2],
+            ge=0,
+            le=2147483647,
+        ),
+    ]
+    failed: Annotated[
+        int,
+        Meta(description="Number of failed merges", examples=[1], ge=0, le=2147483647),
+    ]
+
+
+class CompanyMergeTask(Struct):
+    id: Annotated[
+        str,
+        Meta(
+            description="The unique identifier for this merge task",
+            examples=["123e4567-e89b-12d3-a456-426614174000"],
+        ),
+    ]
+    status: Annotated[
+        Status,
+        Meta(
+            description="The current status of the batch operation",
+            examples=["in-progress"],
+        ),
+    ]
+    resultsSummary: Annotated[
+        ResultsSummary, Meta(description="Summary of merges in this batch task")
+    ]
+
+
+class CompanyMergeTaskPaged(Struct):
+    data: Annotated[
+        list[CompanyMergeTask],
+        Meta(
+            description="Array of company merge tasks",
+            examples=[
+                [
+                    {
+                        "id": "123e4567-e89b-12d3-a456-426614174000",
+                        "status": "success",
+                        "resultsSummary": {
+                            "total": 1,
+                            "inProgress": 0,
+                            "success": 1,
+                            "failed": 0,
+                        },
+                    },
+                    {
+                        "id": "456e7890-e12b-34c5-d678-901234567890",
+                        "status": "failed",
+                        "resultsSummary": {
+                            "total": 1,
+                            "inProgress": 0,
+                            "success": 0,
+                            "failed": 1,
+                        },
+                    },
+                ]
+            ],
+            max_length=100,
+        ),
+    ]
+    pagination: Pagination
+
+
+class PersonMergeTask(Struct):
+    id: Annotated[
+        str,
+        Meta(
+            description="The unique identifier for this merge task",
+            examples=["123e4567-e89b-12d3-a456-426614174000"],
+        ),
+    ]
+    status: Annotated[
+        Status,
+        Meta(
+            description="The current status of the batch operation",
+            examples=["in-progress"],
+        ),
+    ]
+    resultsSummary: Annotated[
+        ResultsSummary, Meta(description="Summary of merges in this batch task")
+    ]
+
+
+class PersonMergeTaskPaged(Struct):
+    data: Annotated[
+        list[PersonMergeTask],
+        Meta(
+            description="Array of person merge tasks",
+            examples=[
+                [
+                    {
+                        "id": "123e4567-e89b-12d3-a456-426614174000",
+                        "status": "success",
+                        "resultsSummary": {
+                            "total": 1,
+                            "inProgress": 0,
+                            "success": 1,
+                            "failed": 0,
+                        },
+                    },
+                    {
+                        "id": "456e7890-e12b-34c5-d678-901234567890",
+                        "status": "failed",
+                        "resultsSummary": {
+                            "total": 1,
+                            "inProgress": 0,
+                            "success": 0,
+                            "failed": 1,
+                        },
+                    },
+                ]
+            ],
+            max_length=100,
+        ),
+    ]
+    pagination: Pagination
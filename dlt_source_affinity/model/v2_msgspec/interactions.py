@@ -0,0 +1,317 @@
+# generated by datamodel-codegen:
+#   filename:  v2_spec.json
+
+from __future__ import annotations
+
+from datetime import datetime
+from enum import StrEnum
+from typing import Annotated, Literal
+
+from msgspec import Meta, Struct, field
+
+from . import (
+    Attendee,
+    AttendeesPreview,
+    PaginationWithTotalCount,
+    PersonData,
+    PersonDataPreview,
+)
+
+
+class Call(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The call's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    loggingType: Annotated[
+        Literal["manual"],
+        Meta(
+            description="Indicates how the interaction was added to Affinity: either manually by a user ('manual') or automatically through Affinity's capture process ('automated'). Currently, calls can only be logged as 'manual'.",
+            examples=["manual"],
+        ),
+    ]
+    title: (
+        Annotated[str, Meta(description="The call's title", examples=["Example title"])]
+        | None
+    )
+    startTime: Annotated[
+        datetime,
+        Meta(
+            description="The timestamp of when the call starts",
+            examples=["2023-01-01T00:00:00Z"],
+        ),
+    ]
+    endTime: (
+        Annotated[
+            datetime,
+            Meta(
+                description="The timestamp of when the call ends",
+                examples=["2023-01-01T00:00:00Z"],
+            ),
+        ]
+        | None
+    )
+    allDay: Annotated[
+        bool, Meta(description="Whether the call is all day", examples=[False])
+    ]
+    creator: (
+        Annotated[Attendee, Meta(description="The person who created the call")] | None
+    )
+    createdAt: Annotated[
+        datetime,
+        Meta(
+            description="The timestamp of when the call was created",
+            examples=["2023-01-01T00:00:00Z"],
+        ),
+    ]
+    updatedAt: (
+        Annotated[
+            datetime,
+            Meta(
+                description="The timestamp of when the call was updated",
+                examples=["2023-01-01T00:00:00Z"],
+            ),
+        ]
+        | None
+    )
+    attendeesPreview: Annotated[
+        AttendeesPreview, Meta(description="A preview of the attendees in the call")
+    ]
+
+
+class CallPaged(Struct):
+    data: Annotated[
+        list[Call], Meta(description="A page of Call results", max_length=100)
+    ]
+    pagination: PaginationWithTotalCount
+
+
+class Direction(StrEnum):
+    SENT = "sent"
+    RECEIVED = "received"
+
+
+class ChatMessage(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The chat message's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    sentAt: Annotated[
+        datetime,
+        Meta(
+            description="The timestamp of when the chat message was sent",
+            examples=["2023-01-01T00:00:00Z"],
+        ),
+    ]
+    loggingType: Annotated[
+        Literal["manual"],
+        Meta(
+            description="Indicates how the interaction was added to Affinity: either manually by a user ('manual') or automatically through Affinity's capture process ('automated'). Currently, chat messages can only be logged as 'manual'.",
+            examples=["manual"],
+        ),
+    ]
+    direction: Annotated[
+        Direction,
+        Meta(description="The direction of the chat message", examples=["sent"]),
+    ]
+    creator: Annotated[PersonData, Meta(description="The creator of the chat message")]
+    createdAt: Annotated[
+        datetime,
+        Meta(
+            description="The timestamp of when the chat message was created",
+            examples=["2022-01-01T00:00:00Z"],
+        ),
+    ]
+    updatedAt: (
+        Annotated[
+            datetime,
+            Meta(
+                description="The timestamp of when the chat message was updated",
+                examples=["2023-01-01T00:00:00Z"],
+            ),
+        ]
+        | None
+    )
+    participantsPreview: Annotated[
+        PersonDataPreview,
+        Meta(description="A preview of the participants who are in the chat message"),
+    ]
+
+
+class ChatMessagePaged(Struct):
+    data: Annotated[
+        list[ChatMessage],
+        Meta(description="A page of ChatMessage results", max_length=100),
+    ]
+    pagination: PaginationWithTotalCount
+
+
+class Email(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The email's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    sentAt: Annotated[
+        datetime,
+        Meta(
+            description="The timestamp of when the email was sent",
+            examples=["2023-01-01T00:00:00Z"],
+        ),
+    ]
+    loggingType: Annotated[
+        Literal["automated"],
+        Meta(
+            description="Indicates how the interaction was added to Affinity: either manually by a user ('manual') or automatically through Affinity's capture process ('automated'). Currently, emails can only be logged as 'automated'.",
+            examples=["automated"],
+        ),
+    ]
+    direction: Annotated[
+        Direction,
+        Meta(
+            description="The direction of the email: 'sent' if the email was sent by an internal user and  'received' if the email was sent to an internal user.",
+            examples=["received"],
+        ),
+    ]
+    subject: (
+        Annotated[
+            str, Meta(description="The email's subject", examples=["Example subject"])
+        ]
+        | None
+    )
+    createdAt: Annotated[
+        datetime,
+        Meta(
+            description="The timestamp of when the email was created",
+            examples=["2023-01-01T00:00:00Z"],
+        ),
+    ]
+    updatedAt: (
+        Annotated[
+            datetime,
+            Meta(
+                description="The timestamp of when the email was updated",
+                examples=["2023-01-01T00:00:00Z"],
+            ),
+        ]
+        | None
+    )
+    from_: Annotated[
+        Attendee, Meta(description="The participant who sent the email")
+    ] = field(name="from")
+    toParticipantsPreview: Annotated[
+        AttendeesPreview,
+        Meta(
+            description="A preview of the participants in the 'To' field of the email"
+        ),
+    ]
+    ccParticipantsPreview: Annotated[
+        AttendeesPreview,
+        Meta(description="A preview of the participants who are cc'ed in the email"),
+    ]
+
+
+class EmailPaged(Struct):
+    data: Annotated[
+        list[Email], Meta(description="A page of Email results", max_length=100)
+    ]
+    pagination: PaginationWithTotalCount
+
+
+class LoggingType(StrEnum):
+    AUTOMATED = "automated"
+    MANUAL = "manual"
+
+
+class Meeting(Struct):
+    id: Annotated[
+        int,
+        Meta(
+            description="The meeting's unique identifier",
+            examples=[1],
+            ge=1,
+            le=9007199254740991,
+        ),
+    ]
+    loggingType: Annotated[
+        LoggingType,
+        Meta(
+            description="Indicates how the interaction was added to Affinity: either manually by a user ('manual') or automatically through Affinity's capture process ('automated').",
+            examples=["automated"],
+        ),
+    ]
+    title: (
+        Annotated[
+            str, Meta(description="The meeting's title", examples=["Example title"])
+        ]
+        | None
+    )
+    startTime: Annotated[
+        datetime,
+        Meta(
+            description="The timestamp of when the meeting starts",
+            examples=["2023-01-01T00:00:00Z"],
+        ),
+    ]
+    endTime: (
+        Annotated[
+            datetime,
+            Meta(
+                description="The timestamp of when the meeting ends",
+                examples=["2023-01-01T00:00:00Z"],
+            ),
+        ]
+        | None
+    )
+    allDay: Annotated[
+        bool, Meta(description="Whether the meeting is all day", examples=[False])
+    ]
+    creator: (
+        Annotated[Attendee, Meta(description="The person who created the meeting")]
+        | None
+    )
+    organizer: (
+        Annotated[Attendee, Meta(description="The person who organized the meeting")]
+        | None
+    )
+    createdAt: Annotated[
+        datetime,
+        Meta(
+            description="The timestamp of when the meeting was created",
+            examples=["2023-01-01T00:00:00Z"],
+        ),
+    ]
+    updatedAt: (
+        Annotated[
+            datetime,
+            Meta(
+                description="The timestamp of when the meeting was updated",
+                examples=["2023-01-01T00:00:00Z"],
+            ),
+        ]
+        | None
+    )
+    attendeesPreview: Annotated[
+        AttendeesPreview, Meta(description="A preview of the attendees in the meeting")
+    ]
+
+
+class MeetingPaged(Struct):
+    data: Annotated[
+        list[Meeting], Meta(description="A page of Meeting results", max_length=100)
+    ]
+    pagination: PaginationWithTotalCount
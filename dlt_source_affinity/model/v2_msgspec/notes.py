@@ -0,0 +1,255 @@
+# generated by datamodel-codegen:
+#   filename:  v2_spec.json
+
+from __future__ import annotations
+
+from datetime import datetime
+from enum import StrEnum
+from typing import Annotated, Literal, TypeAlias
+
+from msgspec import UNSET, Meta, Struct, UnsetType
+
+from . import CompanyData, Opportunity, PaginationWithTotalCount, PersonData
+
+
+class Content(Struct):
+    html: Annotated[str, Meta(description="The HTML content of the note")] | None
+
+
+class PersonMention(Struct):
+    id: Annotated[int, Meta(description="The id of the mention", ge=1, le=2147483647)]
+    type: Annotated[Literal["person"], Meta(description="The type of mention")]
+    person: PersonData
+
+
+Mention: TypeAlias = Annotated[
+    PersonMention, Meta(description="A mention in a note.", title="notes.Mention")
+]
+
+
+class BaseNote(Struct):
+    id: Annotated[int, Meta(description="The id of the note", ge=1, le=2147483647)]
+    content: Content
+    creator: PersonData
+    mentions: Annotated[
+        list[Mention], Meta(description="The mentions in the note", max_length=100)
+    ]
+    createdAt: Annotated[
+        datetime, Meta(description="The date and time the note was created")
+    ]
+    updatedAt: (
+        Annotated[
+            datetime, Meta(description="The date and time the note was last updated")
+        ]
+        | None
+    )
+
+
+class SharingType(StrEnum):
+    PRIVATE = "private"
+    PUBLIC = "public"
+    CUSTOM = "custom"
+
+
+class PermissionSettings(Struct):
+    sharingType: Annotated[
+        SharingType, Meta(description="The sharing type of the note")
+    ]
+    owner: PersonData
+
+
+class OpportunitiesPreview(Struct):
+    data: (
+        Annotated[
+            list[Opportunity],
+            Meta(
+                description="Preview of attached Opportunities for a Note",
+                max_length=100,
+            ),
+        ]
+        | UnsetType
+    ) = UNSET
+    totalCount: (
+        Annotated[
+            int,
+            Meta(
+                description="The total count of the collection parameter.",
+                ge=0,
+                le=9007199254740991,
+            ),
+        ]
+        | UnsetType
+    ) = UNSET
+
+
+class PersonsPreview(Struct):
+    data: (
+        Annotated[
+            list[PersonData],
+            Meta(description="Preview of attached Persons for a Note", max_length=100),
+        ]
+        | UnsetType
+    ) = UNSET
+    totalCount: (
+        Annotated[
+            int,
+            Meta(
+                description="The total count of the collection parameter.",
+                ge=0,
+                le=9007199254740991,
+            ),
+        ]
+        | UnsetType
+    ) = UNSET
+
+
+class CompaniesPreview(Struct):
+    data: (
+        Annotated[
+            list[CompanyData],
+            Meta(
+                description="Preview of attached Companies for a Note", max_length=100
+            ),
+        ]
+        | UnsetType
+    ) = UNSET
+    totalCount: (
+        Annotated[
+            int,
+            Meta(
+                description="The total count of the collection parameter.",
+                ge=0,
+                le=9007199254740991,
+            ),
+        ]
+        | UnsetType
+    ) = UNSET
+
+
+class BaseRootNote(BaseNote):
+    repliesCount: (
+        Annotated[
+            int,
+            Meta(
+                description="The number of replies to this note. This is only included if the `repliesCount` parameter is passed in the `includes` in the request and the note is not a reply itself.",
+                ge=0,
+                le=2147483647,
+            ),
+        ]
+        | UnsetType
+    ) = UNSET
+    permissions: PermissionSettings | UnsetType = UNSET
+    opportunitiesPreview: OpportunitiesPreview | UnsetType = UNSET
+    personsPreview: PersonsPreview | UnsetType = UNSET
+    companiesPreview: CompaniesPreview | UnsetType = UNSET
+
+
+class EntitiesNote(BaseRootNote, tag_field="type", tag="entities", kw_only=True):
+    pass
+
+
+class MeetingInteraction(Struct, tag_field="type", tag="meeting"):
+    id: Annotated[
+        int,
+        Meta(description="The id of the Meeting (Event)", ge=1, le=9007199254740991),
+    ]
+
+
+class CallInteraction(Struct, tag_field="type", tag="call"):
+    id: Annotated[
+        int, Meta(description="The id of the Call (Event)", ge=1, le=9007199254740991)
+    ]
+
+
+class ChatMessageInteraction(Struct, tag_field="type", tag="chat-message"):
+    id: Annotated[
+        int, Meta(description="The id of the ChatMessage", ge=1, le=9007199254740991)
+    ]
+
+
+class EmailInteraction(Struct, tag_field="type", tag="email"):
+    id: Annotated[
+        int, Meta(description="The id of the Email", ge=1, le=9007199254740991)
+    ]
+
+
+Interaction: TypeAlias = Annotated[
+    MeetingInteraction | CallInteraction | ChatMessageInteraction | EmailInteraction,
+    Meta(
+        description="An interaction attached to a Note. It can be a Meeting, a Call or an ChatMessage.",
+        title="notes.NoteInteraction",
+    ),
+]
+
+
+class InteractionNote(BaseRootNote, tag_field="type", tag="interaction", kw_only=True):
+    interaction: Interaction
+
+
+class AiNotetakerRootNote(
+    BaseRootNote, tag_field="type", tag="ai-notetaker", kw_only=True
+):
+    interaction: (
+        Annotated[
+            MeetingInteraction,
+            Meta(description="The meeting this AI Notetaker was invited to."),
+        ]
+        | UnsetType
+    ) = UNSET
+
+
+class Parent(Struct):
+    id: Annotated[
+        int, Meta(description="The id of the parent note", ge=1, le=2147483647)
+    ]
+
+
+class BaseReply(BaseNote):
+    parent: Parent
+
+
+class UserReplyNote(BaseReply, tag_field="type", tag="user-reply"):
+    pass
+
+
+class AiNotetakerReplyNote(BaseReply, tag_field="type", tag="ai-notetaker-reply"):
+    interaction: (
+        Annotated[
+            MeetingInteraction,
+            Meta(description="The meeting this AI Notetaker was invited to."),
+        ]
+        | UnsetType
+    ) = UNSET
+
+
+Note: TypeAlias = Annotated[
+    EntitiesNote
+    | InteractionNote
+    | AiNotetakerRootNote
+    | UserReplyNote
+    | AiNotetakerReplyNote,
+    Meta(description="Note model", title="notes.Note"),
+]
+
+
+class NotesPaged(Struct):
+    data: Annotated[
+        list[Note], Meta(description="A page of Note objects", max_length=100)
+    ]
+    pagination: PaginationWithTotalCount
+
+
+Reply: TypeAlias = Annotated[
+    UserReplyNote | AiNotetakerReplyNote,
+    Meta(
+        description="A Reply to a Note, created by a User or AI Notetaker.",
+        title="notes.Reply",
+    ),
+]
+
+
+class RepliesPaged(Struct):
+    data: Annotated[
+        list[Reply], Meta(description="A page of Note Replies", max_length=100)
+    ]
+    pagination: PaginationWithTotalCount
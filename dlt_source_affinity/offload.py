@@ -0,0 +1,63 @@
+"""Optional process pool for the CPU bound validation and flattening of pages"""
+
+import atexit
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+R = TypeVar("R")
+
+logger = logging.getLogger("dlt")
+
+_executors: Dict[int, ProcessPoolExecutor] = {}
+"""
+The worker processes per pool size, shared by all runs in this process, as they are slow to start
+"""
+_executors_lock = threading.Lock()
+
+
+def _shutdown_executors() -> None:
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown()
+        _executors.clear()
+
+
+atexit.register(_shutdown_executors)
+
+
+class ProcessPool:
+    """
+    Runs functions in a pool of worker processes, so pages are validated and flattened on all
+    cores instead of being serialized by the GIL in dlt's extract threads. The functions and
+    their arguments and results must be picklable, i.e. raw page bytes in and plain rows out.
+
+    The processes are started with the first function and shared with the other pools of the same
+    size, so they are only shut down at exit.
+    """
+
+    def __init__(self, workers: int | None = None):
+        self.workers = workers
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers is not None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with _executors_lock:
+            if self.workers not in _executors:
+                logger.info(f"Starting a pool of {self.workers} processes")
+                _executors[self.workers] = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    # forking a process with running (extract) threads is unsafe
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return _executors[self.workers]
+
+    def submit(self, f: Callable[..., R], *args: Any) -> "Future[R]":
+        return self._get_executor().submit(f, *args)
+
+    def run(self, f: Callable[..., R], *args: Any) -> R:
+        return self.submit(f, *args).result()
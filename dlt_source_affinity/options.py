@@ -0,0 +1,249 @@
+"""
+The options of the source, grouped by concern. The groups that are config specs are completed from
+the config of the source, e.g. `SOURCES__AFFINITY__DIAGNOSTICS__PROFILE_DIR`.
+"""
+
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, NamedTuple, Sequence
+
+from dlt.common.configuration import configspec
+from dlt.common.configuration.specs import BaseConfiguration
+
+from .decoding import DECODER, check_decoder
+from .model.v2 import Company, Person, Type3
+from .progress import LOG_INTERVAL
+from .waiting import GATHER_SECONDS
+
+
+def check_field_types(field_types: Iterable[str]) -> None:
+    unknown = set(field_types) - {t.value for t in Type3}
+    if unknown:
+        raise ValueError(f"Unknown field types {sorted(unknown)}")
+
+
+class ExplicitIds(NamedTuple):
+    """
+    Only refreshes the given companies, persons and list entries, merging them into the tables
+    of earlier loads. Only the tables of the given kinds of IDs are loaded.
+    """
+
+    company_ids: Sequence[int] | None = None
+    """
+    The IDs of the companies to refresh
+    """
+    person_ids: Sequence[int] | None = None
+    """
+    The IDs of the persons to refresh
+    """
+    list_entry_ids: Dict[int, Sequence[int]] | None = None
+    """
+    The IDs of the list entries to refresh, keyed by list ID. They are refreshed from their list,
+    regardless of the saved views they were loaded by, and replace `list_refs`.
+    """
+
+
+class Filters(NamedTuple):
+    """
+    Only loads the companies and persons a filter returns true for. The filters are evaluated on
+    the enumerated entities (without fields) before fetching their details.
+    """
+
+    companies: Callable[[Company], bool] | None = None
+    """
+    E.g. `lambda c: not c.isGlobal`
+    """
+    persons: Callable[[Person], bool] | None = None
+
+
+@configspec
+class Incremental(BaseConfiguration):
+    """
+    Only loads (and merges) what changed since the last run
+    """
+
+    skip_unchanged: bool = False
+    """
+    Keep a local fingerprint index of companies, persons and list entries and only emit the
+    rows that changed since the last run
+    """
+    fingerprint_index_path: str | None = None
+    """
+    Where to keep the fingerprint index, defaults to the pipeline working dir
+    """
+    detect_deletions: bool = False
+    """
+    Keep a snapshot of all enumerated IDs and emit hard delete markers for companies, persons,
+    opportunities, lists and list entries that disappeared since the last run
+    """
+    change_feed: bool = False
+    """
+    Only refresh the companies, persons and list entries whose field values changed since the
+    last run (as per the v1 field value changes), instead of loading everything
+    """
+    field_refresh_intervals: Dict[str, timedelta] | None = None
+    """
+    Only fetch the fields of a type once its interval elapsed, e.g.
+    `{"enriched": timedelta(days=7)}` (or seconds in the config), and complete the rows with the
+    fields as last fetched
+    """
+
+    @property
+    def merges(self) -> bool:
+        """
+        Whether only some rows are emitted, so the tables of earlier loads are merged into
+        """
+        return (
+            self.skip_unchanged
+            or self.detect_deletions
+            or self.change_feed
+            or bool(self.field_refresh_intervals)
+        )
+
+    def on_resolved(self) -> None:
+        # the config holds seconds
+        if self.field_refresh_intervals:
+            self.field_refresh_intervals = {
+                field_type: (
+                    interval
+                    if isinstance(interval, timedelta)
+                    else timedelta(seconds=interval)
+                )
+                for field_type, interval in self.field_refresh_intervals.items()
+            }
+
+    def validate(self) -> None:
+        check_field_types(self.field_refresh_intervals or {})
+
+
+@configspec
+class ListLoading(BaseConfiguration):
+    """
+    Which lists are loaded, and how their entries are paged
+    """
+
+    discover: bool = False
+    """
+    Load the entries of all lists and (sheet type) saved views in addition to `list_refs`
+    """
+    coalesce_views: bool = False
+    """
+    Page over the entries of a list referenced more than once (by itself or its saved views)
+    only once, with all fields, and load which of them are in each saved view into a membership
+    table per saved view. This pages the whole list, so it only pays off if the list is
+    referenced itself or its saved views cover most of it.
+    """
+    max_in_flight: int | None = None
+    """
+    Page over at most this many lists and saved views at once, starting with the largest ones
+    as estimated by the last run or the list sizes
+    """
+    reuse_entities: bool = False
+    """
+    Fetch the details of companies and persons after the lists were paged, and only of the ones
+    that were not on a list fetched with (at least) the same field types
+    """
+    gather_seconds: float = GATHER_SECONDS
+    """
+    With `max_in_flight` or `reuse_entities`, lists (and companies and persons) wait for all
+    selected lists to start, but at most this many seconds, in case one fails before starting
+    """
+
+    def validate(self) -> None:
+        if self.max_in_flight is not None and self.max_in_flight < 1:
+            raise ValueError(
+                f"max_in_flight must be at least 1, got {self.max_in_flight}"
+            )
+        if self.gather_seconds < 0:
+            raise ValueError(
+                f"gather_seconds must not be negative, got {self.gather_seconds}"
+            )
+
+
+@configspec
+class Concurrency(BaseConfiguration):
+    """
+    How the company and person detail requests are issued and paced
+    """
+
+    adaptive: bool = False
+    """
+    Adapt the number of concurrent detail requests to the latency and throttling of the API,
+    starting at the level learned in the last run
+    """
+    hedge_requests: bool = False
+    """
+    Send a duplicate of detail requests that take longer than the p95 latency of their
+    endpoint, taking the first response
+    """
+    rate_limit_dir: str | None = None
+    """
+    Share a token bucket of the per user rate limit in this directory with all other processes
+    using the same API key, fed by the rate limit headers of every response
+    """
+    split_field_types: Sequence[Sequence[str]] | None = None
+    """
+    Fetch the details with one concurrent request per group of field types (and one for all
+    others), e.g. `[["relationship-intelligence"]]`
+    """
+
+    def validate(self) -> None:
+        check_field_types(t for group in self.split_field_types or [] for t in group)
+
+
+@configspec
+class Decoding(BaseConfiguration):
+    """
+    How the company, person, list entry and note pages are decoded, validated and flattened
+    """
+
+    decoder: DECODER = "pydantic"
+    """
+    Decode with the `pydantic` models or with the faster `msgspec` structs generated from the
+    same spec (needs the `msgspec` extra)
+    """
+    validate_every: int | None = None
+    """
+    Only validate the first and then one in every this many pages with pydantic, and decode the
+    others with the `msgspec` structs. A page that fails to decode switches its resource back to
+    validating every page. Needs the `msgspec` extra, whatever the `decoder`.
+    """
+    process_workers: int | None = None
+    """
+    Validate and flatten the company, person and list entry pages in a pool of this many
+    processes, to use more than one core
+    """
+
+    def validate(self) -> None:
+        check_decoder(self.decoder)
+        if self.validate_every is not None:
+            if self.validate_every < 1:
+                raise ValueError(
+                    f"validate_every must be at least 1, got {self.validate_every}"
+                )
+            check_decoder("msgspec")
+
+
+@configspec
+class Diagnostics(BaseConfiguration):
+    """
+    What is measured and recorded about a run
+    """
+
+    profile_transforms: bool = False
+    """
+    Count the flattened rows, field values per value type (and their CPU time) and side table
+    items per resource, attached to the `transform` custom metric in the trace
+    """
+    profile_dir: str | None = None
+    """
+    Sample the stacks of every resource and write them (and a summary) into this directory
+    """
+    trace_file: str | None = None
+    """
+    Record the HTTP requests, page validations and flattening passes of all resources and write
+    them as a Chrome trace (JSON) to this file
+    """
+    progress_interval: float | None = LOG_INTERVAL
+    """
+    Seconds between two logs of the progress of every resource, `None` to disable
+    """
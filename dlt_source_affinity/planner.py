@@ -0,0 +1,369 @@
+"""Run planner, estimating the request budget and duration of a load before extracting"""
+
+import json
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+from dlt.sources.helpers.requests import HTTPError
+from dlt.sources.helpers.rest_client.client import Response, RESTClient
+
+from .concurrency import MAX_CONCURRENCY, MIN_CONCURRENCY
+from .helpers import ListReference, Sampling, generate_list_entries_path
+from .model.v2 import PaginationWithTotalCount, WhoAmI
+from .projection import (
+    ENTITY_FIELD_TYPES,
+    LIST_ENTRY_FIELD_TYPES,
+    FieldProjection,
+    FieldSelection,
+)
+from .ratelimit import LIMIT_HEADER, REMAINING_HEADER, USER_RATE_LIMIT_PER_MINUTE
+from .rest_client import (
+    MAX_PAGE_LIMIT_V1,
+    MAX_PAGE_LIMIT_V2,
+    get_v1_rest_client,
+    get_v2_rest_client,
+    hooks,
+)
+
+RATE_LIMIT_HEADERS = {
+    "user_limit": LIMIT_HEADER,
+    "user_remaining": REMAINING_HEADER,
+    "org_remaining": "X-Ratelimit-Limit-Org-Remaining",
+}
+PERMISSIONS = {
+    "companies": 'the "Export All Organizations directory" permission',
+    "persons": 'the "Export All People directory" permission',
+    "opportunities": 'the "Export data from Lists" permission',
+    "lists": 'the "Export data from Lists" permission',
+}
+RESOURCES = ("companies", "persons", "opportunities", "lists", "notes")
+
+logger = logging.getLogger("dlt")
+
+
+class MissingPermissions(Exception):
+    def __init__(self, missing: Dict[str, str]):
+        self.missing = missing
+        super().__init__(
+            "The API key is missing permissions: "
+            + "; ".join(
+                f"{resource} requires {permission}"
+                for resource, permission in missing.items()
+            )
+        )
+
+
+@dataclass
+class ResourcePlan:
+    name: str
+    rows: int
+    """
+    Number of rows loaded, as counted by `totalCount` or by enumerating the IDs, and sampled
+    """
+    requests: int
+    """
+    Estimated number of requests of the load
+    """
+    bytes: int
+    """
+    Estimated number of bytes received, extrapolated from the items and envelope of a sampled page
+    """
+    sequential_requests: int
+    """
+    Requests that need to be sent one after another, as they follow a pagination cursor
+    """
+
+
+@dataclass
+class RunPlan:
+    tenant: str
+    user: str
+    scopes: List[str]
+    latency_seconds: float
+    """
+    Mean latency of the sampled requests
+    """
+    concurrency: int
+    """
+    Number of concurrent requests needed to saturate the per user rate limit, to configure as
+    `extract.workers`, which the adaptive concurrency starts at as well
+    """
+    rate_limit: Dict[str, int]
+    """
+    The rate limit headers of the last response, e.g. the remaining requests of the org
+    """
+    resources: List[ResourcePlan] = field(default_factory=list)
+
+    @property
+    def requests(self) -> int:
+        return sum(r.requests for r in self.resources)
+
+    @property
+    def bytes(self) -> int:
+        return sum(r.bytes for r in self.resources)
+
+    @property
+    def seconds(self) -> float:
+        """
+        Estimated wall time: bound by the rate limit, the concurrency or the longest chain of
+        sequential requests
+        """
+        rate_limit_per_minute = self.rate_limit.get(
+            "user_limit", USER_RATE_LIMIT_PER_MINUTE
+        )
+        return max(
+            self.requests / (rate_limit_per_minute / 60),
+            self.requests * self.latency_seconds / self.concurrency,
+            max(
+                (r.sequential_requests for r in self.resources),
+                default=0,
+            )
+            * self.latency_seconds,
+        )
+
+    @property
+    def fits_org_budget(self) -> bool:
+        return self.requests <= self.rate_limit.get("org_remaining", math.inf)
+
+    def summary(self) -> str:
+        lines = [
+            f"Plan for {self.tenant} ({self.user}): {self.requests} requests, "
+            f"~{self.bytes / 1e6:.1f} MB, ~{self.seconds / 60:.1f} min "
+            f"at a concurrency of {self.concurrency}",
+        ]
+        for r in self.resources:
+            lines.append(
+                f"  {r.name}: {r.rows} rows, {r.requests} requests, ~{r.bytes / 1e6:.1f} MB"
+            )
+        if not self.fits_org_budget:
+            lines.append(
+                f"  The org has only {self.rate_limit['org_remaining']} requests left this month"
+            )
+        return "\n".join(lines)
+
+
+class Sample(NamedTuple):
+    """
+    A probed page, split into the bytes of its items and of its envelope (e.g. the pagination)
+    """
+
+    rows: int
+    item_bytes: int
+    envelope_bytes: int
+    response: Response
+
+    def bytes(self, rows: int, pages: int) -> int:
+        """
+        Extrapolates the bytes of `rows` items received in `pages` pages
+        """
+        return int(
+            rows * self.item_bytes / max(self.rows, 1) + pages * self.envelope_bytes
+        )
+
+
+def _item_bytes(items: List[Any]) -> int:
+    return sum(len(json.dumps(item, separators=(",", ":")).encode()) for item in items)
+
+
+def _sampled(rows: int, sampling: Sampling | None) -> Tuple[int, int]:
+    """
+    Returns the number of rows enumerated and kept by a sampled load of `rows` rows, which stops
+    enumerating after `max_items` sampled rows
+    """
+    if sampling is None:
+        return (rows, rows)
+    kept = math.ceil(rows * sampling.rate)
+    if sampling.max_items is None or kept <= sampling.max_items:
+        return (rows, kept)
+    return (
+        min(rows, math.ceil(sampling.max_items / sampling.rate)),
+        sampling.max_items,
+    )
+
+
+def _rate_limit(response: Response) -> Dict[str, int]:
+    return {
+        key: int(response.headers[header])
+        for key, header in RATE_LIMIT_HEADERS.items()
+        if header in response.headers
+    }
+
+
+def _count_pages(
+    rest_client: RESTClient, path: str, params: Dict[str, object]
+) -> Tuple[int, int]:
+    """
+    Enumerates a collection, returning the number of rows and pages
+    """
+    rows = 0
+    pages = 0
+    for page in rest_client.paginate(path, params=params, hooks=hooks):
+        rows += len(page)
+        pages += 1
+    return (rows, pages)
+
+
+def plan(
+    list_refs: Sequence[ListReference] = (),
+    resources: Sequence[str] = RESOURCES,
+    sampling: Sampling | None = None,
+    fields: Dict[str | ListReference, FieldSelection] | None = None,
+) -> RunPlan:
+    """
+    Checks the grant and permissions for the given resources and list references and estimates
+    the requests, bytes and wall time of loading them, with the `sampling` and `fields` of the
+    load (see `source`). Filters can't be evaluated before enumerating the entities, so the
+    details of all companies and persons are counted. Enumerates all IDs, so planning takes
+    about as many requests as the ID stage of a load.
+
+    Raises `MissingPermissions` if any of the resources can't be loaded.
+    """
+    fields = fields or {}
+    rest_client = get_v2_rest_client()
+    response = rest_client.get("auth/whoami", hooks=hooks)
+    whoami = WhoAmI.model_validate_json(response.text)
+    if "api" not in whoami.grant.scopes:
+        raise MissingPermissions({"api": 'the "api" scope'})
+
+    latencies: List[float] = []
+    rate_limit = _rate_limit(response)
+    resource_plans: List[ResourcePlan] = []
+    missing: Dict[str, str] = {}
+
+    def probe(
+        name: str,
+        path: str,
+        params: Dict[str, object],
+        permission: str | None = None,
+        client: RESTClient = rest_client,
+        data_key: str = "data",
+    ) -> Sample | None:
+        """
+        Fetches a single page, returning its rows and bytes, or None if the API key lacks the
+        permission
+        """
+        nonlocal rate_limit
+        try:
+            response = client.get(path, params=params, hooks=hooks)
+        except HTTPError as e:
+            if e.response is not None and e.response.status_code == 403:
+                missing[name] = permission or PERMISSIONS.get(name, "access")
+                return None
+            raise
+        latencies.append(response.elapsed.total_seconds())
+        rate_limit = _rate_limit(response) or rate_limit
+        items = response.json()[data_key]
+        item_bytes = _item_bytes(items)
+        return Sample(
+            len(items), item_bytes, max(0, len(response.content) - item_bytes), response
+        )
+
+    for name in resources:
+        if name == "notes":
+            count = probe(name, "notes", {"limit": 1, "totalCount": True})
+            if count is None:
+                continue
+            rows = (
+                PaginationWithTotalCount.model_validate(
+                    count.response.json()["pagination"]
+                ).totalCount
+                or 0
+            )
+            # notes are loaded from the v1 API, in bigger pages of their v1 shape
+            sample = probe(
+                name,
+                "notes",
+                {"page_size": MAX_PAGE_LIMIT_V1},
+                client=get_v1_rest_client(),
+                data_key="notes",
+            )
+            if sample is None:
+                continue
+            pages = max(1, math.ceil(rows / MAX_PAGE_LIMIT_V1))
+            resource_plans.append(
+                ResourcePlan(name, rows, pages, sample.bytes(rows, pages), pages)
+            )
+            continue
+
+        sample = probe(name, name, {"limit": MAX_PAGE_LIMIT_V2})
+        if sample is None:
+            continue
+        (rows, pages) = _count_pages(rest_client, name, {"limit": MAX_PAGE_LIMIT_V2})
+        # lists are never sampled
+        (enumerated, kept) = _sampled(rows, sampling if name != "lists" else None)
+        pages = math.ceil(pages * enumerated / max(rows, 1))
+        requests = pages
+        size = sample.bytes(enumerated, pages)
+        if name in ("companies", "persons"):
+            # the IDs are enumerated first and the details are fetched in batches
+            projection = FieldProjection(
+                fields.get(name), ENTITY_FIELD_TYPES, f"{name}/fields"
+            )
+            details = probe(
+                name,
+                name,
+                {
+                    "ids": [e["id"] for e in sample.response.json()["data"]],
+                    **projection.params(rest_client),
+                },
+            )
+            batches = math.ceil(kept / MAX_PAGE_LIMIT_V2)
+            if details is not None:
+                size += details.bytes(kept, batches)
+            requests += batches
+        resource_plans.append(ResourcePlan(name, kept, requests, size, pages))
+
+    for ref in list_refs:
+        name = f"lists-{ref}-entries"
+        endpoint = generate_list_entries_path(ref)
+        # saved views return the fields of their columns
+        projection = FieldProjection(
+            fields.get(ref) if ref.view_id is None else None,
+            LIST_ENTRY_FIELD_TYPES,
+            f"lists/{ref.list_id}/fields",
+        )
+        sample = probe(
+            name,
+            endpoint,
+            {"limit": MAX_PAGE_LIMIT_V2, **projection.params(rest_client)},
+            f"{PERMISSIONS['lists']} and access to list {ref.list_id}",
+        )
+        if sample is None:
+            continue
+        (rows, pages) = _count_pages(
+            rest_client, endpoint, {"limit": MAX_PAGE_LIMIT_V2}
+        )
+        # the entries are sampled after they were received
+        (enumerated, kept) = _sampled(rows, sampling)
+        pages = math.ceil(pages * enumerated / max(rows, 1))
+        resource_plans.append(
+            ResourcePlan(name, kept, pages, sample.bytes(enumerated, pages), pages)
+        )
+
+    if missing:
+        raise MissingPermissions(missing)
+
+    latency = sum(latencies) / len(latencies) if latencies else 0.5
+    # Little's law: requests in flight = throughput * latency
+    concurrency = min(
+        MAX_CONCURRENCY,
+        max(
+            MIN_CONCURRENCY,
+            math.ceil(
+                rate_limit.get("user_limit", USER_RATE_LIMIT_PER_MINUTE) / 60 * latency
+            ),
+        ),
+    )
+    run_plan = RunPlan(
+        tenant=whoami.tenant.name,
+        user=whoami.user.emailAddress,
+        scopes=whoami.grant.scopes,
+        latency_seconds=latency,
+        concurrency=concurrency,
+        rate_limit=rate_limit,
+        resources=resource_plans,
+    )
+    logger.info(run_plan.summary())
+    return run_plan
@@ -0,0 +1,295 @@
+"""Optional profiling of the extraction: counters and timers of the field flattening and a sampling profiler per resource"""
+
+import atexit
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Any, Dict, Generator, List, TypeVar
+
+import dlt
+from dlt.extract.items import DataItemWithMeta
+
+R = TypeVar("R")
+
+SAMPLE_INTERVAL = 0.005
+"""
+Seconds between two samples of the stacks of all threads running a resource
+"""
+WRITE_INTERVAL = 10.0
+"""
+Seconds between two writes of the profiles, which are written at exit as well
+"""
+IDLE_SECONDS = 1.0
+"""
+Seconds without any resource running after which the sampling thread writes the profiles and ends
+"""
+SUMMARY_FILE = "summary.txt"
+SUMMARY_TOP_FUNCTIONS = 20
+
+logger = logging.getLogger("dlt")
+
+
+@dataclass
+class ValueTypeCounters:
+    values: int = 0
+    cpu_seconds: float = 0.0
+
+
+@dataclass
+class ResourceCounters:
+    rows: int = 0
+    first_row_at: float | None = None
+    last_row_at: float | None = None
+    value_types: Dict[str, ValueTypeCounters] = field(
+        default_factory=lambda: defaultdict(ValueTypeCounters)
+    )
+    side_items: Counter = field(default_factory=Counter)
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed = (
+            self.last_row_at - self.first_row_at
+            if self.first_row_at is not None
+            else 0.0
+        )
+        return {
+            "rows": self.rows,
+            "rows_per_second": round(self.rows / elapsed, 1) if elapsed > 0 else None,
+            "value_types": {
+                value_type: {
+                    "values": counters.values,
+                    "cpu_seconds": round(counters.cpu_seconds, 6),
+                }
+                for value_type, counters in sorted(self.value_types.items())
+            },
+            "side_items": dict(sorted(self.side_items.items())),
+        }
+
+
+class TransformProfile:
+    """
+    Counts the flattened rows and field values, the CPU time spent per field value type and
+    the items emitted to side tables (fields, dropdown options, interactions).
+    Disabled by default, as the timers add overhead to every field value.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._counters: Dict[str, ResourceCounters] = defaultdict(ResourceCounters)
+
+    def reset(self, enabled: bool) -> None:
+        with self._lock:
+            self.enabled = enabled
+            self._counters.clear()
+
+    def count_row(self, resource: str) -> None:
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            counters = self._counters[resource]
+            counters.rows += 1
+            if counters.first_row_at is None:
+                counters.first_row_at = now
+            counters.last_row_at = now
+
+    def measure(
+        self,
+        resource: str,
+        value_type: str,
+        gen: Generator[DataItemWithMeta, None, R],
+    ) -> Generator[DataItemWithMeta, None, R]:
+        """
+        Wraps the processing of a single field value. The CPU time is measured only while the
+        generator runs, not while it is suspended at the side items it yields.
+        """
+        cpu_seconds = 0.0
+        side_items: Counter = Counter()
+        started = time.thread_time()
+        try:
+            while True:
+                try:
+                    item = next(gen)
+                except StopIteration as e:
+                    return e.value
+                finally:
+                    cpu_seconds += time.thread_time() - started
+                side_items[item.meta.hints.get("table_name")] += 1
+                yield item
+                started = time.thread_time()
+        finally:
+            with self._lock:
+                counters = self._counters[resource]
+                value_counters = counters.value_types[value_type]
+                value_counters.values += 1
+                value_counters.cpu_seconds += cpu_seconds
+                counters.side_items.update(side_items)
+
+    def by_resource(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                resource: counters.as_dict()
+                for resource, counters in sorted(self._counters.items())
+            }
+
+    def publish(self, resource: str) -> None:
+        """
+        Attaches the counters of a resource to its custom metrics in the pipeline trace.
+        Must be called from within the resource.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            summary = self._counters[resource].as_dict()
+        dlt.current.resource_metrics()["transform"] = summary
+
+
+class ResourceProfiler:
+    """
+    Samples the stacks of all threads that currently step a resource or transformer generator and
+    attributes them to that resource. A deterministic profiler can't be used here, as profilers are
+    process wide since Python 3.12, whereas parallelized resources run in a thread pool.
+
+    Writes the samples of every resource as folded stacks (`<resource>.folded`, e.g. for speedscope
+    or flamegraph.pl) and a summary of the functions with the most samples. The sampling thread
+    ends once no resource ran for `IDLE_SECONDS`, and starts again with the next one.
+    """
+
+    def __init__(self):
+        self.directory: str | None = None
+        self._lock = threading.Lock()
+        self._active: Dict[int, str] = {}
+        self._samples: Dict[str, Counter] = defaultdict(Counter)
+        self._sampler: threading.Thread | None = None
+        self._at_exit_registered = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def start(self, directory: str | None) -> None:
+        with self._lock:
+            self.directory = directory
+            self._samples.clear()
+        if directory is None:
+            return
+        os.makedirs(directory, exist_ok=True)
+        logger.info(f"Profiling resources into {directory}")
+        if not self._at_exit_registered:
+            atexit.register(self.write)
+            self._at_exit_registered = True
+
+    def _start_sampler(self) -> None:
+        with self._lock:
+            if self._sampler is None:
+                self._sampler = threading.Thread(
+                    target=self._sample, name="affinity-profiler", daemon=True
+                )
+                self._sampler.start()
+
+    def profile(
+        self, name: str, gen: Generator[Any, None, R]
+    ) -> Generator[Any, None, R]:
+        while True:
+            # parallelized generators are stepped by any thread of the pool
+            thread_id = threading.get_ident()
+            # resources might step other resources on the same thread
+            outer = self._active.get(thread_id)
+            self._active[thread_id] = name
+            # after the resource is active, so an idle sampler does not end without it
+            self._start_sampler()
+            try:
+                item = next(gen)
+            except StopIteration as e:
+                return e.value
+            finally:
+                if outer is None:
+                    self._active.pop(thread_id, None)
+                else:
+                    self._active[thread_id] = outer
+            yield item
+
+    def _sample(self) -> None:
+        last_write = time.monotonic()
+        active_at = last_write
+        while True:
+            time.sleep(SAMPLE_INTERVAL)
+            now = time.monotonic()
+            if self._active:
+                active_at = now
+            elif now - active_at > IDLE_SECONDS:
+                with self._lock:
+                    if not self._active:
+                        self._sampler = None
+                        break
+            if not self.enabled:
+                continue
+            frames = sys._current_frames()
+            for thread_id, name in list(self._active.items()):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    stack = folded_stack(frame)
+                    with self._lock:
+                        self._samples[name][stack] += 1
+            if now - last_write > WRITE_INTERVAL:
+                self.write()
+                last_write = now
+        self.write()
+
+    def write(self) -> None:
+        directory = self.directory
+        if directory is None:
+            return
+        with self._lock:
+            samples = {name: Counter(stacks) for name, stacks in self._samples.items()}
+        total: Counter = Counter()
+        summary: List[str] = []
+        for name, stacks in sorted(samples.items()):
+            with open(
+                os.path.join(directory, f"{name}.folded"), "w", encoding="utf-8"
+            ) as f:
+                for stack, n in stacks.most_common():
+                    f.write(f"{stack} {n}\n")
+            functions = self_samples(stacks)
+            total.update(functions)
+            summary += summarize(name, functions)
+        summary = summarize("all resources", total) + summary
+        with open(os.path.join(directory, SUMMARY_FILE), "w", encoding="utf-8") as f:
+            f.write("\n".join(summary))
+
+
+def folded_stack(frame: FrameType | None) -> str:
+    """
+    Returns the stack of a frame up to the generator of the profiled resource, outermost first
+    """
+    functions = []
+    while frame is not None and frame.f_code is not _PROFILE_CODE:
+        code = frame.f_code
+        functions.append(f"{os.path.basename(code.co_filename)}:{code.co_qualname}")
+        frame = frame.f_back
+    return ";".join(reversed(functions))
+
+
+def self_samples(stacks: Counter) -> Counter:
+    functions: Counter = Counter()
+    for stack, n in stacks.items():
+        functions[stack.rsplit(";", 1)[-1]] += n
+    return functions
+
+
+def summarize(name: str, functions: Counter) -> List[str]:
+    samples = sum(functions.values())
+    lines = [
+        f"{name}: {samples} samples (~{samples * SAMPLE_INTERVAL:.1f}s)",
+    ]
+    for function, n in functions.most_common(SUMMARY_TOP_FUNCTIONS):
+        lines.append(f"  {n / samples:6.1%}  {function}")
+    return lines + [""]
+
+
+_PROFILE_CODE = ResourceProfiler.profile.__code__
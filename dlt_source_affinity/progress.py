@@ -0,0 +1,234 @@
+"""Progress of every resource against a known or estimated total, with rows per second and an ETA"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Set
+
+import dlt
+from dlt.common.configuration.container import Container
+from dlt.common.pipeline import PipelineContext
+
+LOG_INTERVAL = 60.0
+"""
+Seconds between two progress logs
+"""
+
+logger = logging.getLogger("dlt")
+
+
+@dataclass
+class ResourceProgress:
+    pages: int = 0
+    rows: int = 0
+    total: int | None = None
+    """
+    Number of rows to fetch, from `totalCount`, the given IDs or the ID stage
+    """
+    estimated: bool = True
+    """
+    Whether the total might still grow, e.g. while the ID stage is still enumerating
+    """
+    started_at: float = field(default_factory=time.monotonic)
+    """
+    When the run started, so the rate of a resource includes the time it waited for its first page
+    """
+    updated_at: float = field(default_factory=time.monotonic)
+    collected: bool = False
+    collected_total: int | None = None
+    """
+    The total last passed to the progress collector, which can only grow a total it was created with
+    """
+
+    @property
+    def done(self) -> bool:
+        return not self.estimated and self.total is not None and self.rows >= self.total
+
+    @property
+    def rows_per_second(self) -> float | None:
+        elapsed = self.updated_at - self.started_at
+        return self.rows / elapsed if self.rows and elapsed > 0 else None
+
+    @property
+    def eta_seconds(self) -> float | None:
+        rate = self.rows_per_second
+        if self.total is None or rate is None:
+            return None
+        return max(self.total - self.rows, 0) / rate
+
+    def as_dict(self) -> Dict[str, Any]:
+        rate = self.rows_per_second
+        eta = self.eta_seconds
+        return {
+            "pages": self.pages,
+            "rows": self.rows,
+            "total": self.total,
+            "estimated": self.estimated,
+            "rows_per_second": round(rate, 1) if rate is not None else None,
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+        }
+
+    def describe(self, now: float, idle_after: float) -> str:
+        if self.total is None:
+            rows = f"{self.rows} rows"
+        else:
+            total = f"{'>=' if self.estimated else ''}{self.total}"
+            rows = f"{self.rows}/{total} rows ({self.rows / max(self.total, 1):.0%})"
+        rate = self.rows_per_second
+        parts = [
+            rows,
+            f"{self.pages} pages",
+            f"{rate:.1f} rows/s" if rate is not None else "no rows yet",
+        ]
+        eta = self.eta_seconds
+        if eta is not None:
+            parts.append(f"ETA {eta:.0f}s")
+        idle = now - self.updated_at
+        if idle >= idle_after:
+            parts.append(f"no progress for {idle:.0f}s")
+        return ", ".join(parts)
+
+
+class Progress:
+    """
+    Tracks the fetched pages and rows of every resource. Totals come from `totalCount` (notes),
+    the number of given IDs or the running count of the ID stage (companies and persons), which
+    is marked as estimated until the enumeration completes. Progress is passed to the progress
+    collector of the running pipeline, e.g. `dlt.pipeline(progress="log")`, and logged by a daemon
+    thread every `log_interval` seconds, so resources that are stuck are logged as well. The thread
+    ends once every resource that made progress published it, and starts again with the next update.
+    """
+
+    def __init__(self):
+        self.log_interval: float | None = LOG_INTERVAL
+        self._lock = threading.Lock()
+        self._resources: Dict[str, ResourceProgress] = {}
+        self._published: Set[str] = set()
+        self._started_at = time.monotonic()
+        self._stopped = threading.Event()
+        self._logger: threading.Thread | None = None
+
+    def reset(self, log_interval: float | None) -> None:
+        self.stop()
+        with self._lock:
+            self.log_interval = log_interval
+            self._resources.clear()
+            self._published.clear()
+            self._started_at = time.monotonic()
+            self._start_logger()
+
+    def stop(self) -> None:
+        """
+        Stops logging the progress
+        """
+        with self._lock:
+            (logger_thread, self._logger) = (self._logger, None)
+            self._stopped.set()
+        if (
+            logger_thread is not None
+            and logger_thread is not threading.current_thread()
+        ):
+            logger_thread.join()
+
+    def _start_logger(self) -> None:
+        if self.log_interval is None or self._logger is not None:
+            return
+        self._stopped = threading.Event()
+        self._logger = threading.Thread(
+            target=self._log_periodically,
+            args=(self._stopped, self.log_interval),
+            name="affinity-progress",
+            daemon=True,
+        )
+        self._logger.start()
+
+    def _log_periodically(self, stopped: threading.Event, interval: float) -> None:
+        while not stopped.wait(interval):
+            with self._lock:
+                if stopped.is_set():
+                    return
+                if self._resources and self._published >= self._resources.keys():
+                    self._logger = None
+                    return
+                self._log(time.monotonic())
+
+    def _get(self, resource: str) -> ResourceProgress:
+        if resource not in self._resources:
+            self._resources[resource] = ResourceProgress(started_at=self._started_at)
+        return self._resources[resource]
+
+    def set_total(self, resource: str, total: int) -> None:
+        with self._lock:
+            progress = self._get(resource)
+            progress.total = total
+            progress.estimated = False
+
+    def add_total(self, resource: str, rows: int) -> None:
+        """
+        Adds enumerated IDs to the estimated total of a resource
+        """
+        with self._lock:
+            progress = self._get(resource)
+            progress.total = (progress.total or 0) + rows
+
+    def complete_total(self, resource: str) -> None:
+        """
+        Marks the total of a resource as final, taking the fetched rows if there is no total
+        """
+        with self._lock:
+            progress = self._get(resource)
+            if progress.total is None:
+                progress.total = progress.rows
+            progress.estimated = False
+
+    def update(self, resource: str, rows: int, pages: int = 1) -> None:
+        now = time.monotonic()
+        with self._lock:
+            progress = self._get(resource)
+            progress.rows += rows
+            progress.pages += pages
+            progress.updated_at = now
+            self._published.discard(resource)
+            self._collect(resource, progress, rows)
+            self._start_logger()
+
+    def _collect(self, resource: str, progress: ResourceProgress, rows: int) -> None:
+        context = Container()[PipelineContext]
+        if not context.is_active():
+            # not running in a pipeline
+            return
+        collector = context.pipeline().collector
+        name = f"{resource} (fetched)"
+        if not progress.collected:
+            collector.update(name, inc=rows, total=progress.total)
+            progress.collected = True
+            progress.collected_total = progress.total
+        elif progress.collected_total is not None and progress.total is not None:
+            inc_total = progress.total - progress.collected_total
+            collector.update(name, inc=rows, inc_total=inc_total or None)
+            progress.collected_total = progress.total
+        else:
+            collector.update(name, inc=rows)
+
+    def _log(self, now: float) -> None:
+        for resource, progress in sorted(self._resources.items()):
+            if not progress.done:
+                logger.info(f"{resource}: {progress.describe(now, self.log_interval)}")
+
+    def by_resource(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                resource: progress.as_dict()
+                for resource, progress in sorted(self._resources.items())
+            }
+
+    def publish(self, resource: str) -> None:
+        """
+        Attaches the progress of a resource to its custom metrics in the pipeline trace.
+        Must be called from within the resource.
+        """
+        with self._lock:
+            summary = self._get(resource).as_dict()
+            self._published.add(resource)
+        dlt.current.resource_metrics()["progress"] = summary
@@ -0,0 +1,138 @@
+"""Field projection, only requesting the selected fields of companies, persons and list entries"""
+
+import logging
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Sequence
+
+from dlt.sources.helpers.rest_client.client import RESTClient
+
+from .model.v2 import EnrichmentSource, FieldMetadata, Type3
+from .rest_client import MAX_PAGE_LIMIT_V2, hooks
+from .type_adapters import field_metadata_adapter
+
+ENTITY_FIELD_TYPES = [
+    Type3.ENRICHED.value,
+    Type3.GLOBAL_.value,
+    Type3.RELATIONSHIP_INTELLIGENCE.value,
+]
+"""
+The field types fetched with companies and persons by default
+"""
+LIST_ENTRY_FIELD_TYPES = [*ENTITY_FIELD_TYPES, Type3.LIST.value]
+"""
+The field types fetched with list entries by default
+"""
+
+logger = logging.getLogger("dlt")
+
+
+class FieldSelection(NamedTuple):
+    """
+    Selects the fields fetched with companies, persons or the entries of a list. Fields selected by
+    ID, name or enrichment source are requested as `fieldIds`, in addition to all fields of the
+    given `field_types`, so the API only returns (and we only validate and flatten) those.
+    """
+
+    field_types: Sequence[str] | None = None
+    """
+    The types of which all fields are fetched, e.g. `["global", "list"]`. Defaults to all types,
+    unless fields are selected by ID, name or enrichment source.
+    """
+    field_ids: Sequence[str] = ()
+    """
+    The IDs of the fields to fetch, e.g. `["field-1234", "affinity-data-location"]`
+    """
+    field_names: Sequence[str] = ()
+    """
+    The names of the fields to fetch, resolved to their IDs via the fields metadata
+    """
+    enrichment_sources: Sequence[str] = ()
+    """
+    Fetch all enriched fields of these sources, e.g. `["dealroom"]`, resolved via the fields metadata
+    """
+
+    def validate(self) -> None:
+        types = {t.value for t in Type3}
+        sources = {s.value for s in EnrichmentSource if s.value is not None}
+        unknown = [t for t in self.field_types or [] if t not in types]
+        unknown += [s for s in self.enrichment_sources if s not in sources]
+        if unknown:
+            raise ValueError(f"Unknown field types or enrichment sources: {unknown}")
+
+    @property
+    def needs_metadata(self) -> bool:
+        return bool(self.field_names or self.enrichment_sources)
+
+    def params(
+        self,
+        default_types: List[str],
+        metadata: Iterable[FieldMetadata] = (),
+    ) -> Dict[str, List[str]]:
+        """
+        Returns the `fieldIds` and `fieldTypes` query parameters of this selection, resolving the
+        field names and enrichment sources with the given fields metadata
+        """
+        field_ids = list(self.field_ids)
+        if self.needs_metadata:
+            metadata = list(metadata)
+            names = set(self.field_names)
+            sources = set(self.enrichment_sources)
+            field_ids += [
+                f.id
+                for f in metadata
+                if f.name in names
+                or (
+                    f.enrichmentSource is not None
+                    and f.enrichmentSource.value in sources
+                )
+            ]
+            missing = names - {f.name for f in metadata}
+            if missing:
+                raise ValueError(f"Unknown fields {sorted(missing)}")
+        field_types = self.field_types
+        if field_types is None:
+            field_types = [] if field_ids else default_types
+        params: Dict[str, List[str]] = {}
+        if field_ids:
+            params["fieldIds"] = list(dict.fromkeys(field_ids))
+        if field_types:
+            params["fieldTypes"] = list(field_types)
+        return params
+
+
+class FieldProjection:
+    """
+    Resolves the query parameters of the selected fields of a resource once per run, fetching
+    the fields metadata from `metadata_path` (e.g. `companies/fields`) if needed
+    """
+
+    def __init__(
+        self,
+        selection: FieldSelection | None,
+        default_types: List[str],
+        metadata_path: str,
+    ):
+        self.selection = selection or FieldSelection()
+        self.default_types = default_types
+        self.metadata_path = metadata_path
+        self._params: Dict[str, List[str]] | None = None
+        self._lock = threading.Lock()
+
+    def params(self, rest_client: RESTClient) -> Dict[str, List[str]]:
+        with self._lock:
+            if self._params is None:
+                metadata: List[FieldMetadata] = []
+                if self.selection.needs_metadata:
+                    for page in rest_client.paginate(
+                        self.metadata_path,
+                        params={"limit": MAX_PAGE_LIMIT_V2},
+                        hooks=hooks,
+                    ):
+                        metadata.extend(field_metadata_adapter.validate_python(page))
+                try:
+                    self._params = self.selection.params(self.default_types, metadata)
+                except ValueError as e:
+                    raise ValueError(f"{self.metadata_path}: {e}") from e
+                if self.selection != FieldSelection():
+                    logger.info(f"{self.metadata_path}: projected to {self._params}")
+            return self._params
@@ -0,0 +1,192 @@
+"""Rate limit coordination between processes sharing an API key, via a file locked token bucket"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from hashlib import blake2b
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+import dlt
+from dlt.sources.helpers.rest_client.client import Response
+
+from .metrics import RATE_LIMITED, HttpMetrics
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_file(fd: int) -> None:
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(fd: int) -> None:
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock_file(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock_file(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+USER_RATE_LIMIT_PER_MINUTE = 900
+"""
+Requests per user and minute, until the rate limit headers tell otherwise, see
+https://developer.affinity.co/#section/Getting-Started/Rate-Limits
+"""
+BURST = 10
+"""
+Number of requests that can be sent at once after being idle
+"""
+LIMIT_HEADER = "X-Ratelimit-Limit-User"
+REMAINING_HEADER = "X-Ratelimit-Limit-User-Remaining"
+RESET_HEADER = "X-Ratelimit-Limit-User-Reset"
+RETRY_AFTER_HEADER = "Retry-After"
+
+
+def _refill(state: Dict[str, Any], now: float) -> Tuple[float, float]:
+    """
+    Returns the rate (per second) and the tokens of the bucket, refilled since it was last updated
+    """
+    rate = state.get("limit", USER_RATE_LIMIT_PER_MINUTE) / 60
+    tokens = min(
+        BURST,
+        state.get("tokens", BURST) + (now - state.get("updated_at", now)) * rate,
+    )
+    return (rate, tokens)
+
+
+class RateLimitCoordinator:
+    """
+    A token bucket shared by all processes using the same API key, kept in a locked file.
+    The bucket refills at the per user rate limit; the rate limit headers of every response
+    correct the rate, the remaining requests and the reset of the current window, so
+    processes that started later (or requests sent elsewhere) are accounted for.
+    """
+
+    def __init__(self):
+        self.path: str | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def start(self, directory: str | None, api_key: str | None = None) -> None:
+        if directory is None:
+            self.path = None
+            return
+        if api_key is None:
+            api_key = dlt.secrets["affinity_api_key"]
+        os.makedirs(directory, exist_ok=True)
+        # never write the key itself
+        key = blake2b(api_key.encode(), digest_size=8).hexdigest()
+        self.path = os.path.join(directory, f"affinity-rate-limit-{key}.json")
+
+    @contextmanager
+    def _state(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the state of the bucket, holding the file lock, and writes it back afterwards
+        """
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            with self._lock:
+                _lock_file(fd)
+                try:
+                    raw = os.read(fd, 4096)
+                    state: Dict[str, Any] = json.loads(raw) if raw else {}
+                    yield state
+                    data = json.dumps(state).encode()
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    os.ftruncate(fd, 0)
+                    os.write(fd, data)
+                finally:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    _unlock_file(fd)
+        finally:
+            os.close(fd)
+
+    def acquire(self) -> float:
+        """
+        Waits until a request may be sent, returning the seconds waited
+        """
+        waited = 0.0
+        while True:
+            with self._state() as state:
+                now = time.time()
+                (rate, tokens) = _refill(state, now)
+                state["updated_at"] = now
+                reset_at = state.get("reset_at")
+                if reset_at is not None and reset_at <= now:
+                    # a new window started, the remaining requests are unknown again
+                    state.pop("remaining", None)
+                    state.pop("reset_at", None)
+                    reset_at = None
+                remaining = state.get("remaining")
+                if remaining is not None and remaining < 1:
+                    wait = reset_at - now
+                elif tokens >= 1:
+                    state["tokens"] = tokens - 1
+                    if remaining is not None:
+                        state["remaining"] = remaining - 1
+                    return waited
+                else:
+                    wait = (1 - tokens) / rate
+                state["tokens"] = tokens
+            time.sleep(wait)
+            waited += wait
+
+    def headroom(self) -> float:
+        """
+        Returns the number of requests that may be sent right away, without taking any of them
+        """
+        with self._state() as state:
+            now = time.time()
+            (_, tokens) = _refill(state, now)
+            reset_at = state.get("reset_at")
+            if reset_at is None or reset_at <= now:
+                return tokens
+            return min(tokens, state.get("remaining", tokens))
+
+    def observe(self, response: Response) -> None:
+        """
+        Corrects the bucket with the rate limit headers of a response
+        """
+        headers = response.headers
+        with self._state() as state:
+            now = time.time()
+            if LIMIT_HEADER in headers:
+                state["limit"] = int(headers[LIMIT_HEADER])
+            if REMAINING_HEADER in headers and RESET_HEADER in headers:
+                state["remaining"] = int(headers[REMAINING_HEADER])
+                state["reset_at"] = now + int(headers[RESET_HEADER])
+            if response.status_code == RATE_LIMITED:
+                retry_after = headers.get(RETRY_AFTER_HEADER, "")
+                state["remaining"] = 0
+                state["reset_at"] = max(
+                    state.get("reset_at", now),
+                    now + (int(retry_after) if retry_after.isdigit() else 1),
+                )
+
+    def send(
+        self,
+        send: Callable[..., Response],
+        request: Any,
+        http_metrics: HttpMetrics,
+        **kwargs: Any,
+    ) -> Response:
+        """
+        Sends an attempt of a request of a session (as sent by its adapters, so retries are
+        attempts of their own), consulting the bucket before and recording the time waited for it
+        """
+        if not self.enabled:
+            return send(request, **kwargs)
+        waited = self.acquire()
+        if waited > 0:
+            http_metrics.record_wait(request.url, waited, rate_limited=True)
+        response = send(request, **kwargs)
+        self.observe(response)
+        return response
@@ -0,0 +1,166 @@
+"""Refresh cadence per field type, completing rows with the cached columns of the field types that are not due"""
+
+import logging
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+import dlt
+from dlt.common.json import json
+
+FIELD_CACHE_FILE = "affinity_field_cache.sqlite"
+FIELD_REFRESH_STATE_KEY = "field_refresh"
+
+FieldColumns = Dict[str, Dict[str, Any]]
+"""
+The flattened field columns of a row, grouped by the type of their fields
+"""
+
+logger = logging.getLogger("dlt")
+
+
+class FieldRefresh:
+    """
+    Only fetches the field types whose refresh interval elapsed since they were last fetched, e.g.
+    enriched fields weekly, and completes the rows with the columns of the other field types as
+    they were last fetched. Field types without an interval are fetched every run.
+
+    The last refresh of every field type and table is kept in the source state, so a failed run
+    refreshes them again. The columns are kept per row and field type in a SQLite database under
+    the pipeline working dir. Rows that are not in there yet, e.g. because they were created since
+    the last refresh, have to be fetched with all their field types.
+    """
+
+    def __init__(self, intervals: Dict[str, timedelta], path: str | None = None):
+        self.intervals = intervals
+        self.path = path
+        self.now = datetime.now(timezone.utc)
+        self._due: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = {}
+        self._connection: sqlite3.Connection | None = None
+
+    def open(self, state: Dict[str, Any], working_dir: str) -> None:
+        self._state = state
+        connection = sqlite3.connect(
+            self.path or os.path.join(working_dir, FIELD_CACHE_FILE),
+            check_same_thread=False,
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS field_columns ("
+            "tbl TEXT NOT NULL, id INTEGER NOT NULL, field_type TEXT NOT NULL, columns BLOB NOT NULL,"
+            " PRIMARY KEY (tbl, id, field_type)) WITHOUT ROWID"
+        )
+        self._connection = connection
+
+    def _ensure_open(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.open(
+                dlt.current.source_state().setdefault(FIELD_REFRESH_STATE_KEY, {}),
+                dlt.current.pipeline().working_dir,
+            )
+        return self._connection
+
+    def due(self, table: str, field_types: List[str]) -> List[str]:
+        """
+        Returns the field types of a table to fetch in this run, recording their refresh.
+        Must be called from within a resource.
+        """
+        with self._lock:
+            if table not in self._due:
+                self._ensure_open()
+                state = self._state.setdefault(table, {})
+                due = []
+                for field_type in field_types:
+                    interval = self.intervals.get(field_type)
+                    refreshed = state.get(field_type)
+                    if (
+                        interval is None
+                        or refreshed is None
+                        or datetime.fromisoformat(refreshed) + interval <= self.now
+                    ):
+                        due.append(field_type)
+                        state[field_type] = self.now.isoformat()
+                carried = [t for t in field_types if t not in due]
+                if carried:
+                    logger.info(f"{table}: fetching {due}, carrying {carried}")
+                self._due[table] = due
+            return self._due[table]
+
+    def project(self, table: str, params: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """
+        Narrows the `fieldTypes` query parameter (see `FieldSelection.params`) down to the due ones
+        """
+        if "fieldTypes" not in params:
+            return params
+        projected = {k: v for k, v in params.items() if k != "fieldTypes"}
+        due = self.due(table, params["fieldTypes"])
+        if due:
+            projected["fieldTypes"] = due
+        return projected
+
+    def carried(self, table: str, params: Dict[str, List[str]]) -> List[str]:
+        """
+        Returns the field types of a table that are carried from the cache in this run
+        """
+        field_types = params.get("fieldTypes", [])
+        return [t for t in field_types if t not in self.due(table, field_types)]
+
+    def complete(
+        self, table: str, rows: Dict[int, FieldColumns], carried: List[str]
+    ) -> Tuple[Dict[int, Dict[str, Any]], Dict[int, List[str]]]:
+        """
+        Stores the fetched columns of the rows and returns the cached columns of the `carried`
+        field types per row, and the ones that are not cached per row
+        """
+        columns: Dict[int, Dict[str, Any]] = {row_id: {} for row_id in rows}
+        missing: Dict[int, List[str]] = {}
+        if not rows:
+            return (columns, missing)
+        with self._lock:
+            connection = self._ensure_open()
+            self._store(connection, table, rows)
+            if carried:
+                ids = list(rows)
+                cached: Dict[int, FieldColumns] = defaultdict(dict)
+                for row_id, field_type, blob in connection.execute(
+                    "SELECT id, field_type, columns FROM field_columns WHERE tbl = ? AND id IN ("
+                    + ",".join("?" * len(ids))
+                    + ") AND field_type IN ("
+                    + ",".join("?" * len(carried))
+                    + ")",
+                    [table, *ids, *carried],
+                ):
+                    cached[row_id][field_type] = json.loadb(blob)
+                for row_id in ids:
+                    for field_type in carried:
+                        if field_type in cached[row_id]:
+                            columns[row_id] |= cached[row_id][field_type]
+                        else:
+                            missing.setdefault(row_id, []).append(field_type)
+            connection.commit()
+        return (columns, missing)
+
+    def store(self, table: str, rows: Dict[int, FieldColumns]) -> None:
+        """
+        Stores the columns of rows fetched with the field types they were missing
+        """
+        with self._lock:
+            connection = self._ensure_open()
+            self._store(connection, table, rows)
+            connection.commit()
+
+    def _store(
+        self, connection: sqlite3.Connection, table: str, rows: Dict[int, FieldColumns]
+    ) -> None:
+        connection.executemany(
+            "INSERT OR REPLACE INTO field_columns (tbl, id, field_type, columns) VALUES (?, ?, ?, ?)",
+            [
+                (table, row_id, field_type, json.dumpb(group))
+                for row_id, groups in rows.items()
+                for field_type, group in groups.items()
+            ],
+        )
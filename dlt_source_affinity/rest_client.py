@@ -1,8 +1,10 @@
 import json
 import logging
+import threading
 from typing import Any
 
 import dlt
+from dlt.sources.helpers.requests.retry import Client
 from dlt.sources.helpers.requests.session import Session
 from dlt.sources.helpers.rest_client.auth import BearerTokenAuth, HttpBasicAuth
 from dlt.sources.helpers.rest_client.client import Response, RESTClient
@@ -12,28 +14,39 @@ from dlt.sources.helpers.rest_client.paginators import (
 )
 
 from .model.v2 import ValueType
+from .run import instrument, record_response
 from .settings import API_BASE, V2_PREFIX
 from .type_adapters import error_adapter
 
 # Share a session (and thus pool) between all rest clients
 session: Session = None
+session_lock = threading.Lock()
 logger = logging.getLogger("dlt")
 
 
+def get_session() -> Session:
+    """
+    Returns the shared session, instrumenting it when it's created
+    """
+    global session
+    with session_lock:
+        if session is None:
+            session = Client(raise_for_status=False).session
+            instrument(session)
+    return session
+
+
 def get_v2_rest_client(
     api_key: str = dlt.secrets["affinity_api_key"],
     api_base: str = API_BASE,
 ):
-    global session
     client = RESTClient(
         base_url=f"{api_base}{V2_PREFIX}",
         auth=BearerTokenAuth(api_key),
         data_selector="data",
         paginator=JSONLinkPaginator("pagination.nextUrl"),
-        session=session,
+        session=get_session(),
     )
-    if not session:
-        session = client.session
     return client
 
 
@@ -41,17 +54,14 @@ def get_v1_rest_client(
     api_key: str = dlt.secrets["affinity_api_key"],
     api_base: str = API_BASE,
 ):
-    global session
     client = RESTClient(
         base_url=api_base,
         auth=HttpBasicAuth("", api_key),
         paginator=JSONResponseCursorPaginator(
             cursor_path="next_page_token", cursor_param="page_token"
         ),
-        session=session,
+        session=get_session(),
     )
-    if not session:
-        session = client.session
     return client
 
 
@@ -124,6 +134,8 @@ def remove_unknown_fields(response: Response, *args: Any, **kwargs: Any) -> None
 hooks = {
     "response": [
         # print_response,
+        # Record before raising, so failed requests are counted as well
+        record_response,
         raise_if_error,
         # Workaround for https://github.com/planet-a-ventures/dlt-source-affinity/issues/11
         # remove_unknown_fields,
@@ -0,0 +1,143 @@
+"""The state of a run of the source: its HTTP metrics, profiles, timeline, progress, rate limit and process pool"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial, wraps
+from typing import Any, Callable, Generator, Iterator, TypeVar
+
+from dlt.sources.helpers.requests.session import Session
+from dlt.sources.helpers.rest_client.client import Response
+
+from .metrics import HttpMetrics, http_metrics
+from .offload import ProcessPool
+from .profiling import ResourceProfiler, TransformProfile
+from .progress import Progress
+from .ratelimit import RateLimitCoordinator
+from .tracing import Timeline
+
+R = TypeVar("R")
+
+
+class Run:
+    """
+    The objects that collect or coordinate across the resources of a source, created with the
+    source and passed into its resources. The resources make their run current while they run
+    (see `resource`), so the shared session and helpers deep down (see `current_run`) use the run
+    of the resource they are called from, and runs of several sources don't mix.
+    """
+
+    def __init__(
+        self,
+        profile_transforms: bool = False,
+        profile_dir: str | None = None,
+        trace_file: str | None = None,
+        progress_interval: float | None = None,
+        rate_limit_dir: str | None = None,
+        process_workers: int | None = None,
+    ):
+        self.http_metrics = HttpMetrics(totals=http_metrics)
+        self.transform_profile = TransformProfile()
+        self.transform_profile.reset(profile_transforms)
+        self.resource_profiler = ResourceProfiler()
+        self.resource_profiler.start(profile_dir)
+        self.timeline = Timeline()
+        self.timeline.start(trace_file)
+        self.progress = Progress()
+        self.progress.reset(progress_interval)
+        self.rate_limiter = RateLimitCoordinator()
+        self.rate_limiter.start(rate_limit_dir)
+        self.process_pool = ProcessPool(process_workers)
+
+    @contextmanager
+    def active(self) -> Iterator[None]:
+        """
+        Makes the run the current one within the block
+        """
+        token = _current_run.set(self)
+        try:
+            yield
+        finally:
+            _current_run.reset(token)
+
+    def activate(self, gen: Generator[Any, None, R]) -> Generator[Any, None, R]:
+        """
+        Steps a generator with the run as the current one
+        """
+        while True:
+            with self.active():
+                try:
+                    item = next(gen)
+                except StopIteration as e:
+                    return e.value
+            try:
+                yield item
+            except GeneratorExit:
+                with self.active():
+                    gen.close()
+                raise
+
+    def resource(
+        self, name: str
+    ) -> Callable[[Callable[..., Generator]], Callable[..., Generator]]:
+        """
+        Runs a resource or transformer generator function in the run, profiling it when the
+        resource profiler is enabled. Keeps the signature, so it can be used below the dlt decorators.
+        """
+
+        def decorator(f: Callable[..., Generator]) -> Callable[..., Generator]:
+            @wraps(f)
+            def wrapper(*args: Any, **kwargs: Any) -> Generator:
+                gen = f(*args, **kwargs)
+                if self.resource_profiler.enabled:
+                    gen = self.resource_profiler.profile(name, gen)
+                return (yield from self.activate(gen))
+
+            return wrapper
+
+        return decorator
+
+
+_idle_run = Run()
+"""
+The run of requests and helpers outside of any resource, e.g. of `plan`, with everything disabled
+"""
+_current_run: ContextVar[Run] = ContextVar("affinity_run", default=_idle_run)
+
+
+def current_run() -> Run:
+    """
+    Returns the run of the resource that is currently running in this thread (or context)
+    """
+    return _current_run.get()
+
+
+def instrument(session: Session) -> None:
+    """
+    Records the metrics and spans of every request of the shared session and consults the rate
+    limit before every attempt, all of the current run
+    """
+    send = session.send
+
+    def run_send(request: Any, **kwargs: Any) -> Response:
+        run = current_run()
+        return run.http_metrics.send(
+            partial(run.timeline.send, send), request, **kwargs
+        )
+
+    session.send = run_send
+    for adapter in set(session.adapters.values()):
+
+        def coordinated_send(
+            request: Any, send=adapter.send, **kwargs: Any
+        ) -> Response:
+            run = current_run()
+            return run.rate_limiter.send(send, request, run.http_metrics, **kwargs)
+
+        adapter.send = coordinated_send
+
+
+def record_response(response: Response, *args: Any, **kwargs: Any) -> None:
+    """
+    Response hook recording the response in the metrics of the current run
+    """
+    current_run().http_metrics.record_response(response)
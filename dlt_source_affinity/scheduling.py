@@ -0,0 +1,164 @@
+"""Size-aware scheduling of the list entry resources, so the largest lists don't start last"""
+
+import logging
+import threading
+import time
+from typing import Dict, Iterator, List, Sequence, Set
+
+import dlt
+from dlt.sources.helpers.requests import HTTPError
+from dlt.sources.helpers.rest_client.client import RESTClient
+
+from .helpers import ListReference
+from .model.v2 import ListModel, SavedView, Type7
+from .rest_client import MAX_PAGE_LIMIT_V2, get_v1_rest_client, hooks
+from .waiting import GATHER_SECONDS, WorkerBudget, gather_timeout, selected, wait_until
+
+LIST_SIZES_STATE_KEY = "list_sizes"
+
+logger = logging.getLogger("dlt")
+
+
+def discover_list_refs(
+    rest_client: RESTClient, saved_views: bool = True
+) -> List[ListReference]:
+    """
+    Returns references to all lists and (sheet type) saved views the API key has access to
+    """
+    list_refs = []
+    for page in rest_client.paginate(
+        "lists", params={"limit": MAX_PAGE_LIMIT_V2}, hooks=hooks
+    ):
+        for list_model in (ListModel.model_validate(item) for item in page):
+            list_refs.append(ListReference(list_model.id))
+            if not saved_views:
+                continue
+            for views in rest_client.paginate(
+                f"lists/{list_model.id}/saved-views",
+                params={"limit": MAX_PAGE_LIMIT_V2},
+                hooks=hooks,
+            ):
+                list_refs.extend(
+                    ListReference(list_model.id, view.id)
+                    for view in (SavedView.model_validate(item) for item in views)
+                    # the list entries of other views can't be fetched
+                    if view.type == Type7.SHEET
+                )
+    logger.info(f"Discovered {len(list_refs)} lists and saved views")
+    return list_refs
+
+
+class ListScheduler:
+    """
+    Lets at most `max_in_flight` list entry resources page at once and admits the largest waiting
+    list first, as the lists are paged sequentially and the largest one is the critical path of
+    a run. Lists are estimated by their number of entries in the last run (kept in the source
+    state), or else by the `list_size` of the v1 lists, which is also used for their saved views.
+
+    Waiting resources wait on a condition (see `wait_until`) that is notified when a list arrives
+    or is done. As dlt starts the resources in no particular order, no list is admitted before
+    all selected lists started, or `gather_seconds` passed in case one fails before starting.
+    """
+
+    def __init__(
+        self,
+        list_refs: Sequence[ListReference],
+        max_in_flight: int,
+        budget: WorkerBudget,
+        gather_seconds: float = GATHER_SECONDS,
+    ):
+        self.names = {f"lists-{ref}-entries": ref for ref in list_refs}
+        self.max_in_flight = max_in_flight
+        self.budget = budget
+        self.gather_seconds = gather_seconds
+        self.sizes: Dict[str, int] | None = None
+        self._state: Dict[str, int] = {}
+        self._expected: Set[str] = set(self.names)
+        self._arrived: Set[str] = set()
+        self._waiting: List[str] = []
+        self._in_flight: List[str] = []
+        self._first_arrival: float | None = None
+        self._condition = threading.Condition()
+        self._estimate_lock = threading.Lock()
+
+    def _estimate(self) -> Dict[str, int]:
+        state = dlt.current.source_state().setdefault(LIST_SIZES_STATE_KEY, {})
+        list_sizes: Dict[int, int] = {}
+        if any(name not in state for name in self.names):
+            try:
+                list_sizes = {
+                    item["id"]: item["list_size"]
+                    for item in get_v1_rest_client().get("lists", hooks=hooks).json()
+                }
+            except HTTPError as e:
+                logger.info(f"No list sizes available ({e})")
+        sizes = {
+            name: state.get(name, list_sizes.get(ref.list_id, 0))
+            for name, ref in self.names.items()
+        }
+        logger.info(
+            "Scheduling lists largest first: "
+            + ", ".join(
+                f"{name} (~{size})"
+                for name, size in sorted(sizes.items(), key=lambda item: -item[1])
+            )
+        )
+        with self._condition:
+            self._state = state
+        return sizes
+
+    def _gather_timeout(self) -> float | None:
+        return gather_timeout(
+            self._first_arrival, self._expected <= self._arrived, self.gather_seconds
+        )
+
+    def _next(self) -> str | None:
+        if len(self._in_flight) >= self.max_in_flight or not self._waiting:
+            return None
+        if self._gather_timeout() is not None:
+            return None
+        return max(self._waiting, key=lambda name: self.sizes.get(name, 0))
+
+    def _admitted(self, name: str) -> bool:
+        if self._next() != name:
+            return False
+        self._waiting.remove(name)
+        self._in_flight.append(name)
+        return True
+
+    def admit(self, name: str) -> Iterator[None]:
+        """
+        Waits for a list to be admitted. Must be iterated from within the resource.
+        """
+        expected = selected(self.names)
+        with self._condition:
+            if self._first_arrival is None:
+                self._first_arrival = time.monotonic()
+                self._expected = expected
+        # the sizes are estimated without holding the condition, so lists can be done meanwhile
+        with self._estimate_lock:
+            if self.sizes is None:
+                sizes = self._estimate()
+                with self._condition:
+                    self.sizes = sizes
+        with self._condition:
+            self._arrived.add(name)
+            self._waiting.append(name)
+            self._condition.notify_all()
+        yield from wait_until(
+            self._condition,
+            lambda: self._admitted(name),
+            self._gather_timeout,
+            self.budget,
+        )
+
+    def done(self, name: str, rows: int | None) -> None:
+        """
+        Frees the slot of a list, remembering its number of entries for the next run
+        """
+        with self._condition:
+            if name in self._in_flight:
+                self._in_flight.remove(name)
+            if rows is not None:
+                self._state[name] = rows
+            self._condition.notify_all()
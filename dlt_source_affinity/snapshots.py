@@ -0,0 +1,107 @@
+"""Snapshots of enumerated entity IDs, used to detect entities that were deleted since the last run"""
+
+import os
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List
+
+import dlt
+from dlt.common.schema.typing import TTableSchemaColumns
+
+from .helpers import begin_generation
+
+ID_SNAPSHOTS_DIR = "affinity_id_snapshots"
+ID_SNAPSHOTS_STATE_KEY = "id_snapshots"
+DELETED_COLUMN = "_deleted"
+DELETED_COLUMN_HINTS: TTableSchemaColumns = {
+    DELETED_COLUMN: {"data_type": "bool", "hard_delete": True, "nullable": True}
+}
+
+
+class DeletedIds(List[int]):
+    """
+    A chunk of IDs that disappeared since the last run, passed from an ID resource to its transformer
+    """
+
+
+def diff_sorted(previous: Iterable[int], current: Iterable[int]) -> List[int]:
+    """
+    Returns the IDs in `previous` that are not in `current`, both need to be sorted
+    """
+    current_iter = iter(current)
+    missing = []
+    head = next(current_iter, None)
+    for entity_id in previous:
+        while head is not None and head < entity_id:
+            head = next(current_iter, None)
+        if head != entity_id:
+            missing.append(entity_id)
+    return missing
+
+
+class IdSnapshots:
+    """
+    Keeps the IDs enumerated per table as sorted int64 arrays in the pipeline working dir.
+
+    Like the fingerprint index, snapshots are versioned by a run generation that is kept in the
+    source state, so we always diff against the snapshot of the last run that made it to the destination.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._committed_generation: int | None = None
+        self._generation = 1
+
+    def open(self, state: Dict[str, Any], working_dir: str) -> None:
+        (self._committed_generation, self._generation) = begin_generation(state)
+        self.path = self.path or os.path.join(working_dir, ID_SNAPSHOTS_DIR)
+        os.makedirs(self.path, exist_ok=True)
+
+    def _ensure_open(self) -> None:
+        if self._committed_generation is None:
+            self.open(
+                dlt.current.source_state().setdefault(ID_SNAPSHOTS_STATE_KEY, {}),
+                dlt.current.pipeline().working_dir,
+            )
+
+    def _file(self, table: str, generation: int) -> str:
+        return os.path.join(self.path, f"{table}.{generation}.ids")
+
+    def diff(self, table: str, ids: Iterable[int]) -> List[int]:
+        """
+        Stores the complete set of IDs of the current run and returns the ones missing since the last committed run
+        """
+        current = array("q", sorted(set(ids)))
+        with self._lock:
+            self._ensure_open()
+            with open(self._file(table, self._generation), "wb") as f:
+                current.tofile(f)
+            previous = array("q")
+            previous_file = self._file(table, self._committed_generation)
+            if os.path.exists(previous_file):
+                with open(previous_file, "rb") as f:
+                    previous.frombytes(f.read())
+            # clean up snapshots that can never be diffed against again
+            for file in os.listdir(self.path):
+                (file_table, generation, _) = file.rsplit(".", 2)
+                if file_table == table and int(generation) < self._committed_generation:
+                    os.remove(os.path.join(self.path, file))
+        return diff_sorted(previous, current)
+
+
+def deletable_columns(columns: TTableSchemaColumns) -> TTableSchemaColumns:
+    """
+    Deletion markers only carry the ID, so every other column needs to be nullable
+    """
+    return {
+        name: column | {"nullable": column.get("nullable", True) or name != "id"}
+        for name, column in columns.items()
+    } | DELETED_COLUMN_HINTS
+
+
+def deletion_markers(ids: Iterable[int]) -> List[Dict[str, Any]]:
+    return [
+        {"id": entity_id, "_dlt_id": entity_id, DELETED_COLUMN: True}
+        for entity_id in ids
+    ]
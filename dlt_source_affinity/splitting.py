@@ -0,0 +1,234 @@
+"""Split of company and person detail requests by field type, so slow field types don't hold up the others"""
+
+import contextvars
+import statistics
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Sequence
+
+import dlt
+from dlt.common.json import json
+from dlt.sources.helpers.rest_client.client import Response
+
+from .concurrency import INITIAL_CONCURRENCY, RequestThreads
+from .rest_client import MAX_PAGE_LIMIT_V2, get_v2_rest_client, hooks
+
+DEFAULT_GROUPS = [["relationship-intelligence"]]
+"""
+Relationship intelligence fields are by far the slowest to serve
+"""
+
+FieldParams = Dict[str, List[str]]
+"""
+The `fieldIds` and `fieldTypes` query parameters of a request, see `FieldSelection.params`
+"""
+
+
+def merge_pages(pages: List[bytes]) -> bytes:
+    """
+    Merges pages of the same entities, fetched with different field types, by concatenating the
+    `fields` of every entity in the order of the first page
+    """
+    merged = json.loadb(pages[0])
+    entities = {entity["id"]: entity for entity in merged["data"]}
+    for page in pages[1:]:
+        for entity in json.loadb(page)["data"]:
+            target = entities.get(entity["id"])
+            if target is None:
+                merged["data"].append(entity)
+                entities[entity["id"]] = entity
+            elif entity.get("fields"):
+                target["fields"] = (target.get("fields") or []) + entity["fields"]
+    return json.dumpb(merged)
+
+
+class FieldTypeSplit:
+    """
+    Sends one detail request per group of field types concurrently and merges the `fields` of the
+    entities by their ID before they are validated. Field types in none of the groups are requested
+    together, and field IDs with the first request.
+    """
+
+    def __init__(
+        self,
+        groups: Sequence[Sequence[str]] = DEFAULT_GROUPS,
+        workers: int = INITIAL_CONCURRENCY,
+    ):
+        self.groups = [list(group) for group in groups]
+        self.requests: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.seconds: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        self.merge_seconds: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+        # the requests of every group (and the others) per extract worker
+        self._threads = RequestThreads(
+            workers * (len(self.groups) + 1), "affinity-split"
+        )
+
+    def split(self, params: FieldParams) -> List[FieldParams]:
+        """
+        Splits the query parameters of a detail request into the ones of the requests per group
+        """
+        field_types = params.get("fieldTypes", [])
+        remaining = [
+            t for t in field_types if not any(t in group for group in self.groups)
+        ]
+        split = [
+            {"fieldTypes": selected}
+            for group in (remaining, *self.groups)
+            if (selected := [t for t in field_types if t in group])
+        ]
+        if len(split) <= 1:
+            return [params]
+        split[0] = {k: v for k, v in params.items() if k != "fieldTypes"} | split[0]
+        return split
+
+    def _submit(
+        self,
+        endpoint: str,
+        send: Callable[[FieldParams], Response],
+        params: FieldParams,
+    ) -> Future:
+        # keep the context, so requests are attributed to the current resource
+        context = contextvars.copy_context()
+        label = ",".join(params.get("fieldTypes", []))
+
+        def timed_send() -> Response:
+            started = time.perf_counter()
+            response = context.run(send, params)
+            with self._lock:
+                self.requests[endpoint][label] += 1
+                self.seconds[endpoint][label] += time.perf_counter() - started
+            return response
+
+        return self._threads.submit(timed_send)
+
+    def get(
+        self,
+        endpoint: str,
+        send: Callable[[FieldParams], Response],
+        params: FieldParams,
+    ) -> bytes:
+        """
+        Sends a detail request as one request per group of field types, returning the merged page
+        """
+        split = self.split(params)
+        if len(split) == 1:
+            return send(params).content
+        futures = [self._submit(endpoint, send, p) for p in split]
+        pages = [future.result().content for future in futures]
+        started = time.perf_counter()
+        merged = merge_pages(pages)
+        with self._lock:
+            self.merge_seconds[endpoint] += time.perf_counter() - started
+        return merged
+
+    def publish(self, endpoint: str) -> None:
+        """
+        Attaches the number and mean latency of the requests per group of an endpoint to the
+        custom metrics of the current resource
+        """
+        with self._lock:
+            dlt.current.resource_metrics()["field_type_split"] = {
+                "groups": {
+                    label: {
+                        "requests": requests,
+                        "mean_seconds": round(
+                            self.seconds[endpoint][label] / requests, 4
+                        ),
+                    }
+                    for label, requests in self.requests[endpoint].items()
+                },
+                "merge_seconds": round(self.merge_seconds[endpoint], 4),
+            }
+
+
+@dataclass
+class SplitBenchmark:
+    entity: str
+    ids: int
+    """
+    Number of IDs per request
+    """
+    combined_seconds: List[float] = field(default_factory=list)
+    """
+    Latencies of a single request with all field types
+    """
+    split_seconds: List[float] = field(default_factory=list)
+    """
+    Latencies of the concurrent requests per group, until the last one returned and the pages were merged
+    """
+    group_seconds: Dict[str, List[float]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+
+    def summary(self) -> str:
+        def stats(seconds: List[float]) -> str:
+            return (
+                f"median {statistics.median(seconds) * 1000:.0f} ms, "
+                f"max {max(seconds) * 1000:.0f} ms"
+            )
+
+        lines = [
+            f"{self.entity} details of {self.ids} IDs:",
+            f"  combined: {stats(self.combined_seconds)}",
+            f"  split: {stats(self.split_seconds)}",
+        ]
+        for label, seconds in self.group_seconds.items():
+            lines.append(f"    {label}: {stats(seconds)}")
+        return "\n".join(lines)
+
+
+def benchmark_split(
+    entity: str = "companies",
+    groups: Sequence[Sequence[str]] = DEFAULT_GROUPS,
+    field_types: Sequence[str] = (
+        "enriched",
+        "global",
+        "relationship-intelligence",
+    ),
+    samples: int = 5,
+) -> SplitBenchmark:
+    """
+    Compares the latency of fetching the details of the first page of `entity` IDs with a single
+    request to fetching them with one concurrent request per group of field types. Takes
+    `samples * (2 + len(groups))` requests.
+    """
+    rest_client = get_v2_rest_client()
+    ids = [
+        entity["id"]
+        for entity in rest_client.get(
+            entity, params={"limit": MAX_PAGE_LIMIT_V2}, hooks=hooks
+        ).json()["data"]
+    ]
+    split = FieldTypeSplit(groups)
+    benchmark = SplitBenchmark(entity, len(ids))
+
+    def send(params: FieldParams) -> Response:
+        started = time.perf_counter()
+        response = rest_client.get(
+            entity,
+            params={"limit": len(ids), "ids": ids, **params},
+            hooks=hooks,
+        )
+        response.raise_for_status()
+        benchmark.group_seconds[",".join(params["fieldTypes"])].append(
+            time.perf_counter() - started
+        )
+        return response
+
+    params = {"fieldTypes": list(field_types)}
+    for _ in range(samples):
+        started = time.perf_counter()
+        send(params)
+        benchmark.combined_seconds.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        split.get(entity, send, params)
+        benchmark.split_seconds.append(time.perf_counter() - started)
+    # the combined requests are reported separately
+    benchmark.group_seconds.pop(",".join(field_types), None)
+    return benchmark
@@ -0,0 +1,30 @@
+import dlt
+import pytest
+
+from .. import rest_client
+from .fake_api import FakeAffinity
+
+
+@pytest.fixture
+def fake_api(monkeypatch) -> FakeAffinity:
+    """
+    Serves a fake Affinity API and points the REST clients at it
+    """
+    api = FakeAffinity().start()
+    for get_rest_client in (
+        rest_client.get_v1_rest_client,
+        rest_client.get_v2_rest_client,
+    ):
+        monkeypatch.setattr(get_rest_client, "__defaults__", ("test", api.base))
+    yield api
+    api.stop()
+
+
+@pytest.fixture
+def pipeline(tmp_path) -> dlt.Pipeline:
+    return dlt.pipeline(
+        pipeline_name="affinity_test",
+        destination=dlt.destinations.duckdb(str(tmp_path / "affinity.duckdb")),
+        pipelines_dir=str(tmp_path / "pipelines"),
+        dataset_name="affinity_data",
+    )
@@ -0,0 +1,339 @@
+"""A small in-process fake of the Affinity v1 and v2 APIs, to run pipelines end to end in tests"""
+
+import json
+import re
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Set, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import dlt
+
+CREATED_AT = "2024-01-01T00:00:00Z"
+FIELD_METADATA = [
+    ("field-1", "Stage", "global", None, "text"),
+    ("affinity-data-description", "Description", "enriched", "affinity-data", "text"),
+    ("last-contact", "Last contact", "relationship-intelligence", None, "datetime"),
+]
+LIST_FIELD = ("field-100", "Score", "list", None, "number")
+
+
+def field(
+    field_id: str, name: str, field_type: str, source: str | None, value_type: str, data
+):
+    return {
+        "id": field_id,
+        "name": name,
+        "type": field_type,
+        "enrichmentSource": source,
+        "value": {"type": value_type, "data": data},
+    }
+
+
+class FakeAffinity:
+    """
+    Serves companies, persons, opportunities, two lists (of companies and of persons) with a saved
+    view, notes, fields metadata and field value changes. Requests are counted per path, with IDs
+    replaced by `{id}`.
+    """
+
+    def __init__(self, companies: int = 30, persons: int = 20):
+        self.companies: Dict[int, Dict[str, Any]] = {
+            i: {"id": i, "name": f"Company {i}", "stage": f"stage {i % 3}"}
+            for i in range(1, companies + 1)
+        }
+        self.persons: Dict[int, Dict[str, Any]] = {
+            i: {"id": i, "firstName": f"Person {i}", "stage": f"stage {i % 2}"}
+            for i in range(1, persons + 1)
+        }
+        self.lists: Dict[int, Tuple[str, List[int]]] = {
+            1: ("company", list(range(1, 11))),
+            2: ("person", list(range(1, 6))),
+        }
+        self.views: Dict[int, Dict[int, Callable[[int], bool]]] = {
+            1: {11: lambda entity_id: entity_id % 2 == 0}
+        }
+        self.field_value_changes: Dict[int, List[Dict[str, Any]]] = {}
+        """
+        The v1 field value changes per field ID, served in the given order
+        """
+        self.tracked_fields = {"organization": [1], "person": [2], "opportunity": []}
+        self.forbidden_lists: Set[int] = set()
+        """
+        Lists whose entries the API key can't read
+        """
+        self.requests: Counter = Counter()
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def base(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> "FakeAffinity":
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                query = parse_qs(url.query)
+                api.requests[re.sub(r"/\d+", "/{id}", url.path)] += 1
+                (status, body) = api.handle(url.path, query, self.path)
+                content = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def fields(self, entity: Dict[str, Any], query: Dict[str, List[str]]):
+        field_types = query.get("fieldTypes", [])
+        field_ids = query.get("fieldIds", [])
+        values = {
+            "field-1": entity["stage"],
+            "affinity-data-description": f"About {entity['id']}",
+            "last-contact": CREATED_AT,
+        }
+        return [
+            field(*metadata, values[metadata[0]])
+            for metadata in FIELD_METADATA
+            if metadata[2] in field_types or metadata[0] in field_ids
+        ]
+
+    def company(self, company_id: int, query=None) -> Dict[str, Any]:
+        company = self.companies[company_id]
+        row = {
+            "id": company_id,
+            "name": company["name"],
+            "domain": f"company{company_id}.com",
+            "domains": [f"company{company_id}.com"],
+            "isGlobal": company_id % 2 == 0,
+        }
+        return row if query is None else row | {"fields": self.fields(company, query)}
+
+    def person(self, person_id: int, query=None) -> Dict[str, Any]:
+        person = self.persons[person_id]
+        row = {
+            "id": person_id,
+            "firstName": person["firstName"],
+            "lastName": None,
+            "primaryEmailAddress": None,
+            "emailAddresses": [],
+            "type": "external",
+        }
+        return row if query is None else row | {"fields": self.fields(person, query)}
+
+    def list_entry(self, list_id: int, entity_id: int, query) -> Dict[str, Any]:
+        (entity_type, _) = self.lists[list_id]
+        entity = (
+            self.company(entity_id, query)
+            if entity_type == "company"
+            else self.person(entity_id, query)
+        )
+        if "list" in query.get("fieldTypes", []):
+            entity["fields"].append(field(*LIST_FIELD, entity_id % 7))
+        return {
+            "id": list_id * 1000 + entity_id,
+            "type": entity_type,
+            "listId": list_id,
+            "createdAt": CREATED_AT,
+            "creatorId": 1,
+            "entity": entity,
+        }
+
+    def page(self, items: List[Any], query, path: str) -> Dict[str, Any]:
+        limit = int(query.get("limit", ["100"])[0])
+        start = int(query.get("cursor", ["0"])[0])
+        next_url = None
+        if start + limit < len(items):
+            url = urlsplit(path)
+            next_query = parse_qs(url.query) | {"cursor": [str(start + limit)]}
+            next_url = f"{self.base}{url.path}?{urlencode(next_query, doseq=True)}"
+        return {
+            "data": items[start : start + limit],
+            "pagination": {"prevUrl": None, "nextUrl": next_url},
+        }
+
+    def handle(
+        self, path: str, query: Dict[str, List[str]], raw: str
+    ) -> Tuple[int, Any]:
+        entities = {"companies": self.company, "persons": self.person}
+        collections = {"companies": self.companies, "persons": self.persons}
+        if match := re.fullmatch(r"/v2/(companies|persons)", path):
+            (entity, ids) = (match.group(1), query.get("ids"))
+            if ids is not None:
+                data = [
+                    entities[entity](int(i), query)
+                    for i in ids
+                    if int(i) in collections[entity]
+                ]
+                return (200, {"data": data, "pagination": {}})
+            return (
+                200,
+                self.page(
+                    [entities[entity](i) for i in collections[entity]], query, raw
+                ),
+            )
+        if re.fullmatch(r"/v2/(companies|persons|lists/\d+)/fields", path):
+            metadata = FIELD_METADATA + ([LIST_FIELD] if "lists" in path else [])
+            data = [
+                dict(zip(("id", "name", "type", "enrichmentSource", "valueType"), m))
+                for m in metadata
+            ]
+            return (200, self.page(data, query, raw))
+        if match := re.fullmatch(r"/v2/(companies|persons)/(\d+)/list-entries", path):
+            entity_type = {"companies": "company", "persons": "person"}[match.group(1)]
+            entity_id = int(match.group(2))
+            data = [
+                self.list_entry(list_id, entity_id, {})
+                for list_id, (list_type, ids) in self.lists.items()
+                if list_type == entity_type and entity_id in ids
+            ]
+            return (200, self.page(data, query, raw))
+        if path == "/v2/opportunities":
+            data = [
+                {"id": i, "name": f"Opportunity {i}", "listId": 3} for i in range(1, 6)
+            ]
+            return (200, self.page(data, query, raw))
+        if path == "/v2/lists":
+            data = [
+                {
+                    "id": i,
+                    "name": f"List {i}",
+                    "creatorId": 1,
+                    "ownerId": 1,
+                    "isPublic": True,
+                }
+                for i in self.lists
+            ]
+            return (200, self.page(data, query, raw))
+        if match := re.fullmatch(r"/v2/lists/(\d+)/saved-views", path):
+            data = [
+                {
+                    "id": view_id,
+                    "name": f"View {view_id}",
+                    "type": "sheet",
+                    "createdAt": CREATED_AT,
+                }
+                for view_id in self.views.get(int(match.group(1)), {})
+            ]
+            return (200, self.page(data, query, raw))
+        if path == "/v2/auth/whoami":
+            return (
+                200,
+                {
+                    "tenant": {"id": 1, "name": "Contoso Ltd.", "subdomain": "contoso"},
+                    "user": {
+                        "id": 1,
+                        "firstName": "John",
+                        "emailAddress": "john.smith@contoso.com",
+                    },
+                    "grant": {
+                        "type": "api-key",
+                        "scopes": ["api"],
+                        "createdAt": CREATED_AT,
+                    },
+                },
+            )
+        if match := re.fullmatch(
+            r"/v2/lists/(\d+)(?:/saved-views/(\d+))?/list-entries", path
+        ):
+            list_id = int(match.group(1))
+            if list_id in self.forbidden_lists:
+                return (
+                    403,
+                    {"errors": [{"code": "permission-denied", "message": "Forbidden"}]},
+                )
+            keeps = (
+                self.views[list_id][int(match.group(2))]
+                if match.group(2)
+                else lambda entity_id: True
+            )
+            # saved views return the fields of their columns
+            view_query = {"fieldTypes": ["global", "list"]} if match.group(2) else query
+            data = [
+                self.list_entry(list_id, entity_id, view_query)
+                for entity_id in self.lists[list_id][1]
+                if keeps(entity_id)
+            ]
+            return (200, self.page(data, query, raw))
+        if match := re.fullmatch(r"/v2/lists/(\d+)/list-entries/(\d+)", path):
+            list_id = int(match.group(1))
+            entity_id = int(match.group(2)) - list_id * 1000
+            if entity_id not in self.lists[list_id][1]:
+                return (
+                    404,
+                    {"errors": [{"code": "not-found", "message": "Not found"}]},
+                )
+            return (200, self.list_entry(list_id, entity_id, query))
+        if path == "/v2/notes":
+            return (200, {"data": [], "pagination": {"totalCount": 3}})
+        if path == "/notes":
+            return (
+                200,
+                {"notes": [self.note(i) for i in range(1, 4)], "next_page_token": None},
+            )
+        if path == "/lists":
+            return (
+                200,
+                [
+                    {"id": i, "list_size": len(ids)}
+                    for i, (_, ids) in self.lists.items()
+                ],
+            )
+        if path == "/fields":
+            entity_type = {"0": "person", "1": "organization", "8": "opportunity"}[
+                query["entity_type"][0]
+            ]
+            return (
+                200,
+                [
+                    {"id": field_id, "name": f"Field {field_id}", "track_changes": True}
+                    for field_id in self.tracked_fields[entity_type]
+                ],
+            )
+        if path == "/field-value-changes":
+            return (200, self.field_value_changes.get(int(query["field_id"][0]), []))
+        return (404, {"errors": [{"code": "not-found", "message": path}]})
+
+    @staticmethod
+    def note(note_id: int) -> Dict[str, Any]:
+        return {
+            "id": note_id,
+            "creator_id": 1,
+            "person_ids": [],
+            "associated_person_ids": [],
+            "interaction_person_ids": [],
+            "interaction_id": None,
+            "interaction_type": None,
+            "is_meeting": False,
+            "mentioned_person_ids": [],
+            "organization_ids": [],
+            "opportunity_ids": [],
+            "parent_id": None,
+            "content": f"Note {note_id}",
+            "type": 0,
+            "created_at": CREATED_AT,
+            "updated_at": None,
+        }
+
+
+def rows(pipeline: dlt.Pipeline, table: str) -> List[Dict[str, Any]]:
+    """
+    Returns the rows of a table in the destination, ordered by their ID
+    """
+    with pipeline.sql_client() as client:
+        with client.execute_query(f"SELECT * FROM {table} ORDER BY id") as cursor:
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -0,0 +1,116 @@
+from datetime import datetime
+from typing import Any, Dict, List
+
+from ..change_feed import ChangeFeed
+from ..rest_client import get_v1_rest_client, get_v2_rest_client
+
+
+def change(change_id: int, entity_id: int, changed_at: str) -> Dict[str, Any]:
+    return {
+        "id": change_id,
+        "field_id": 1,
+        "entity_id": entity_id,
+        "list_entry_id": None,
+        "action_type": 2,
+        "changed_at": changed_at,
+    }
+
+
+class PagedRestClient:
+    def __init__(self, pages: List[List[Dict[str, Any]]]):
+        self.pages = pages
+        self.paged = 0
+
+    def paginate(self, path, params=None, hooks=None):
+        for page in self.pages:
+            self.paged += 1
+            yield page
+
+
+def test_first_run_only_records_the_cursor(fake_api):
+    fake_api.field_value_changes[1] = [
+        change(2, 4, "2024-02-02T00:00:00Z"),
+        change(1, 3, "2024-02-01T00:00:00Z"),
+    ]
+    state: Dict[str, Any] = {}
+    feed = ChangeFeed()
+    feed.load(state, get_v1_rest_client())
+
+    assert feed.entity_ids["companies"] == set()
+    assert state["cursor"] == "2024-02-02T00:00:00+00:00"
+
+
+def test_only_collects_changes_after_the_cursor(fake_api):
+    fake_api.field_value_changes[1] = [
+        change(3, 5, "2024-02-03T00:00:00Z"),
+        change(2, 4, "2024-02-02T00:00:00Z"),
+        change(1, 3, "2024-02-01T00:00:00Z"),
+    ]
+    state = {"cursor": "2024-02-02T00:00:00+00:00"}
+    feed = ChangeFeed()
+    feed.load(state, get_v1_rest_client())
+
+    assert feed.entity_ids["companies"] == {5}
+    assert state["cursor"] == "2024-02-03T00:00:00+00:00"
+
+
+def test_keeps_the_cursor_without_new_changes(fake_api):
+    fake_api.field_value_changes[1] = [change(1, 3, "2024-02-01T00:00:00Z")]
+    state = {"cursor": "2024-02-02T00:00:00+00:00"}
+    feed = ChangeFeed()
+    feed.load(state, get_v1_rest_client())
+
+    assert feed.entity_ids["companies"] == set()
+    assert state["cursor"] == "2024-02-02T00:00:00+00:00"
+
+
+def test_stops_paging_behind_the_cursor():
+    rest_client = PagedRestClient(
+        [
+            [
+                change(4, 6, "2024-02-04T00:00:00Z"),
+                change(3, 5, "2024-02-03T00:00:00Z"),
+            ],
+            [
+                change(2, 4, "2024-02-02T00:00:00Z"),
+                change(1, 3, "2024-02-01T00:00:00Z"),
+            ],
+            [change(0, 2, "2024-01-01T00:00:00Z")],
+        ]
+    )
+    changes = ChangeFeed.changes(
+        rest_client, 1, datetime.fromisoformat("2024-02-02T12:00:00+00:00")
+    )
+
+    assert [c.entity_id for c in changes] == [6, 5]
+    assert rest_client.paged == 2
+
+
+def test_pages_oldest_first_changes_to_the_end():
+    rest_client = PagedRestClient(
+        [
+            [
+                change(1, 3, "2024-02-01T00:00:00Z"),
+                change(2, 4, "2024-02-02T00:00:00Z"),
+            ],
+            [change(3, 5, "2024-02-03T00:00:00Z")],
+        ]
+    )
+    changes = ChangeFeed.changes(
+        rest_client, 1, datetime.fromisoformat("2024-02-01T12:00:00+00:00")
+    )
+
+    assert [c.entity_id for c in changes] == [4, 5]
+    assert rest_client.paged == 2
+
+
+def test_resolves_the_list_entries_of_changed_entities(fake_api):
+    feed = ChangeFeed()
+    # company 20 and person 9 are on no list
+    feed.entity_ids["companies"] = {3, 20}
+    feed.entity_ids["persons"] = {2, 9}
+    feed.resolve_list_entries(get_v2_rest_client())
+
+    assert feed.list_entry_ids == {1: {1003}, 2: {2002}}
+    assert fake_api.requests["/v2/companies/{id}/list-entries"] == 2
+    assert fake_api.requests["/v2/persons/{id}/list-entries"] == 2
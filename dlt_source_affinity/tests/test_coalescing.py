@@ -0,0 +1,36 @@
+from ..coalescing import coalesce_list_refs, membership_rows
+from ..helpers import ListReference
+
+
+def test_coalesces_saved_views_of_lists_referenced_more_than_once():
+    entry_refs, view_refs = coalesce_list_refs(
+        [
+            ListReference(1, 11),
+            ListReference(1, 12),
+            ListReference(2, 21),
+            ListReference(3),
+            ListReference(3, 31),
+        ]
+    )
+    assert entry_refs == [ListReference(1), ListReference(2, 21), ListReference(3)]
+    assert view_refs == [
+        ListReference(1, 11),
+        ListReference(1, 12),
+        ListReference(3, 31),
+    ]
+
+
+def test_duplicate_references_are_not_coalesced():
+    entry_refs, view_refs = coalesce_list_refs(
+        [ListReference(2, 21), ListReference(2, 21), ListReference(4)]
+    )
+    assert entry_refs == [ListReference(2, 21), ListReference(4)]
+    assert view_refs == []
+
+
+def test_membership_rows_only_keep_the_list_entry_ids():
+    rows = membership_rows(
+        ListReference(1, 11),
+        [{"id": 5, "entity": {"id": 50}, "fields": [{"id": "field-1"}]}],
+    )
+    assert rows == [{"list_entry_id": 5, "list_id": 1, "view_id": 11}]
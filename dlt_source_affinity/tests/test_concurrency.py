@@ -0,0 +1,82 @@
+import threading
+import time
+
+from ..concurrency import (
+    INITIAL_CONCURRENCY,
+    MIN_SAMPLES,
+    AdaptiveLimiter,
+    RequestThreads,
+    initial_concurrency,
+)
+
+
+def saturate(limiter: AdaptiveLimiter, threads: int, requests: int) -> None:
+    def send():
+        for _ in range(requests):
+            limited = limiter.acquire()
+            time.sleep(0.001)
+            limiter.release(0.1, throttled=False, limited=limited)
+
+    workers = [threading.Thread(target=send) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def test_only_increases_while_the_limit_is_reached():
+    limiter = AdaptiveLimiter(4)
+    for _ in range(MIN_SAMPLES * 2):
+        limited = limiter.acquire()
+        limiter.release(0.1, throttled=False, limited=limited)
+    # one request at a time never reaches the limit, so it is not increased
+    assert limiter.limit == 4
+
+    saturate(limiter, threads=8, requests=20)
+    # once there is a slot for every thread, the limit isn't reached anymore
+    assert 4 < limiter.limit < 10
+
+
+def test_decreases_multiplicatively():
+    limiter = AdaptiveLimiter(8)
+    limiter.release(0.1, throttled=True, limited=limiter.acquire())
+    assert limiter.limit == 4
+
+    # only one decrease per window of in flight requests
+    limiter.release(0.1, throttled=True, limited=limiter.acquire())
+    assert limiter.limit == 4
+
+
+def test_latency_spikes_decrease():
+    limiter = AdaptiveLimiter(8)
+    for _ in range(MIN_SAMPLES):
+        limiter.release(0.1, throttled=False, limited=limiter.acquire())
+    limit = limiter.limit
+    limiter.release(1.0, throttled=False, limited=limiter.acquire())
+    assert limiter.limit == limit / 2
+
+
+def test_starts_at_the_configured_extract_workers(monkeypatch):
+    assert initial_concurrency() == INITIAL_CONCURRENCY
+    monkeypatch.setenv("EXTRACT__WORKERS", "12")
+    assert initial_concurrency() == 12
+
+
+def test_request_threads_are_bounded_and_left_when_idle():
+    threads = RequestThreads(2, "affinity-test")
+    in_flight = []
+
+    def send():
+        in_flight.append(1)
+        time.sleep(0.05)
+        concurrent = len(in_flight)
+        in_flight.pop()
+        return concurrent
+
+    futures = [threads.submit(send) for _ in range(4)]
+    assert max(future.result() for future in futures) <= 2
+
+    time.sleep(0.05)
+    assert not any(t.name.startswith("affinity-test") for t in threading.enumerate())
+    # and started again for the next request
+    assert threads.submit(lambda: 1).result() == 1
@@ -0,0 +1,240 @@
+import json
+from functools import partial
+
+import pytest
+from dlt.common.json import json as dlt_json
+
+from .. import (
+    CompanyPaged,
+    ListEntryWithEntity,
+    ListEntryWithEntityPaged,
+    flatten_entities,
+    flatten_list_entries,
+)
+from ..decoding import PageDecoding, construct, decode_json, decode_list, dump
+from ..model.v1 import Note
+
+pytest.importorskip("msgspec")
+
+PERSON = {
+    "id": 7,
+    "firstName": "Jane",
+    "lastName": "Doe",
+    "primaryEmailAddress": None,
+    "type": "internal",
+}
+
+
+def field(field_id, value_type, data, field_type="global"):
+    return {
+        "id": field_id,
+        "name": field_id.title(),
+        "type": field_type,
+        "enrichmentSource": None,
+        "value": {"type": value_type, "data": data},
+    }
+
+
+FIELDS = [
+    field("field-1", "dropdown", {"dropdownOptionId": 10, "text": "Lead"}),
+    field(
+        "field-2",
+        "ranked-dropdown",
+        {"dropdownOptionId": 11, "text": "Hot", "rank": 0, "color": None},
+        "list",
+    ),
+    field("field-3", "dropdown-multi", [{"dropdownOptionId": 12, "text": "a"}]),
+    field("field-4", "number", 3),
+    field("field-5", "number-multi", [1.5, 2]),
+    field("field-6", "text", "some text"),
+    field("field-7", "filterable-text", "filterable"),
+    field(
+        "field-8",
+        "filterable-text-multi",
+        [{"link": "https://linkedin.com/in/jane", "text": "Jane"}],
+    ),
+    field("field-9", "person", PERSON),
+    field("field-10", "person-multi", [PERSON]),
+    field("field-11", "company", None),
+    field("field-12", "company-multi", []),
+    field(
+        "field-13",
+        "location",
+        {
+            "streetAddress": None,
+            "city": "Berlin",
+            "state": None,
+            "country": "Germany",
+            "continent": "Europe",
+        },
+    ),
+    field("field-14", "datetime", "2024-01-01T00:00:00Z"),
+    field(
+        "last-email",
+        "interaction",
+        {
+            "type": "email",
+            "id": 5,
+            "subject": "Hi",
+            "sentAt": "2023-01-01T00:00:00Z",
+            "from": {"emailAddress": "a@contoso.com", "person": PERSON},
+            "to": [{"emailAddress": "b@contoso.com", "person": None}],
+            "cc": [],
+        },
+        "relationship-intelligence",
+    ),
+]
+
+COMPANY = {
+    "id": 1,
+    "name": "Contoso",
+    "domain": "contoso.com",
+    "domains": ["contoso.com"],
+    "isGlobal": False,
+    "fields": FIELDS,
+}
+
+
+def normalized(obj):
+    return json.loads(dlt_json.dumps(obj))
+
+
+def normalized_side_items(items):
+    return [
+        (
+            normalized(i.data),
+            i.meta.hints["table_name"],
+            i.meta.hints.get("original_columns"),
+        )
+        for i in items
+    ]
+
+
+def test_entities_flatten_the_same_with_both_decoders():
+    raw = json.dumps(
+        {"data": [COMPANY], "pagination": {"prevUrl": None, "nextUrl": None}}
+    ).encode()
+
+    (expected, actual) = (
+        flatten_entities(
+            decode_json(raw, CompanyPaged, decoder).data, "companies", "replace"
+        )
+        for decoder in ("pydantic", "msgspec")
+    )
+    (row, ret, references, items) = actual[0]
+    (expected_row, expected_ret, expected_references, expected_items) = expected[0]
+    assert normalized(row) == normalized(expected_row)
+    assert normalized(ret) == normalized(expected_ret)
+    assert len(ret) == len(FIELDS)
+    assert references == expected_references
+    assert normalized_side_items(items) == normalized_side_items(expected_items)
+
+
+def test_list_entries_flatten_the_same_with_both_decoders():
+    entries = [
+        {
+            "id": 100,
+            "type": "company",
+            "listId": 1,
+            "createdAt": "2023-01-01T00:00:00Z",
+            "creatorId": None,
+            "entity": COMPANY,
+        }
+    ]
+    raw = json.dumps(
+        {"data": entries, "pagination": {"prevUrl": None, "nextUrl": None}}
+    ).encode()
+
+    (expected, actual, from_page) = (
+        flatten_list_entries(list_entries, "lists-1-entries", "merge")
+        for list_entries in (
+            decode_json(raw, ListEntryWithEntityPaged, "pydantic").data,
+            decode_json(raw, ListEntryWithEntityPaged, "msgspec").data,
+            # as paginated, i.e. already parsed
+            decode_list(entries, ListEntryWithEntity, "msgspec"),
+        )
+    )
+    for flattened in (actual, from_page):
+        (row, references, items) = flattened[0]
+        (expected_row, expected_references, expected_items) = expected[0]
+        assert normalized(row) == normalized(expected_row)
+        assert references == expected_references
+        assert normalized_side_items(items) == normalized_side_items(expected_items)
+
+
+def test_notes_dump_the_same_with_both_decoders():
+    notes = [
+        {
+            "id": 1,
+            "creator_id": 2,
+            "person_ids": [3],
+            "associated_person_ids": [3],
+            "interaction_person_ids": [],
+            "interaction_id": 4,
+            "interaction_type": 3,
+            "is_meeting": False,
+            "mentioned_person_ids": [],
+            "organization_ids": [5],
+            "opportunity_ids": [],
+            "parent_id": None,
+            "content": "<p>Hi</p>",
+            "type": 2,
+            "created_at": "2023-01-01T00:00:00Z",
+            "updated_at": None,
+        }
+    ]
+    expected = decode_list(notes, Note, "pydantic")
+    actual = [construct(note, Note) for note in decode_list(notes, Note, "msgspec")]
+    assert [dump(note) for note in actual] == [dump(note) for note in expected]
+    assert dump(actual[0])["interaction_type"] == "email"
+
+
+def test_invalid_payloads_are_rejected_by_both_decoders():
+    import msgspec
+    from pydantic import ValidationError
+
+    raw = json.dumps(
+        {
+            "data": [COMPANY | {"id": 0}],
+            "pagination": {"prevUrl": None, "nextUrl": None},
+        }
+    ).encode()
+    with pytest.raises(ValidationError):
+        decode_json(raw, CompanyPaged, "pydantic")
+    with pytest.raises(msgspec.ValidationError):
+        decode_json(raw, CompanyPaged, "msgspec")
+
+
+def test_sampled_validation_validates_every_nth_page():
+    page_decoding = PageDecoding(validate_every=3)
+    decoders = [page_decoding.next_decoder() for _ in range(7)]
+    assert decoders == [
+        "pydantic",
+        "msgspec",
+        "msgspec",
+        "pydantic",
+        "msgspec",
+        "msgspec",
+        "pydantic",
+    ]
+    assert (page_decoding.validated, page_decoding.trusted) == (3, 4)
+    assert PageDecoding("msgspec").next_decoder() == "msgspec"
+
+
+def test_sampled_validation_switches_back_on_failure():
+    page = {"data": [COMPANY], "pagination": {"prevUrl": None, "nextUrl": None}}
+    # the spec requires the (nullable) domain, but the models default it to None
+    drifted = {**page, "data": [{k: v for k, v in COMPANY.items() if k != "domain"}]}
+    page_decoding = PageDecoding(validate_every=10)
+
+    def decode(payload):
+        return page_decoding.decode(
+            "companies", partial(decode_json, json.dumps(payload), CompanyPaged)
+        )
+
+    assert isinstance(decode(page), CompanyPaged)
+    assert not isinstance(decode(page), CompanyPaged)
+    assert isinstance(decode(drifted), CompanyPaged)
+    assert page_decoding.failed
+    assert isinstance(decode(page), CompanyPaged)
+    assert (page_decoding.validated, page_decoding.trusted) == (2, 2)
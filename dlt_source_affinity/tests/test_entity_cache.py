@@ -0,0 +1,161 @@
+import threading
+import time
+
+import pytest
+
+from .. import Decoding, ListLoading, ListReference, source, waiting
+from ..entity_cache import EntityCache
+from ..waiting import WorkerBudget
+from .fake_api import rows
+
+
+def entity(entity_id, entity_name="companies"):
+    return (
+        entity_name,
+        entity_id,
+        {"id": entity_id, "name": f"Entity {entity_id}"},
+        {
+            "global": ({"field_1": entity_id}, [], ["global item"]),
+            "enriched": ({"location": "Berlin"}, ["reference"], ["enriched item"]),
+        },
+    )
+
+
+def test_takes_entities_fetched_with_all_field_types():
+    cache = EntityCache(["lists-list-1-entries"], WorkerBudget(1))
+    cache.add(
+        [entity(1), entity(2), entity(3, "persons")],
+        ["enriched", "global", "list"],
+    )
+
+    cached, remaining = cache.take(
+        "companies", [1, 2, 3, 4], {"fieldTypes": ["enriched", "global"]}
+    )
+    assert [row["id"] for (row, *_) in cached] == [1, 2]
+    assert cached[0][1:] == (
+        {"location": "Berlin", "field_1": 1},
+        ["reference"],
+        ["enriched item", "global item"],
+    )
+    assert remaining == [3, 4]
+
+    cached, _ = cache.take("companies", [1], {"fieldTypes": ["global"]})
+    assert cached[0][1:] == ({"field_1": 1}, [], ["global item"])
+
+    cached, remaining = cache.take(
+        "companies", [1], {"fieldTypes": ["relationship-intelligence"]}
+    )
+    assert cached == []
+    assert remaining == [1]
+
+    cached, remaining = cache.take("companies", [1], {"fieldIds": ["field-1"]})
+    assert cached == []
+    assert cache.hits["companies"] == 3
+    assert cache.fetched["companies"] == 4
+
+
+def test_keeps_the_entities_fetched_with_more_field_types():
+    cache = EntityCache([], WorkerBudget(1))
+    cache.add([entity(1)], ["enriched", "global", "list"])
+    assert not cache.needs("companies", 1, ["global"])
+    assert cache.needs("companies", 1, ["global", "relationship-intelligence"])
+    assert cache.needs("companies", 2, ["global"])
+
+    cache.add([entity(1)], ["list"])
+    cached, _ = cache.take("companies", [1], {"fieldTypes": ["enriched"]})
+    assert [row["id"] for (row, *_) in cached] == [1]
+
+
+def entity_rows(pipeline):
+    return {
+        table: [
+            {k: v for k, v in row.items() if not k.startswith("_dlt")}
+            for row in rows(pipeline, table)
+        ]
+        for table in ("companies", "persons")
+    }
+
+
+@pytest.mark.parametrize("decoder", ["pydantic", "msgspec"])
+def test_emits_the_same_rows_as_fetching(fake_api, pipeline, decoder):
+    lists = [ListReference(1), ListReference(2)]
+    pipeline.run(source(list_refs=lists).with_resources("companies", "persons"))
+    fetched = entity_rows(pipeline)
+
+    pipeline.run(
+        source(
+            list_refs=lists,
+            list_loading=ListLoading(reuse_entities=True),
+            decoding=Decoding(decoder=decoder),
+        ).with_resources(
+            "companies", "persons", "lists-list-1-entries", "lists-list-2-entries"
+        )
+    )
+    assert entity_rows(pipeline) == fetched
+    ((metrics, *_),) = pipeline.last_trace.last_extract_info.metrics.values()
+    assert {
+        name: metrics["resource_metrics"][name].custom_metrics["entity_cache"]
+        for name in ("companies", "persons")
+    } == {
+        "companies": {"hits": 10, "fetched": 20},
+        "persons": {"hits": 5, "fetched": 15},
+    }
+
+
+def test_partitions_cached_and_uncached_entities():
+    cache = EntityCache([], WorkerBudget(1))
+    cache.add([entity(2), entity(4)], ["global"])
+
+    batches = list(
+        cache.partition("companies", [[1, 2, 3], [4, 5]], lambda e: e, size=2)
+    )
+    assert batches == [[1, 3], [2, 4], [5]]
+
+
+def test_waits_for_the_started_lists(monkeypatch):
+    monkeypatch.setattr(waiting, "ADMISSION_WAIT", 0.01)
+    cache = EntityCache(
+        ["lists-list-1-entries", "lists-list-2-entries"],
+        WorkerBudget(1),
+        gather_seconds=0.05,
+    )
+    cache.start("lists-list-1-entries")
+    wait = cache.wait()
+    assert next(wait) is None
+
+    cache.done("lists-list-1-entries")
+    # the other list never started, so it is not waited for
+    assert list(wait) != []
+    assert list(cache.wait()) == []
+
+
+def test_blocks_until_the_lists_are_done():
+    cache = EntityCache(
+        ["lists-list-1-entries", "lists-list-2-entries"],
+        WorkerBudget(2),
+        gather_seconds=0.05,
+    )
+    cache.start("lists-list-1-entries")
+    waiter = threading.Thread(target=lambda: list(cache.wait()))
+    waiter.start()
+    waiter.join(0.2)
+    # the other list never started, but the first one is not done yet
+    assert waiter.is_alive()
+
+    cache.done("lists-list-1-entries")
+    waiter.join(1)
+    assert not waiter.is_alive()
+
+
+def test_only_waits_for_the_selected_lists(fake_api, pipeline):
+    started = time.monotonic()
+    pipeline.run(
+        source(
+            list_refs=[ListReference(1), ListReference(2)],
+            list_loading=ListLoading(reuse_entities=True, gather_seconds=60),
+        ).with_resources("companies", "lists-list-1-entries")
+    )
+
+    # the unselected list is not waited for
+    assert time.monotonic() - started < 30
+    assert len(rows(pipeline, "companies")) == 30
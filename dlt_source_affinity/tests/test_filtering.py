@@ -0,0 +1,19 @@
+import pytest
+
+from .. import ExplicitIds, Filters, source
+from ..helpers import filter_batches
+
+
+def test_filtered_batches_are_rebatched_to_full_chunks():
+    batches = [list(range(i, i + 100)) for i in range(0, 1000, 100)]
+    filtered = list(filter_batches(batches, lambda i: i % 3 == 0, 100))
+    assert [len(batch) for batch in filtered] == [100, 100, 100, 34]
+    assert [i for batch in filtered for i in batch] == list(range(0, 1000, 3))
+
+
+def test_filters_need_an_enumeration_of_ids():
+    with pytest.raises(ValueError, match="Filters"):
+        source(
+            ids=ExplicitIds(company_ids=[1]),
+            filters=Filters(companies=lambda c: not c.isGlobal),
+        )
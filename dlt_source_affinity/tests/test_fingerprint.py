@@ -0,0 +1,29 @@
+from ..fingerprint import FingerprintIndex
+
+
+def test_skips_rows_of_committed_generations(tmp_path):
+    state = {}
+    rows = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+
+    first = FingerprintIndex()
+    first.open(state, tmp_path)
+    assert first.filter_changed("companies", rows) == rows
+
+    second = FingerprintIndex()
+    second.open(state, tmp_path)
+    changed = [{"id": 1, "name": "a"}, {"id": 2, "name": "c"}]
+    assert second.filter_changed("companies", changed) == [{"id": 2, "name": "c"}]
+    assert second.skipped["companies"] == 1
+
+
+def test_does_not_trust_uncommitted_generations(tmp_path):
+    rows = [{"id": 1, "name": "a"}]
+
+    failed = FingerprintIndex()
+    failed.open({}, tmp_path)
+    failed.filter_changed("companies", rows)
+
+    # the state of the failed run was never committed
+    retry = FingerprintIndex()
+    retry.open({}, tmp_path)
+    assert retry.filter_changed("companies", rows) == rows
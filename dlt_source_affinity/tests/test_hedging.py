@@ -0,0 +1,50 @@
+import time
+
+from requests import Response
+
+from ..hedging import MIN_SAMPLES, Hedger
+from ..ratelimit import RateLimitCoordinator
+from .test_ratelimit import make_response
+
+
+def respond(body: bytes, delay: float = 0.0) -> Response:
+    time.sleep(delay)
+    response = Response()
+    response.status_code = 200
+    response._content = body
+    return response
+
+
+def test_hedges_slow_requests_and_caps_them():
+    hedger = Hedger(max_hedges_per_minute=1)
+    for _ in range(MIN_SAMPLES):
+        hedger.get("v2/companies", lambda: respond(b"fast", 0.01))
+    assert hedger.hedges["v2/companies"] == 0
+
+    calls = []
+
+    def slow_then_fast() -> Response:
+        calls.append(1)
+        return respond(b"hedge") if len(calls) > 1 else respond(b"slow", 1)
+
+    assert hedger.get("v2/companies", slow_then_fast).content == b"hedge"
+    assert hedger.hedges["v2/companies"] == 1
+    assert hedger.hedge_wins["v2/companies"] == 1
+
+    # the cap is reached, so the slow request isn't hedged
+    calls.clear()
+    assert hedger.get("v2/companies", slow_then_fast).content == b"slow"
+    assert hedger.hedges["v2/companies"] == 1
+
+
+def test_skips_hedges_without_a_shared_request_to_spare(tmp_path):
+    rate_limiter = RateLimitCoordinator()
+    rate_limiter.start(str(tmp_path), "key")
+    hedger = Hedger(rate_limiter=rate_limiter)
+    for _ in range(MIN_SAMPLES):
+        hedger.get("v2/companies", lambda: respond(b"fast", 0.01))
+
+    # other processes used up the rate limit
+    rate_limiter.observe(make_response(900, 0, 60))
+    assert hedger.get("v2/companies", lambda: respond(b"slow", 0.2)).content == b"slow"
+    assert hedger.hedges["v2/companies"] == 0
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from requests import Response
+
+from ..metrics import HttpMetrics, endpoint_template
+
+
+def make_response(url: str, status_code: int, elapsed: float) -> Response:
+    response = Response()
+    response.url = url
+    response.status_code = status_code
+    response.elapsed = timedelta(seconds=elapsed)
+    response._content = b"{}"
+    return response
+
+
+def test_endpoint_template():
+    assert (
+        endpoint_template("https://api.affinity.co/v2/lists/123/list-entries?limit=100")
+        == "v2/lists/{id}/list-entries"
+    )
+    assert endpoint_template("https://api.affinity.co/notes") == "notes"
+
+
+def test_records_per_endpoint():
+    metrics = HttpMetrics()
+    metrics.record_response(
+        make_response("https://x/v2/lists/1/list-entries", 200, 0.2)
+    )
+    metrics.record_response(
+        make_response("https://x/v2/lists/2/list-entries", 429, 0.01)
+    )
+    metrics.record_wait("https://x/v2/lists/2/list-entries", 1.5, rate_limited=True)
+
+    endpoint = metrics.by_endpoint()["v2/lists/{id}/list-entries"]
+    assert endpoint.requests == 2
+    assert endpoint.status_codes == {200: 1, 429: 1}
+    assert endpoint.retries == 1
+    assert endpoint.rate_limit_wait_seconds == 1.5
+    assert endpoint.bytes_received == 4
+
+    prometheus = metrics.to_prometheus()
+    assert (
+        'affinity_http_requests_total{endpoint="v2/lists/{id}/list-entries",code="429"} 1'
+        in prometheus
+    )
+    assert (
+        'affinity_http_request_duration_seconds_bucket{endpoint="v2/lists/{id}/list-entries",le="0.25"} 2'
+        in prometheus
+    )
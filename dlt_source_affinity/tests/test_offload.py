@@ -0,0 +1,73 @@
+import json
+
+from .. import (
+    CompanyPaged,
+    flatten_entities,
+    flatten_entities_page,
+    restore_side_items,
+)
+from ..offload import ProcessPool
+
+PAGE = {
+    "data": [
+        {
+            "id": 1,
+            "name": "Contoso",
+            "domain": "contoso.com",
+            "domains": ["contoso.com"],
+            "isGlobal": False,
+            "fields": [
+                {
+                    "id": "field-1",
+                    "name": "Stage",
+                    "type": "global",
+                    "enrichmentSource": None,
+                    "value": {
+                        "type": "dropdown",
+                        "data": {"dropdownOptionId": 10, "text": "Lead"},
+                    },
+                },
+                {
+                    "id": "last-email",
+                    "name": "Last email",
+                    "type": "relationship-intelligence",
+                    "enrichmentSource": None,
+                    "value": {
+                        "type": "interaction",
+                        "data": {
+                            "type": "email",
+                            "id": 5,
+                            "subject": "Hi",
+                            "sentAt": "2023-01-01T00:00:00Z",
+                            "from": {"emailAddress": "a@contoso.com", "person": None},
+                            "to": [],
+                            "cc": [],
+                        },
+                    },
+                },
+            ],
+        }
+    ],
+    "pagination": {"prevUrl": None, "nextUrl": None},
+}
+
+
+def test_offloaded_page_matches_in_thread_flattening():
+    raw = json.dumps(PAGE).encode()
+    offloaded = ProcessPool(1).run(flatten_entities_page, "companies", raw, "replace")
+
+    expected = flatten_entities(
+        CompanyPaged.model_validate_json(raw).data, "companies", "replace"
+    )
+    assert len(offloaded) == len(expected) == 1
+    (row, ret, references, items) = offloaded[0]
+    (expected_row, expected_ret, expected_references, expected_items) = expected[0]
+    assert (row, ret, references) == (expected_row, expected_ret, expected_references)
+
+    restored = restore_side_items(items, "companies", "replace")
+    assert [(i.data, i.meta.hints["table_name"]) for i in restored] == [
+        (i.data, i.meta.hints["table_name"]) for i in expected_items
+    ]
+    assert [i.meta.hints.get("original_columns") for i in restored] == [
+        i.meta.hints.get("original_columns") for i in expected_items
+    ]
@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+import pytest
+from dlt.common.exceptions import MissingDependencyException
+
+from .. import Concurrency, Decoding, Incremental, ListLoading, Shard, source
+
+
+def test_options_are_validated():
+    with pytest.raises(ValueError, match="Unknown field types"):
+        source(incremental=Incremental(field_refresh_intervals={"lists": timedelta(1)}))
+    with pytest.raises(ValueError, match="Unknown field types"):
+        source(concurrency=Concurrency(split_field_types=[["relationship"]]))
+    with pytest.raises(ValueError, match="max_in_flight"):
+        source(list_loading=ListLoading(max_in_flight=0))
+    with pytest.raises(ValueError, match="gather_seconds"):
+        source(list_loading=ListLoading(gather_seconds=-1))
+    with pytest.raises(ValueError, match="validate_every"):
+        source(decoding=Decoding(validate_every=0))
+    with pytest.raises(ValueError, match="shard index"):
+        source(shard=Shard(4, 4))
+
+
+def test_incremental_options_merge():
+    assert not Incremental().merges
+    assert Incremental(skip_unchanged=True).merges
+    assert Incremental(field_refresh_intervals={"enriched": timedelta(7)}).merges
+
+
+def test_sampled_validation_needs_msgspec(monkeypatch):
+    monkeypatch.setattr("dlt_source_affinity.decoding.msgspec", None)
+    with pytest.raises(MissingDependencyException, match="msgspec"):
+        source(decoding=Decoding(validate_every=10))
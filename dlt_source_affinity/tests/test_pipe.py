@@ -1,9 +1,90 @@
+from typing import Any, Dict, List
+
+import dlt
 from pydantic import RootModel
 from pydantic_flatten_rootmodel import flatten_root_model
 
+from .. import (
+    Concurrency,
+    Decoding,
+    ExplicitIds,
+    Incremental,
+    ListLoading,
+    ListReference,
+    source,
+)
 from ..model.v2 import Interaction
 
 
 def test_flatten_works():
     FlattenedInteraction = flatten_root_model(Interaction)
     assert not issubclass(FlattenedInteraction, RootModel)
+
+
+TABLES = {
+    "companies": 30,
+    "companies__domains": 30,
+    "persons": 20,
+    "opportunities": 5,
+    "lists": 2,
+    "lists_list_1_entries": 10,
+    "lists_list_2_entries": 5,
+    "fields": 4,
+    "notes": 3,
+}
+
+
+def tables(pipeline: dlt.Pipeline) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Returns the rows of all loaded tables, without the dlt columns that change with every load
+    """
+    with pipeline.sql_client() as client:
+        with client.execute_query(
+            "SELECT table_name FROM information_schema.tables"
+            " WHERE table_schema = %s AND table_name NOT LIKE '\\_dlt%%' ESCAPE '\\'",
+            pipeline.dataset_name,
+        ) as cursor:
+            names = [name for (name,) in cursor.fetchall()]
+        ret = {}
+        for name in names:
+            with client.execute_query(f"SELECT * FROM {name}") as cursor:
+                columns = [c[0] for c in cursor.description]
+                ret[name] = sorted(
+                    (
+                        {k: v for k, v in zip(columns, row) if not k.startswith("_dlt")}
+                        for row in cursor.fetchall()
+                    ),
+                    key=repr,
+                )
+    return ret
+
+
+def test_loads_all_tables(fake_api, pipeline):
+    lists = [ListReference(1), ListReference(2)]
+    pipeline.run(source(list_refs=lists))
+    loaded = tables(pipeline)
+    assert {name: len(rows) for name, rows in loaded.items()} == TABLES
+
+    # the options that only change how the data is fetched and flattened load the same rows
+    pipeline.run(
+        source(
+            list_refs=lists,
+            list_loading=ListLoading(max_in_flight=1, reuse_entities=True),
+            concurrency=Concurrency(
+                adaptive=True,
+                hedge_requests=True,
+                split_field_types=[["relationship-intelligence"]],
+            ),
+            decoding=Decoding(decoder="msgspec", process_workers=2),
+        )
+    )
+    assert tables(pipeline) == loaded
+
+
+def test_full_loads_can_be_followed_by_merging_ones(fake_api, pipeline):
+    lists = [ListReference(1), ListReference(2)]
+    pipeline.run(source(list_refs=lists))
+    # merging needs the nested tables to have a root key from the start
+    pipeline.run(source(list_refs=lists, incremental=Incremental(skip_unchanged=True)))
+    pipeline.run(source(ids=ExplicitIds(company_ids=[1, 2])))
+    assert {name: len(rows) for name, rows in tables(pipeline).items()} == TABLES
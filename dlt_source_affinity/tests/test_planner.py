@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from ..helpers import ListReference, Sampling
+from ..planner import PERMISSIONS, MissingPermissions, ResourcePlan, RunPlan, plan
+from ..projection import FieldSelection
+
+
+def make_plan(**kwargs) -> RunPlan:
+    return RunPlan(
+        tenant="Contoso Ltd.",
+        user="john.smith@contoso.com",
+        scopes=["api"],
+        **{
+            "latency_seconds": 0.5,
+            "concurrency": 8,
+            "rate_limit": {"user_limit": 900, "org_remaining": 100_000},
+            "resources": [
+                ResourcePlan("companies", 10_000, 200, 50_000_000, 10),
+                ResourcePlan("notes", 1_000, 2, 1_000_000, 2),
+            ],
+            **kwargs,
+        },
+    )
+
+
+def test_wall_time_is_bound_by_rate_limit():
+    run_plan = make_plan()
+    assert run_plan.requests == 202
+    # 900 requests per minute
+    assert run_plan.seconds == 202 / 15
+    assert run_plan.fits_org_budget
+
+
+def test_wall_time_is_bound_by_concurrency_and_sequential_requests():
+    assert make_plan(concurrency=1).seconds == 202 * 0.5
+    assert (
+        make_plan(
+            resources=[ResourcePlan("lists-list-1-entries", 50_000, 500, 0, 500)]
+        ).seconds
+        == 500 * 0.5
+    )
+
+
+def test_summary_warns_about_org_budget():
+    run_plan = make_plan(rate_limit={"org_remaining": 100})
+    assert not run_plan.fits_org_budget
+    assert "only 100 requests left" in run_plan.summary()
+
+
+def test_missing_permissions_are_listed():
+    error = MissingPermissions(
+        {name: PERMISSIONS[name] for name in ("companies", "lists")}
+    )
+    assert "Export All Organizations directory" in str(error)
+    assert "Export data from Lists" in str(error)
+
+
+def test_missing_list_permissions_are_listed_per_list(fake_api):
+    fake_api.lists[3] = ("company", [1])
+    fake_api.forbidden_lists = {1, 3}
+    with pytest.raises(MissingPermissions) as e:
+        plan(
+            list_refs=[ListReference(1), ListReference(2), ListReference(3)],
+            resources=["companies"],
+        )
+
+    assert e.value.missing.keys() == {"lists-list-1-entries", "lists-list-3-entries"}
+    assert "access to list 3" in str(e.value)
+
+
+def test_counts_the_rows_of_resources_and_lists(fake_api):
+    run_plan = plan(list_refs=[ListReference(1)], resources=["companies", "notes"])
+
+    assert {r.name: r.rows for r in run_plan.resources} == {
+        "companies": 30,
+        "notes": 3,
+        "lists-list-1-entries": 10,
+    }
+    assert run_plan.tenant == "Contoso Ltd."
+
+
+def test_bytes_are_estimated_from_the_items_of_the_loaded_pages(fake_api):
+    run_plan = plan(resources=["notes"])
+
+    # the notes of the v1 page, not the envelope of the v2 page that counts them
+    notes = json.dumps(
+        [fake_api.note(i) for i in range(1, 4)], separators=(",", ":")
+    ).encode()
+    (notes_plan,) = run_plan.resources
+    assert len(notes) < notes_plan.bytes < 2 * len(notes)
+
+
+def test_estimate_observes_sampling_and_field_selections(fake_api):
+    full = plan(resources=["companies"]).resources[0]
+    sampled = plan(
+        resources=["companies"], sampling=Sampling(rate=0.5, max_items=5)
+    ).resources[0]
+    projected = plan(
+        resources=["companies"],
+        fields={"companies": FieldSelection(field_types=["global"])},
+    ).resources[0]
+
+    assert (full.rows, full.requests) == (30, 2)
+    assert (sampled.rows, sampled.requests) == (5, 2)
+    assert sampled.bytes < full.bytes
+    assert projected.rows == 30
+    assert projected.bytes < full.bytes
@@ -0,0 +1,70 @@
+import inspect
+import time
+
+import dlt
+
+from .. import source
+from ..profiling import SUMMARY_FILE, TransformProfile
+from ..run import Run
+
+
+def test_measure_counts_values_and_side_items():
+    profile = TransformProfile()
+    profile.reset(enabled=True)
+
+    def process_field():
+        yield dlt.mark.with_hints(
+            item={"id": 1}, hints=dlt.mark.make_hints(table_name="fields")
+        )
+        yield dlt.mark.with_hints(
+            item={"id": 2}, hints=dlt.mark.make_hints(table_name="interactions")
+        )
+        return "done"
+
+    def process_entity():
+        profile.count_row("companies")
+        result = yield from profile.measure("companies", "interaction", process_field())
+        assert result == "done"
+
+    assert len(list(process_entity())) == 2
+
+    summary = profile.by_resource()["companies"]
+    assert summary["rows"] == 1
+    assert summary["value_types"]["interaction"]["values"] == 1
+    assert summary["side_items"] == {"fields": 1, "interactions": 1}
+
+
+def test_profiled_resource_writes_folded_stacks(tmp_path):
+    run = Run(profile_dir=str(tmp_path))
+
+    @run.resource("busy")
+    def busy(seconds: float):
+        started = time.monotonic()
+        while time.monotonic() - started < seconds:
+            pass
+        yield seconds
+
+    assert inspect.signature(busy).parameters.keys() == {"seconds"}
+    assert list(busy(0.3)) == [0.3]
+    run.resource_profiler.write()
+
+    folded = (tmp_path / "busy.folded").read_text()
+    assert (
+        "test_profiling.py:test_profiled_resource_writes_folded_stacks.<locals>.busy"
+        in folded
+    )
+    assert (tmp_path / SUMMARY_FILE).read_text().startswith("all resources: ")
+
+
+def test_profiling_is_switched_on_by_the_config(
+    fake_api, pipeline, tmp_path, monkeypatch
+):
+    profile_dir = tmp_path / "profiles"
+    monkeypatch.setenv("SOURCES__AFFINITY__DIAGNOSTICS__PROFILE_DIR", str(profile_dir))
+    pipeline.run(source().with_resources("companies"))
+
+    # written once the resources are idle
+    deadline = time.monotonic() + 5
+    while not (profile_dir / SUMMARY_FILE).exists() and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert (profile_dir / SUMMARY_FILE).exists()
@@ -0,0 +1,61 @@
+import logging
+import time
+
+from ..progress import Progress
+
+
+def test_total_is_estimated_until_ids_are_enumerated():
+    progress = Progress()
+    progress.reset(None)
+    progress.add_total("companies", 100)
+    progress.update("companies", 100)
+    progress.add_total("companies", 50)
+
+    companies = progress.by_resource()["companies"]
+    assert companies["rows"] == 100
+    assert companies["total"] == 150
+    assert companies["estimated"]
+    assert companies["eta_seconds"] is not None
+
+    progress.complete_total("companies")
+    progress.update("companies", 50)
+    companies = progress.by_resource()["companies"]
+    assert not companies["estimated"]
+    assert companies["pages"] == 2
+    assert companies["eta_seconds"] == 0
+
+
+def test_total_defaults_to_fetched_rows():
+    progress = Progress()
+    progress.reset(None)
+    progress.update("opportunities", 30)
+    assert progress.by_resource()["opportunities"]["total"] is None
+
+    progress.complete_total("opportunities")
+    assert progress.by_resource()["opportunities"]["total"] == 30
+
+
+def test_logs_resources_without_progress(caplog):
+    progress = Progress()
+    progress.reset(0.05)
+    with caplog.at_level(logging.INFO, logger="dlt"):
+        progress.update("companies", 10)
+        time.sleep(0.3)
+        progress.stop()
+
+    logs = [r.getMessage() for r in caplog.records]
+    assert any(
+        log.startswith("companies: 10 rows") and "no progress for" in log
+        for log in logs
+    )
+
+
+def test_stops_logging(caplog):
+    progress = Progress()
+    progress.reset(0.05)
+    progress.update("companies", 10)
+    progress.stop()
+    with caplog.at_level(logging.INFO, logger="dlt"):
+        time.sleep(0.2)
+
+    assert not caplog.records
@@ -0,0 +1,53 @@
+import pytest
+
+from .. import ListReference, source
+from ..model.v2 import FieldMetadata
+from ..projection import ENTITY_FIELD_TYPES, FieldSelection
+
+METADATA = [
+    FieldMetadata.model_validate(
+        {
+            "id": field_id,
+            "name": name,
+            "type": field_type,
+            "enrichmentSource": enrichment_source,
+            "valueType": "text",
+        }
+    )
+    for (field_id, name, field_type, enrichment_source) in [
+        ("field-1", "Stage", "global", None),
+        ("field-2", "Owner", "global", None),
+        ("affinity-data-location", "Location", "enriched", "affinity-data"),
+        ("dealroom-description", "Description", "enriched", "dealroom"),
+    ]
+]
+
+
+def test_default_selection_fetches_all_field_types():
+    assert FieldSelection().params(ENTITY_FIELD_TYPES) == {
+        "fieldTypes": ENTITY_FIELD_TYPES
+    }
+
+
+def test_selected_fields_are_resolved_to_ids():
+    selection = FieldSelection(
+        field_ids=["field-2"], field_names=["Stage"], enrichment_sources=["dealroom"]
+    )
+    assert selection.params(ENTITY_FIELD_TYPES, METADATA) == {
+        "fieldIds": ["field-2", "field-1", "dealroom-description"]
+    }
+    assert FieldSelection(field_types=["global"], field_ids=["field-3"]).params(
+        ENTITY_FIELD_TYPES
+    ) == {"fieldIds": ["field-3"], "fieldTypes": ["global"]}
+
+
+def test_unknown_field_names_are_rejected():
+    with pytest.raises(ValueError, match="Unknown fields"):
+        FieldSelection(field_names=["Stag"]).params(ENTITY_FIELD_TYPES, METADATA)
+
+
+def test_fields_of_saved_views_cant_be_selected():
+    with pytest.raises(ValueError, match="Saved views"):
+        source(fields={ListReference(1, 2): FieldSelection(field_types=["list"])})
+    with pytest.raises(ValueError, match="Unknown field types"):
+        source(fields={"companies": FieldSelection(field_types=["lists"])})
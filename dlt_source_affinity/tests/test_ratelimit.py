@@ -0,0 +1,67 @@
+import time
+from multiprocessing import get_context
+
+from requests import Response
+
+from ..ratelimit import (
+    BURST,
+    LIMIT_HEADER,
+    REMAINING_HEADER,
+    RESET_HEADER,
+    RateLimitCoordinator,
+)
+
+
+def make_response(limit: int, remaining: int, reset: int) -> Response:
+    response = Response()
+    response.status_code = 200
+    response.headers[LIMIT_HEADER] = str(limit)
+    response.headers[REMAINING_HEADER] = str(remaining)
+    response.headers[RESET_HEADER] = str(reset)
+    return response
+
+
+def acquire(directory: str, n: int) -> None:
+    coordinator = RateLimitCoordinator()
+    coordinator.start(directory, "key")
+    for _ in range(n):
+        coordinator.acquire()
+
+
+def test_processes_share_the_bucket(tmp_path):
+    coordinator = RateLimitCoordinator()
+    coordinator.start(str(tmp_path), "key")
+    # 10 requests per second
+    coordinator.observe(make_response(600, 500, 60))
+
+    started = time.monotonic()
+    context = get_context("spawn")
+    processes = [
+        context.Process(target=acquire, args=(str(tmp_path), BURST)) for _ in range(2)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+    # the burst is shared, the other half has to wait for the refill
+    assert time.monotonic() - started >= 0.9
+
+
+def test_waits_for_reset_when_no_requests_are_remaining(tmp_path):
+    coordinator = RateLimitCoordinator()
+    coordinator.start(str(tmp_path), "key")
+    coordinator.observe(make_response(900, 0, 1))
+    assert coordinator.acquire() >= 0.5
+    assert coordinator.acquire() < 0.5
+
+
+def test_headroom_does_not_take_requests(tmp_path):
+    coordinator = RateLimitCoordinator()
+    coordinator.start(str(tmp_path), "key")
+    assert coordinator.headroom() == BURST
+    coordinator.acquire()
+    assert BURST - 1 <= coordinator.headroom() < BURST
+
+    coordinator.observe(make_response(900, 0, 60))
+    assert coordinator.headroom() == 0
@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from ..refresh import FieldRefresh
+
+INTERVALS = {"enriched": timedelta(days=7)}
+FIELD_TYPES = ["enriched", "global"]
+
+
+def test_only_due_field_types_are_fetched(tmp_path):
+    state = {}
+    first = FieldRefresh(INTERVALS)
+    first.open(state, tmp_path)
+    assert first.project("companies", {"fieldTypes": FIELD_TYPES}) == {
+        "fieldTypes": FIELD_TYPES
+    }
+
+    second = FieldRefresh(INTERVALS)
+    second.open(state, tmp_path)
+    assert second.project("companies", {"fieldTypes": FIELD_TYPES}) == {
+        "fieldTypes": ["global"]
+    }
+    assert second.carried("companies", {"fieldTypes": FIELD_TYPES}) == ["enriched"]
+
+    later = FieldRefresh(INTERVALS)
+    later.now += timedelta(days=7)
+    later.open(state, tmp_path)
+    assert later.due("companies", FIELD_TYPES) == FIELD_TYPES
+
+
+def test_rows_are_completed_with_cached_columns(tmp_path):
+    state = {}
+    first = FieldRefresh(INTERVALS)
+    first.open(state, tmp_path)
+    first.complete(
+        "companies",
+        {
+            1: {"enriched": {"location": "Berlin"}, "global": {"stage": "a"}},
+            2: {"enriched": {}, "global": {"stage": "b"}},
+        },
+        [],
+    )
+
+    second = FieldRefresh(INTERVALS)
+    second.open(state, tmp_path)
+    (columns, missing) = second.complete(
+        "companies",
+        {1: {"global": {"stage": "c"}}, 2: {"global": {}}, 3: {"global": {}}},
+        ["enriched"],
+    )
+    assert columns == {1: {"location": "Berlin"}, 2: {}, 3: {}}
+    # created since the enriched fields were last fetched
+    assert missing == {3: ["enriched"]}
@@ -0,0 +1,46 @@
+from .. import Decoding, ListReference, source
+from ..metrics import http_metrics
+from ..offload import ProcessPool
+from ..rest_client import get_v2_rest_client, hooks
+from ..run import Run, current_run
+
+
+def test_requests_are_recorded_in_their_run(fake_api):
+    first = Run()
+    second = Run()
+    totals = http_metrics.by_endpoint().get("v2/companies")
+    requests = totals.requests if totals is not None else 0
+
+    with first.active():
+        assert current_run() is first
+        get_v2_rest_client().get("companies", hooks=hooks)
+    with second.active():
+        get_v2_rest_client().get("companies", hooks=hooks)
+        get_v2_rest_client().get("companies", hooks=hooks)
+    # outside of any run, only counted in the totals
+    get_v2_rest_client().get("companies", hooks=hooks)
+
+    assert first.http_metrics.by_endpoint()["v2/companies"].requests == 1
+    assert second.http_metrics.by_endpoint()["v2/companies"].requests == 2
+    assert http_metrics.by_endpoint()["v2/companies"].requests == requests + 4
+
+
+def test_sources_do_not_reset_each_other(fake_api, pipeline):
+    first = source(list_refs=[ListReference(1)]).with_resources("companies")
+    # creating another source while the first one runs (or before) used to reset its metrics
+    source(decoding=Decoding(process_workers=1))
+    pipeline.run(first)
+
+    ((metrics, *_),) = pipeline.last_trace.last_extract_info.metrics.values()
+    companies = metrics["resource_metrics"]["companies"].custom_metrics
+    # a page of IDs and their details
+    assert companies["http"]["v2/companies"]["requests"] == 2
+    assert companies["progress"]["rows"] == 30
+
+
+def test_pools_of_different_sizes_are_independent():
+    first = ProcessPool(1)
+    pending = first.submit(sum, [1, 2])
+    assert ProcessPool(2).run(sum, [3, 4]) == 7
+    assert pending.result() == 3
+    assert first.run(sum, [5]) == 5
@@ -0,0 +1,27 @@
+from ..helpers import Sampling
+
+
+def test_sample_is_deterministic_and_rebatched():
+    sampling = Sampling(rate=0.5, seed=1)
+    batches = [list(range(i, i + 100)) for i in range(0, 1000, 100)]
+
+    sampled = list(sampling.sample(batches, lambda i: i, 100))
+    assert sampled == list(sampling.sample(batches, lambda i: i, 100))
+    assert all(len(batch) == 100 for batch in sampled[:-1])
+    assert 400 < sum(len(batch) for batch in sampled) < 600
+
+    other = [
+        i
+        for batch in Sampling(rate=0.5, seed=2).sample(batches, lambda i: i, 100)
+        for i in batch
+    ]
+    assert other != [i for batch in sampled for i in batch]
+
+
+def test_sample_stops_at_max_items():
+    def batches():
+        yield list(range(100))
+        raise AssertionError("should not page any further")
+
+    sampled = list(Sampling(rate=1, max_items=10).sample(batches(), lambda i: i, 3))
+    assert sampled == [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
@@ -0,0 +1,77 @@
+import threading
+from typing import Iterator
+
+from .. import waiting
+from ..helpers import ListReference
+from ..scheduling import ListScheduler
+from ..waiting import WorkerBudget
+
+SIZES = {
+    "lists-list-1-entries": 1,
+    "lists-list-2-entries": 100,
+    "lists-list-2-3-entries": 10,
+}
+
+
+def make_scheduler(budget: WorkerBudget, gather_seconds: float = 0) -> ListScheduler:
+    scheduler = ListScheduler(
+        [ListReference(1), ListReference(2), ListReference(2, 3)],
+        max_in_flight=1,
+        budget=budget,
+        gather_seconds=gather_seconds,
+    )
+    scheduler.sizes = SIZES
+    return scheduler
+
+
+def admitted(admission: Iterator[None]) -> bool:
+    try:
+        next(admission)
+        return False
+    except StopIteration:
+        return True
+
+
+def test_admits_the_largest_waiting_list_first(monkeypatch):
+    monkeypatch.setattr(waiting, "ADMISSION_WAIT", 0.01)
+    # no worker to block, so waiting lists give theirs back
+    scheduler = make_scheduler(WorkerBudget(1))
+    assert admitted(scheduler.admit("lists-list-1-entries"))
+    view = scheduler.admit("lists-list-2-3-entries")
+    assert not admitted(view)
+    largest = scheduler.admit("lists-list-2-entries")
+    assert not admitted(largest)
+
+    scheduler.done("lists-list-1-entries", 1)
+    assert not admitted(view)
+    assert admitted(largest)
+    scheduler.done("lists-list-2-entries", 100)
+    assert admitted(view)
+
+
+def test_blocks_waiting_lists_until_notified():
+    scheduler = make_scheduler(WorkerBudget(3))
+    assert admitted(scheduler.admit("lists-list-1-entries"))
+    waiter = threading.Thread(
+        target=lambda: list(scheduler.admit("lists-list-2-entries"))
+    )
+    waiter.start()
+    waiter.join(0.1)
+    assert waiter.is_alive()
+
+    scheduler.done("lists-list-1-entries", 1)
+    waiter.join(1)
+    assert not waiter.is_alive()
+
+
+def test_waits_for_all_lists_to_start(monkeypatch):
+    monkeypatch.setattr(waiting, "ADMISSION_WAIT", 0.01)
+    scheduler = make_scheduler(WorkerBudget(1), gather_seconds=60)
+    smallest = scheduler.admit("lists-list-1-entries")
+    assert not admitted(smallest)
+    largest = scheduler.admit("lists-list-2-entries")
+    assert not admitted(largest)
+
+    # all lists started, so the largest is admitted without waiting for the timeout
+    assert not admitted(scheduler.admit("lists-list-2-3-entries"))
+    assert admitted(largest)
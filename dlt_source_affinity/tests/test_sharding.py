@@ -0,0 +1,23 @@
+from ..helpers import Shard
+
+
+def test_shards_partition_ids_and_rebatch():
+    batches = [list(range(i, i + 100)) for i in range(0, 1000, 100)]
+    shards = [
+        [
+            i
+            for batch in Shard(index, 3).select(batches, lambda i: i, 100)
+            for i in batch
+        ]
+        for index in range(3)
+    ]
+    assert sorted(i for shard in shards for i in shard) == list(range(1000))
+    assert all(200 < len(shard) < 470 for shard in shards)
+
+    batched = list(Shard(0, 3).select(batches, lambda i: i, 100))
+    assert all(len(batch) == 100 for batch in batched[:-1])
+
+
+def test_resources_are_owned_by_exactly_one_shard():
+    for name in ("notes", "lists", "lists-list-1-entries", "lists-list-1-2-entries"):
+        assert sum(Shard(index, 4).owns(name) for index in range(4)) == 1
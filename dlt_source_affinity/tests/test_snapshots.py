@@ -0,0 +1,47 @@
+from .. import Filters, Incremental, source
+from ..snapshots import IdSnapshots, diff_sorted
+from .fake_api import rows
+
+
+def test_diff_sorted():
+    assert diff_sorted([1, 2, 3, 5, 8], [2, 3, 4, 8, 9]) == [1, 5]
+    assert diff_sorted([], [1]) == []
+    assert diff_sorted([1, 2], []) == [1, 2]
+
+
+def test_diffs_against_last_committed_snapshot(tmp_path):
+    state = {}
+
+    first = IdSnapshots()
+    first.open(state, tmp_path)
+    assert first.diff("companies", [3, 1, 2]) == []
+
+    second = IdSnapshots()
+    second.open(state, tmp_path)
+    assert second.diff("companies", [1, 3]) == [2]
+
+    # the state of the second run was never committed, so we diff against the first one again
+    retry = IdSnapshots()
+    retry.open({"generation": 1}, tmp_path)
+    assert retry.diff("companies", [1]) == [2, 3]
+
+
+def test_filtered_out_entities_are_not_deleted(fake_api, pipeline):
+    pipeline.run(
+        source(incremental=Incremental(detect_deletions=True)).with_resources(
+            "companies"
+        )
+    )
+    assert len(rows(pipeline, "companies")) == 30
+
+    del fake_api.companies[3]
+    pipeline.run(
+        source(
+            incremental=Incremental(detect_deletions=True),
+            filters=Filters(companies=lambda c: c.id % 2 == 0),
+        ).with_resources("companies")
+    )
+    # only the company that disappeared is deleted, not the ones that were filtered out
+    assert [row["id"] for row in rows(pipeline, "companies")] == [
+        i for i in range(1, 31) if i != 3
+    ]
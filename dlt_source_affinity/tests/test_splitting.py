@@ -0,0 +1,61 @@
+import json
+
+from .. import Concurrency, source
+from ..splitting import FieldTypeSplit, merge_pages
+from .fake_api import rows
+
+
+def test_field_types_are_split_into_groups():
+    split = FieldTypeSplit([["relationship-intelligence"]])
+    assert split.split(
+        {
+            "fieldIds": ["field-1"],
+            "fieldTypes": ["enriched", "global", "relationship-intelligence"],
+        }
+    ) == [
+        {"fieldIds": ["field-1"], "fieldTypes": ["enriched", "global"]},
+        {"fieldTypes": ["relationship-intelligence"]},
+    ]
+    # nothing to split
+    assert split.split({"fieldTypes": ["global"]}) == [{"fieldTypes": ["global"]}]
+
+
+def test_fields_are_merged_by_entity():
+    def page(*entities):
+        return json.dumps(
+            {"data": list(entities), "pagination": {"prevUrl": None, "nextUrl": None}}
+        ).encode()
+
+    merged = json.loads(
+        merge_pages(
+            [
+                page(
+                    {"id": 1, "fields": [{"id": "field-1"}]},
+                    {"id": 2, "fields": []},
+                ),
+                page(
+                    {"id": 2, "fields": [{"id": "last-email"}]},
+                    {"id": 1, "fields": [{"id": "first-email"}]},
+                ),
+            ]
+        )
+    )
+    assert [[f["id"] for f in e["fields"]] for e in merged["data"]] == [
+        ["field-1", "first-email"],
+        ["last-email"],
+    ]
+
+
+def test_split_requests_are_limited_adaptively(fake_api, pipeline):
+    pipeline.run(
+        source(
+            concurrency=Concurrency(
+                adaptive=True, split_field_types=[["relationship-intelligence"]]
+            )
+        ).with_resources("companies")
+    )
+    assert len(rows(pipeline, "companies")) == 30
+    ((metrics, *_),) = pipeline.last_trace.last_extract_info.metrics.values()
+    companies = metrics["resource_metrics"]["companies"].custom_metrics
+    assert "concurrency" in companies
+    assert companies["field_type_split"]
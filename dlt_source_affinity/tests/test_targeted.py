@@ -0,0 +1,43 @@
+from .. import ExplicitIds, ListReference, source
+from .fake_api import rows
+
+
+def test_only_fetches_the_requested_ids(fake_api, pipeline):
+    pipeline.run(
+        source(ids=ExplicitIds(company_ids=[3, 5], list_entry_ids={1: [1003]}))
+    )
+
+    assert [c["id"] for c in rows(pipeline, "companies")] == [3, 5]
+    assert [e["id"] for e in rows(pipeline, "lists_list_1_entries")] == [1003]
+    # one details request, without enumerating the companies
+    assert fake_api.requests["/v2/companies"] == 1
+    assert fake_api.requests["/v2/persons"] == 0
+    assert fake_api.requests["/v2/lists/{id}/list-entries"] == 0
+    assert fake_api.requests["/v2/lists/{id}/list-entries/{id}"] == 1
+
+
+def test_merges_the_requested_ids(fake_api, pipeline):
+    pipeline.run(source(ids=ExplicitIds(company_ids=[3, 5])))
+    fake_api.companies[3]["name"] = "Renamed"
+    fake_api.companies[5]["name"] = "Not requested"
+    pipeline.run(source(ids=ExplicitIds(company_ids=[3])))
+
+    assert [(c["id"], c["name"]) for c in rows(pipeline, "companies")] == [
+        (3, "Renamed"),
+        (5, "Company 5"),
+    ]
+
+
+def test_list_entry_ids_replace_the_list_refs(fake_api, pipeline):
+    pipeline.run(
+        source(
+            list_refs=[ListReference(2), ListReference(1, 11)],
+            ids=ExplicitIds(list_entry_ids={1: [1003, 1004]}),
+        )
+    )
+    tables = pipeline.default_schema.data_table_names()
+
+    assert [e["id"] for e in rows(pipeline, "lists_list_1_entries")] == [1003, 1004]
+    assert "lists_list_2_entries" not in tables
+    assert "lists_list_1_11_entries" not in tables
+    assert fake_api.requests["/v2/lists/{id}/saved-views/{id}/list-entries"] == 0
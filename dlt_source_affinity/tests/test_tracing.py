@@ -0,0 +1,32 @@
+import json
+
+from ..tracing import Timeline
+
+
+def test_writes_chrome_trace(tmp_path):
+    timeline = Timeline()
+    path = tmp_path / "trace.json"
+    timeline.start(str(path))
+
+    with timeline.span("GET v2/companies", "http", endpoint="v2/companies") as args:
+        args["status"] = 200
+    assert timeline.call("validate", "transform", len, [1, 2]) == 2
+    timeline.write()
+    timeline.start(None)
+
+    events = json.loads(path.read_text())["traceEvents"]
+    assert [e["ph"] for e in events] == ["M", "X", "X"]
+    assert events[1]["name"] == "GET v2/companies"
+    assert events[1]["args"] == {
+        "endpoint": "v2/companies",
+        "status": 200,
+        "resource": None,
+    }
+    assert events[2]["cat"] == "transform"
+
+
+def test_disabled_timeline_records_nothing():
+    timeline = Timeline()
+    with timeline.span("flatten", "transform"):
+        pass
+    assert timeline._events == []
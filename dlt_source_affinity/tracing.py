@@ -0,0 +1,128 @@
+"""Optional timeline of HTTP requests, page validations and flattening passes in the Chrome trace format"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Dict, List, TypeVar
+
+from dlt.sources.helpers.rest_client.client import Response
+
+from .metrics import current_resource_name, endpoint_template
+
+R = TypeVar("R")
+
+logger = logging.getLogger("dlt")
+
+
+class Span:
+    def __init__(
+        self, timeline: "Timeline", name: str, category: str, args: Dict[str, Any]
+    ):
+        self.timeline = timeline
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self) -> Dict[str, Any]:
+        self.started = time.perf_counter_ns()
+        return self.args
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.timeline.record(self.name, self.category, self.started, self.args)
+
+
+class Timeline:
+    """
+    Records spans tagged with the resource, thread and endpoint and writes them as a
+    Chrome trace (https://ui.perfetto.dev or chrome://tracing), at exit or when calling `write`
+    """
+
+    def __init__(self):
+        self.path: str | None = None
+        self._lock = threading.Lock()
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+        self._at_exit_registered = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def start(self, path: str | None) -> None:
+        with self._lock:
+            self.path = path
+            self._events.clear()
+            self._threads.clear()
+        if path is not None and not self._at_exit_registered:
+            atexit.register(self.write)
+            self._at_exit_registered = True
+
+    def span(
+        self, name: str, category: str, **args: Any
+    ) -> ContextManager[Dict[str, Any]]:
+        """
+        Records the wrapped block as a span. The yielded args can be amended within the block.
+        """
+        if not self.enabled:
+            return nullcontext(args)
+        args["resource"] = current_resource_name()
+        return Span(self, name, category, args)
+
+    def call(self, name: str, category: str, f: Callable[..., R], *args: Any) -> R:
+        with self.span(name, category):
+            return f(*args)
+
+    def record(
+        self, name: str, category: str, started_ns: int, args: Dict[str, Any]
+    ) -> None:
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": started_ns / 1000,
+            "dur": (time.perf_counter_ns() - started_ns) / 1000,
+            "pid": os.getpid(),
+            "tid": thread.native_id,
+            "args": args,
+        }
+        with self._lock:
+            self._events.append(event)
+            self._threads.setdefault(thread.native_id, thread.name)
+
+    def send(
+        self, send: Callable[..., Response], request: Any, **kwargs: Any
+    ) -> Response:
+        """
+        Sends a request of a session as a span, including its retries
+        """
+        endpoint = endpoint_template(request.url)
+        with self.span(
+            f"{request.method} {endpoint}", "http", endpoint=endpoint
+        ) as args:
+            response = send(request, **kwargs)
+            args["status"] = response.status_code
+            return response
+
+    def write(self) -> None:
+        path = self.path
+        if path is None:
+            return
+        with self._lock:
+            events = [
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "tid": tid,
+                    "args": {"name": name},
+                }
+                for tid, name in self._threads.items()
+            ] + self._events
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        logger.info(f"Wrote {len(events)} trace events to {path}")
@@ -1,8 +1,10 @@
 from pydantic import TypeAdapter
 
-from .model.v1 import Note
-from .model.v2 import Errors, ListEntryWithEntity
+from .model.v1 import Field, FieldValueChange, Note
+from .model.v2 import Errors, FieldMetadata
 
 error_adapter = TypeAdapter(Errors)
-list_adapter = TypeAdapter(list[ListEntryWithEntity])
 note_adapter = TypeAdapter(list[Note])
+field_adapter = TypeAdapter(list[Field])
+field_value_change_adapter = TypeAdapter(list[FieldValueChange])
+field_metadata_adapter = TypeAdapter(list[FieldMetadata])
@@ -0,0 +1,97 @@
+"""Waiting of parallelized resources on each other, without taking all extract workers"""
+
+import threading
+import time
+from typing import Callable, Iterable, Iterator, Set
+
+import dlt
+from dlt.extract.exceptions import CurrentSourceNotAvailable
+
+ADMISSION_WAIT = 0.05
+"""
+Seconds a waiting resource that can't block its extract worker waits before giving it back, short
+as it holds the worker meanwhile
+"""
+GATHER_SECONDS = 2.0
+"""
+Seconds after which selected resources that did not start are no longer waited for, in case they
+fail before starting
+"""
+
+
+class WorkerBudget:
+    """
+    Counts the extract workers blocked by waiting resources, so at least one is left for the
+    resources they wait for. Resources beyond the budget yield nothing instead, which gives their
+    worker back to dlt.
+    """
+
+    def __init__(self, workers: int):
+        self.available = max(workers - 1, 0)
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        with self._lock:
+            if self.available == 0:
+                return False
+            self.available -= 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.available += 1
+
+
+def selected(names: Iterable[str]) -> Set[str]:
+    """
+    Returns the given resources that are selected in the source being extracted, as only those
+    will start. Must be called from within a resource.
+    """
+    try:
+        resources = dlt.current.source().selected_resources
+    except CurrentSourceNotAvailable:
+        # e.g. a resource extracted on its own
+        return set(names)
+    return {name for name in names if name in resources}
+
+
+def gather_timeout(
+    started_at: float, gathered: bool, seconds: float = GATHER_SECONDS
+) -> float | None:
+    """
+    Returns the seconds left to wait for other resources to start, or None once they did or
+    `seconds` passed
+    """
+    if gathered:
+        return None
+    left = started_at + seconds - time.monotonic()
+    return left if left > 0 else None
+
+
+def wait_until(
+    condition: threading.Condition,
+    ready: Callable[[], bool],
+    timeout: Callable[[], float | None],
+    budget: WorkerBudget,
+) -> Iterator[None]:
+    """
+    Waits on the condition until `ready` (evaluated while holding it) returns true, blocking the
+    extract worker as long as the budget allows and waking up after `timeout` seconds (if any) to
+    re-evaluate it. Otherwise yields nothing every `ADMISSION_WAIT` seconds, which dlt skips.
+    Must be iterated from within the resource.
+    """
+    while True:
+        blocking = budget.acquire()
+        try:
+            with condition:
+                if blocking:
+                    while not ready():
+                        condition.wait(timeout())
+                    return
+                if condition.wait_for(ready, timeout=ADMISSION_WAIT):
+                    return
+        finally:
+            if blocking:
+                budget.release()
+        # nothing to extract yet, dlt skips this
+        yield None